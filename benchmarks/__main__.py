@@ -0,0 +1,105 @@
+import argparse
+import sys
+from collections.abc import Sequence
+
+from .collectors import run_collectors
+from .render import run_render
+from .runner import (
+    DEFAULT_REPEAT,
+    DEFAULT_THRESHOLD,
+    Sizes,
+    compare,
+    format_results,
+    load_report,
+    make_report,
+    save_report,
+)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the parser for the benchmarks' command-line arguments
+
+    :return: The parser
+    """
+    defaults = Sizes()
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Time every collector and render path against a synthetic system",
+    )
+    parser.add_argument("--output", metavar="FILE", help="Save the results to FILE, as JSON")
+    parser.add_argument("--compare", metavar="BASELINE", help="Fail if any benchmark got slower than in BASELINE")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"How many times slower than the baseline a benchmark may get (default: {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help=f"How many times to time each benchmark (default: {DEFAULT_REPEAT})",
+    )
+    parser.add_argument("--only", choices=("collectors", "render"), help="Only run one kind of benchmark")
+    for field, default in defaults._asdict().items():
+        parser.add_argument(
+            f"--{field}",
+            type=int,
+            default=default,
+            help=f"How many {field} the synthetic system has (default: {default})",
+        )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """
+    Run the benchmarks
+
+    :param argv: The command-line arguments, or None to use `sys.argv`
+    :return: The exit code: 1 if any benchmark regressed, 0 otherwise
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    sizes = Sizes(args.processes, args.cores, args.interfaces, args.mounts)
+
+    # Load the baseline first, so that a bad path fails before any benchmark runs
+    baseline = None
+    if args.compare:
+        try:
+            baseline = load_report(args.compare)
+        except (OSError, ValueError) as error:
+            parser.error(str(error))
+        if baseline["sizes"] != sizes._asdict():
+            parser.error(f"{args.compare} was run on a synthetic system of a different size: {baseline['sizes']}")
+
+    results = {}
+    if args.only in (None, "collectors"):
+        results.update(run_collectors(sizes, args.repeat))
+    if args.only in (None, "render"):
+        results.update(run_render(sizes, args.repeat))
+
+    report = make_report(results, sizes)
+    print(format_results(results, baseline))
+    if args.output:
+        save_report(report, args.output)
+
+    if baseline is None:
+        return 0
+
+    try:
+        regressions = compare(report, baseline, args.threshold)
+    except ValueError as error:
+        parser.error(str(error))
+
+    for regression in regressions:
+        print(
+            f"Regression: {regression.name} took {regression.current * 1000:.3f} ms, "
+            f"{regression.ratio:.2f}x the baseline's {regression.baseline * 1000:.3f} ms",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+import os
+import tempfile
+from collections.abc import Callable, Iterable
+from typing import Any
+from unittest.mock import patch
+
+from textual_system_monitor.providers import procfs
+from textual_system_monitor.rates import DiskRates, NetworkRates
+from textual_system_monitor.utilities import (
+    CPUSampler,
+    DiskProber,
+    ProcessSampler,
+    get_disk_data,
+    get_mem_data,
+    get_network_stats,
+    rank_processes,
+)
+
+from .runner import DEFAULT_REPEAT, Clock, Sizes, measure, summarize, synthetic_system
+
+
+def write_proc_tree(root: str, rows: Iterable[dict[str, Any]]) -> None:
+    """
+    Write the files `ProcFSReader` reads for every process, as a stand-in for `/proc`
+
+    :param root: Where to write the tree
+    :param rows: The processes, as a provider samples them
+    """
+    os.makedirs(f"{root}/self", exist_ok=True)
+    for row in rows:
+        pid = row["pid"]
+        os.makedirs(f"{root}/{pid}", exist_ok=True)
+
+        # The fields after the command name, starting with the state (see `procfs.STAT_*`)
+        fields = ["S"] + ["0"] * 40
+        fields[11] = str(pid * 3)
+        fields[12] = str(pid)
+        fields[17] = str(row["num_threads"])
+        fields[19] = str(1000 + pid)
+        fields[21] = str(row["rss"] // 4096)
+
+        with open(f"{root}/{pid}/stat", "w") as file:
+            file.write(f"{pid} ({row['name']}) {' '.join(fields)}\n")
+        with open(f"{root}/{pid}/status", "w") as file:
+            file.write(f"Name:\t{row['name']}\nUid:\t{os.getuid()}\t{os.getuid()}\n")
+        with open(f"{root}/{pid}/cmdline", "wb") as file:
+            file.write(row["exe"].encode() + b"\0")
+
+
+def run_collectors(sizes: Sizes, repeat: int = DEFAULT_REPEAT) -> dict[str, dict[str, float | int]]:
+    """
+    Time every collector.
+
+    The collectors that read psutil are timed against this machine, since psutil can't be made to report a bigger
+    system without standing in for it. What scales with the size of the system and is ours (reading `/proc`,
+    working out rates, and ranking processes) is timed against a synthetic system (see `FakeProvider`).
+
+    :param sizes: How big the synthetic system is
+    :param repeat: How many times to time each collector
+    :return: The summary of every benchmark, by name
+    """
+    cpu_sampler = CPUSampler()
+    process_sampler = ProcessSampler()
+    prober = DiskProber()
+    cases = {
+        "collect.cpu": cpu_sampler.sample,
+        "collect.mem": get_mem_data,
+        "collect.network": get_network_stats,
+        "collect.disks": lambda: get_disk_data(prober),
+        "collect.processes.psutil": process_sampler.sample,
+    }
+
+    clock = Clock()
+    provider = synthetic_system(sizes, clock)
+
+    def _rates(rates: NetworkRates | DiskRates, sample: Callable[[], list[dict[str, Any]]]) -> Callable[[], None]:
+        """
+        Take a sample of the synthetic system for every call `measure` makes, a second apart, then make a function
+        that works out rates from the next one, so that only working out rates is timed
+        """
+        samples = []
+        for _ in range(repeat + 1):
+            clock.now += 1.0
+            samples.append((clock.now, sample()))
+        remaining = iter(samples)
+
+        def _update() -> None:
+            """
+            Work out rates from the next sample
+            """
+            now, stats = next(remaining)
+            rates.update(stats, now)
+
+        return _update
+
+    rows = provider.processes()
+    cases["rates.network"] = _rates(NetworkRates(), provider.network)
+    cases["rates.disk_io"] = _rates(DiskRates(), provider.disk_io)
+    cases["rank.processes.top10"] = lambda: rank_processes(rows, limit=10)
+    cases["rank.processes.all"] = lambda: rank_processes(rows)
+
+    results = {name: summarize(measure(func, repeat)) for name, func in cases.items()}
+
+    if procfs.is_supported():
+        with tempfile.TemporaryDirectory(prefix="tsm-proc-") as proc_path, patch.object(procfs, "PROC_PATH", proc_path):
+            write_proc_tree(proc_path, rows)
+            results["collect.processes.procfs"] = summarize(measure(procfs.ProcFSReader().sample, repeat))
+
+    return results
@@ -0,0 +1,147 @@
+import asyncio
+import time
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+from unittest.mock import patch
+
+from textual.pilot import Pilot
+
+from textual_system_monitor.app import Monitor
+from textual_system_monitor.collector import Collector
+from textual_system_monitor.panes.processes import Processes
+from textual_system_monitor.rates import NetworkRates
+from textual_system_monitor.rendering import get_styles, update_CPU_static, update_network_static
+from textual_system_monitor.utilities import rank_processes
+
+from .runner import DEFAULT_REPEAT, Clock, Sizes, measure, summarize, synthetic_system
+
+
+def synthetic_samples(sizes: Sizes) -> dict[str, tuple[Any, Any]]:
+    """
+    Take two samples of every metric of a synthetic system, a second apart, as the `Collector` publishes them
+
+    :param sizes: How big the synthetic system is
+    :return: The two samples of every metric, by name
+    """
+    clock = Clock()
+    provider = synthetic_system(sizes, clock)
+
+    # Network samples go out with rates over the second before them
+    network_rates = NetworkRates()
+    network_rates.update(provider.network(), clock.now)
+
+    samples: dict[str, list[Any]] = {"cpu": [], "network": [], "disks": [], "processes": []}
+    for _ in range(2):
+        clock.now += 1.0
+        samples["cpu"].append(provider.cpu())
+        samples["network"].append(tuple(network_rates.update(provider.network(), clock.now)))
+        samples["disks"].append(tuple(provider.disks()))
+        samples["processes"].append(tuple(provider.processes()))
+    return {metric: (first, second) for metric, (first, second) in samples.items()}
+
+
+def alternate(func: Callable[[Any], Any], first: Any, second: Any) -> Callable[[], None]:
+    """
+    Make a function that calls `func` with each of two samples in turn, so that every call renders a change
+
+    :param func: The render path
+    :param first: The first sample
+    :param second: The second sample
+    :return: The function to time
+    """
+    samples = [first, second]
+
+    def _render() -> None:
+        """
+        Render the next sample
+        """
+        samples.reverse()
+        func(samples[0])
+
+    return _render
+
+
+async def measure_rendered(func: Callable[[], Any], pilot: Pilot[Any], repeat: int = DEFAULT_REPEAT) -> list[float]:
+    """
+    Time a render path up to the point the app has caught up with it, including the work Textual defers until
+    the app is idle (e.g. working out column widths) and painting the screen. Like `measure`, the first call
+    isn't timed
+
+    :param func: The render path
+    :param pilot: The pilot of the app running headless
+    :param repeat: How many times to time it
+    :return: How long each call took, in seconds
+    """
+    func()
+    await pilot.pause()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        await pilot.pause()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def _run_screens(sizes: Sizes, repeat: int) -> dict[str, dict[str, float | int]]:
+    """
+    Time the render paths of panes and screens, in an app running headless
+
+    :param sizes: How big the synthetic system is
+    :param repeat: How many times to time each render path
+    :return: The summary of every benchmark, by name
+    """
+    samples = synthetic_samples(sizes)
+    results: dict[str, dict[str, float | int]] = {}
+
+    # Nothing is sampled, so that only the synthetic samples are rendered
+    with patch.object(Collector, "start", lambda _self: None):
+        app = Monitor()
+        async with app.run_test(size=(200, 60)) as pilot:
+            pane = app.screen.query_one(Processes)
+            func = alternate(pane.watch_processes, *samples["processes"])
+            results["render.processes_pane"] = summarize(await measure_rendered(func, pilot, repeat))
+
+            screens: dict[str, tuple[str, Any, Any]] = {
+                "processes": (
+                    "watch_processes",
+                    *(tuple(rank_processes(sample, app.process_sort)) for sample in samples["processes"]),
+                ),
+                "cpu": ("watch_cpu_data", *samples["cpu"]),
+                "network": ("watch_io", *samples["network"]),
+                "drive": ("watch_disks", *samples["disks"]),
+            }
+            for name, (method, first, second) in screens.items():
+                await app.switch_screen(name)
+                await pilot.pause()
+                screen = app.screen
+
+                func = alternate(getattr(screen, method), first, second)
+                results[f"render.{name}_screen"] = summarize(await measure_rendered(func, pilot, repeat))
+
+                # Most of the time, most of a table is the same as last time
+                func = partial(getattr(screen, method), second)
+                results[f"render.{name}_screen.unchanged"] = summarize(await measure_rendered(func, pilot, repeat))
+
+    return results
+
+
+def run_render(sizes: Sizes, repeat: int = DEFAULT_REPEAT) -> dict[str, dict[str, float | int]]:
+    """
+    Time every render path against synthetic samples
+
+    :param sizes: How big the synthetic system is
+    :param repeat: How many times to time each render path
+    :return: The summary of every benchmark, by name
+    """
+    styles = get_styles("textual-dark")
+    samples = synthetic_samples(sizes)
+    network, cpu = samples["network"][1], samples["cpu"][1]
+
+    results = {
+        "render.network_static": summarize(measure(lambda: update_network_static(network, 1024, styles), repeat)),
+        "render.cpu_static": summarize(measure(lambda: update_CPU_static(cpu, styles), repeat)),
+    }
+    results.update(asyncio.run(_run_screens(sizes, repeat)))
+    return results
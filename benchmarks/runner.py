@@ -0,0 +1,194 @@
+import json
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any, NamedTuple
+
+from textual_system_monitor.providers.fake import FakeProvider
+
+# How many times each benchmark is timed by default
+DEFAULT_REPEAT = 10
+
+# How much slower than the baseline a benchmark may get before it counts as a regression
+DEFAULT_THRESHOLD = 1.25
+
+
+class Sizes(NamedTuple):
+    """
+    How big the synthetic system is: far bigger than any machine the benchmarks are likely to run on, so that costs
+    that scale with the number of processes, cores, interfaces, or mounts show up clearly
+    """
+
+    processes: int = 10_000
+    cores: int = 256
+    interfaces: int = 500
+    mounts: int = 300
+
+
+class Clock:
+    """
+    A clock that only moves when told to, so that a `FakeProvider` gives the same samples on every run
+    """
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def synthetic_system(sizes: Sizes, clock: Clock) -> FakeProvider:
+    """
+    Make a synthetic system of the given size, where every process runs for a minute before another takes its place
+
+    :param sizes: How big the synthetic system is
+    :param clock: Where the system reads the time from
+    :return: The provider of the synthetic system
+    """
+    return FakeProvider(
+        cores=sizes.cores,
+        processes=sizes.processes,
+        interfaces=sizes.interfaces,
+        mounts=sizes.mounts,
+        lifetime=60.0,
+        clock=clock,
+    )
+
+
+class Regression(NamedTuple):
+    """
+    A benchmark that got slower than its baseline allows
+    """
+
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        """
+        How many times slower the benchmark got
+        """
+        return self.current / self.baseline if self.baseline else float("inf")
+
+
+def measure(func: Callable[[], Any], repeat: int = DEFAULT_REPEAT) -> list[float]:
+    """
+    Time a function, after one untimed call to warm up caches
+
+    :param func: The function to time
+    :param repeat: How many times to time it
+    :return: How long each call took, in seconds
+    """
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def summarize(timings: list[float]) -> dict[str, float | int]:
+    """
+    Summarize the timings of a benchmark
+
+    :param timings: How long each call took, in seconds
+    :return: The number of runs, and the fastest, median, and mean time, in seconds
+    """
+    return {
+        "runs": len(timings),
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+    }
+
+
+def make_report(results: dict[str, dict[str, float | int]], sizes: Sizes) -> dict[str, Any]:
+    """
+    Bundle the results of a run with what is needed to tell whether two runs are comparable
+
+    :param results: The summary of every benchmark, by name
+    :param sizes: How big the synthetic system was
+    :return: The report, ready to be saved as JSON
+    """
+    return {
+        "created": datetime.now(UTC).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "sizes": sizes._asdict(),
+        "results": results,
+    }
+
+
+def save_report(report: dict[str, Any], path: str) -> None:
+    """
+    Save a report as JSON
+
+    :param report: The report
+    :param path: The file to save it to
+    """
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2)
+        file.write("\n")
+
+
+def load_report(path: str) -> dict[str, Any]:
+    """
+    Load a report saved by `save_report`
+
+    :param path: The file to load it from
+    :return: The report
+    """
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare(
+    current: dict[str, Any], baseline: dict[str, Any], threshold: float = DEFAULT_THRESHOLD
+) -> list[Regression]:
+    """
+    Find the benchmarks that got slower than the baseline allows.
+
+    The fastest time of each benchmark is compared, since it is the least affected by whatever else is running.
+    Benchmarks that are only in one of the reports are ignored.
+
+    :param current: The report of the current run
+    :param baseline: The report to compare against
+    :param threshold: How many times slower than the baseline a benchmark may get
+    :return: The regressions
+    """
+    if current["sizes"] != baseline["sizes"]:
+        raise ValueError(
+            f"Can't compare runs on systems of different sizes: {current['sizes']} and {baseline['sizes']}"
+        )
+
+    regressions = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        regression = Regression(name, baseline["results"][name]["min"], result["min"])
+        if regression.ratio > threshold:
+            regressions.append(regression)
+    return regressions
+
+
+def format_results(results: dict[str, dict[str, float | int]], baseline: dict[str, Any] | None = None) -> str:
+    """
+    Lay out the results as a table, in milliseconds
+
+    :param results: The summary of every benchmark, by name
+    :param baseline: The report to compare against, if any
+    :return: The table
+    """
+    width = max(map(len, results), default=0)
+    lines = [f"{'Benchmark':<{width}}  {'Min (ms)':>10}  {'Median (ms)':>12}  {'vs. Baseline':>12}"]
+    for name, result in results.items():
+        versus = ""
+        if baseline is not None and name in baseline["results"]:
+            versus = f"{result['min'] / baseline['results'][name]['min']:.2f}x"
+        lines.append(f"{name:<{width}}  {result['min'] * 1000:>10.3f}  {result['median'] * 1000:>12.3f}  {versus:>12}")
+    return "\n".join(lines)
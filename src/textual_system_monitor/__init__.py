@@ -1,5 +1,5 @@
-from textual_system_monitor.app import Monitor
-
-
 def main() -> None:
-    Monitor().run()
+    # Import the CLI only when it is run, so that importing the package stays cheap
+    from textual_system_monitor.cli import main as run
+
+    run()
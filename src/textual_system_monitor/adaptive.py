@@ -0,0 +1,145 @@
+from collections.abc import Callable
+from time import monotonic, process_time
+from typing import Any
+
+from .interfaces import current_rate
+from .rates import physical_disks
+
+# How far a metric's interval can be stretched while it holds still, and how far every interval can be throttled on
+# top of that while over the CPU budget, as numbers of doublings of its configured interval (so up to 8x each)
+MAX_STRETCH = 3
+MAX_THROTTLE = 3
+
+# How many samples in a row a metric must hold still for before its interval is doubled
+STABLE_SAMPLES = 3
+
+# The CPU budget of the monitor itself, as a percentage of one core, and how often it is checked, in seconds
+DEFAULT_CPU_BUDGET = 1.0
+BUDGET_WINDOW = 5.0
+
+
+def _disk_usage(disks: Any) -> float:
+    """
+    Boil a disk sample down to how full the disks are
+
+    :param disks: The disk sample
+    :return: The average percentage used of the disks that answered
+    """
+    usages = [disk["usage"]["percent"] for disk in disks if disk.get("usage")]
+    return sum(usages) / len(usages) if usages else 0.0
+
+
+def _disk_io(disks: Any) -> float:
+    """
+    Boil a disk IO sample down to how busy the disks are
+
+    :param disks: The disk IO sample, with rates (see `DiskRates`)
+    :return: The bytes read and written per second, over physical disks only, so that nothing is counted twice
+    """
+    return sum(disk.get("read_bytes_rate", 0.0) + disk.get("write_bytes_rate", 0.0) for disk in physical_disks(disks))
+
+
+# How each metric is boiled down to a single level, and how far that level must move between samples to count as
+# moving: by more than an absolute amount, and by more than a fraction of the previous level
+LEVELS: dict[str, tuple[Callable[[Any], float], float, float]] = {
+    "cpu": (lambda cpu: cpu.overall, 2.0, 0.0),
+    "mem": (lambda mem: mem.percent, 0.5, 0.0),
+    "network": (lambda stats: sum(current_rate(stat) for stat in stats), 4096.0, 0.25),
+    "disks": (_disk_usage, 0.1, 0.0),
+    "disk_io": (_disk_io, 4096.0, 0.25),
+    "processes": (lambda rows: sum(row.get("cpu_percent") or 0.0 for row in rows), 5.0, 0.0),
+}
+
+
+class AdaptiveSchedule:
+    """
+    Stretches the refresh intervals of the `Collector` while what it samples holds still, and while the monitor
+    costs more CPU than its budget.
+
+    Configured intervals are the fastest a metric is sampled at. Every time a metric holds still for
+    `STABLE_SAMPLES` samples in a row, its interval doubles, up to `MAX_STRETCH` times; as soon as it moves, it is
+    back to its configured interval. On top of that, every `BUDGET_WINDOW` seconds, the CPU time of the whole process
+    (sampling and rendering alike) is compared to the budget: while over budget, every interval doubles once more,
+    up to `MAX_THROTTLE` times, and while well under budget, one doubling is taken back. Throttling is capped on its
+    own, so that the budget is still enforced once every metric is fully stretched. Intervals only ever double, so
+    that they stay aligned on the collector's tick.
+    """
+
+    def __init__(
+        self,
+        budget: float = DEFAULT_CPU_BUDGET,
+        clock: Callable[[], float] = monotonic,
+        cpu_clock: Callable[[], float] = process_time,
+    ) -> None:
+        """
+        :param budget: How much CPU the monitor may use, as a percentage of one core
+        :param clock: Where to read the time from, in seconds
+        :param cpu_clock: Where to read the CPU time used by the monitor from, in seconds
+        """
+        if budget <= 0:
+            raise ValueError(f"The CPU budget must be above 0%, got {budget:g}%")
+        self.budget = budget
+        self.clock = clock
+        self.cpu_clock = cpu_clock
+
+        # The latest level of each metric, how many samples in a row it held still for, and how far it is stretched
+        self.levels: dict[str, float] = {}
+        self.stable: dict[str, int] = dict.fromkeys(LEVELS, 0)
+        self.stretch: dict[str, int] = dict.fromkeys(LEVELS, 0)
+
+        # How many doublings the budget adds to every interval, and the CPU usage last measured, in % of one core
+        self.throttle = 0
+        self.usage = 0.0
+        self.window_start = (clock(), cpu_clock())
+
+    def observe(self, metric: str, data: Any) -> None:
+        """
+        Speed a metric up if a new sample of it moved, or slow it down if it held still for long enough
+
+        :param metric: The name of the metric that was sampled
+        :param data: The newly-sampled data
+        """
+        if metric not in LEVELS:
+            return
+        level_of, absolute, relative = LEVELS[metric]
+        level = level_of(data)
+        previous = self.levels.get(metric)
+        self.levels[metric] = level
+        if previous is None:
+            return
+
+        if abs(level - previous) > max(absolute, relative * abs(previous)):
+            self.stable[metric] = 0
+            self.stretch[metric] = 0
+            return
+
+        self.stable[metric] += 1
+        if self.stable[metric] >= STABLE_SAMPLES:
+            self.stable[metric] = 0
+            self.stretch[metric] = min(MAX_STRETCH, self.stretch[metric] + 1)
+
+    def check_budget(self) -> None:
+        """
+        Measure the CPU usage of the monitor once every `BUDGET_WINDOW` seconds, and throttle every interval while it
+        is over budget
+        """
+        now, cpu = self.clock(), self.cpu_clock()
+        started, cpu_started = self.window_start
+        if now - started < BUDGET_WINDOW:
+            return
+        self.window_start = (now, cpu)
+        self.usage = (cpu - cpu_started) / (now - started) * 100
+
+        if self.usage > self.budget:
+            self.throttle = min(MAX_THROTTLE, self.throttle + 1)
+        elif self.usage < self.budget / 2:
+            self.throttle = max(0, self.throttle - 1)
+
+    def doublings(self, name: str) -> int:
+        """
+        Find how far something's interval is currently stretched
+
+        :param name: The name of what is refreshed (see `collector.DEFAULT_INTERVALS`)
+        :return: How many times its configured interval is currently doubled
+        """
+        return self.stretch.get(name, 0) + self.throttle
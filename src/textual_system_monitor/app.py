@@ -1,32 +1,94 @@
+import sys
 from collections.abc import Callable
-from typing import ClassVar
+from importlib import import_module
+from typing import ClassVar, cast
 
 from textual.app import App
 from textual.binding import Binding
+from textual.reactive import var
 from textual.screen import Screen
+from textual.worker import Worker
 
-from .screens.cpu_screen import CPU_Screen
-from .screens.drive_screen import DriveScreen
-from .screens.gpu_screen import GPU_Screen
-from .screens.guide_screen import GuideScreen
+from .adaptive import AdaptiveSchedule
+from .collector import Collector, SampleProgress, Snapshot
+from .instrumentation import Instruments
+from .interfaces import InterfaceSelection
+from .panes.instruments import InstrumentsOverlay
+from .providers.base import Provider
+from .recording import Recorder, Recording
+from .replay import Player
 from .screens.main_screen import MainScreen
-from .screens.mem_screen import MemoryScreen
-from .screens.network_screen import NetworkScreen
-from .screens.processes_screen import ProcessesScreen
+from .utilities import PROCESS_SORT_KEYS
+
+
+def lazy_screen(module: str, name: str) -> Callable[[], Screen[None]]:
+    """
+    Create a factory for a screen that is only imported the first time it is switched to
+
+    :param module: The module the screen is defined in, relative to the `screens` package
+    :param name: The name of the screen class
+    :return: A function that imports and instantiates the screen
+    """
+
+    def _create_screen() -> Screen[None]:
+        """
+        Import and instantiate the screen
+        """
+        screen_class: type[Screen[None]] = getattr(import_module(f".screens.{module}", __package__), name)
+        return screen_class()
+
+    return _create_screen
+
+
+# The modules of every pane and screen whose renders are measured while instruments are enabled (see `Instruments`)
+INSTRUMENTED_MODULES = (
+    "panes.cpu",
+    "panes.drives",
+    "panes.memory",
+    "panes.network",
+    "panes.processes",
+    "screens.cpu_screen",
+    "screens.drive_screen",
+    "screens.mem_screen",
+    "screens.network_screen",
+    "screens.processes_screen",
+)
+
+
+def instrumented_classes() -> list[type]:
+    """
+    Find the panes and screens whose renders are measured. Screens that weren't switched to yet aren't imported
+    for this: their classes are found once they are (see `Monitor._instrument_screen`)
+
+    :return: Every class defined in the modules of `INSTRUMENTED_MODULES` imported so far
+    """
+    modules = [
+        sys.modules[name]
+        for name in (f"{__package__}.{module}" for module in INSTRUMENTED_MODULES)
+        if name in sys.modules
+    ]
+    return [
+        value
+        for module in modules
+        for value in vars(module).values()
+        if isinstance(value, type) and value.__module__ == module.__name__
+    ]
 
 
 class Monitor(App[str]):
     TITLE = "Textual System Monitor"
     SUB_TITLE = "Written in Python using Textual"
+
+    # Only the Main Screen is needed at startup, so the other screens are imported when first switched to
     SCREENS: ClassVar[dict[str, Callable[[], Screen[None]]]] = {
         "main": MainScreen,
-        "guide": GuideScreen,
-        "processes": ProcessesScreen,
-        "network": NetworkScreen,
-        "cpu": CPU_Screen,
-        "drive": DriveScreen,
-        "mem": MemoryScreen,
-        "gpu": GPU_Screen,
+        "guide": lazy_screen("guide_screen", "GuideScreen"),
+        "processes": lazy_screen("processes_screen", "ProcessesScreen"),
+        "network": lazy_screen("network_screen", "NetworkScreen"),
+        "cpu": lazy_screen("cpu_screen", "CPU_Screen"),
+        "drive": lazy_screen("drive_screen", "DriveScreen"),
+        "mem": lazy_screen("mem_screen", "MemoryScreen"),
+        "gpu": lazy_screen("gpu_screen", "GPU_Screen"),
     }
 
     CONTEXT: ClassVar = {
@@ -35,13 +97,176 @@ class Monitor(App[str]):
 
     BINDINGS: ClassVar = [
         Binding(key="/", action="app.switch_base", description="Change KB Size"),
+        Binding(key="[", action="app.skip(-60)", description="Back 1 Min"),
+        Binding(key="]", action="app.skip(60)", description="Forward 1 Min"),
+        Binding(key="f", action="app.cycle_speed", description="Replay Speed"),
+        Binding(key="i", action="app.toggle_instruments", description="Own Cost"),
     ]
 
+    # The actions that only make sense when replaying a recording
+    REPLAY_ACTIONS: ClassVar = {"skip", "cycle_speed"}
+
+    # The latest sample of every metric. Published by `self.collector`, rendered by panes and screens
+    snapshot = var(Snapshot())
+
+    # The key processes are ranked by, on the Processes pane and Screen alike (see `PROCESS_SORT_KEYS`)
+    process_sort = var("cpu_percent", init=False)
+
+    collector: Collector
+
+    def __init__(
+        self,
+        recorder: Recorder | None = None,
+        recording: Recording | None = None,
+        speed: int = 1,
+        provider: Provider | None = None,
+        interfaces: InterfaceSelection | None = None,
+        intervals: dict[str, float] | None = None,
+        adaptive: AdaptiveSchedule | None = None,
+        stats: str | None = None,
+    ) -> None:
+        """
+        :param recorder: Where to record every sample to, if anywhere
+        :param recording: A recording to replay instead of sampling the system
+        :param speed: How many times faster than real time to replay the recording
+        :param provider: Where to sample every metric from. Defaults to the fastest provider for this system
+        :param interfaces: Which network interfaces to show. Defaults to the busiest interfaces, whatever they are
+        :param intervals: How often to refresh metrics and the GPU panes, in seconds, by name (see
+            `config.REFRESH_NAMES`). What isn't given keeps its default
+        :param adaptive: How to stretch intervals while metrics hold still, or the monitor is over its CPU budget.
+            If None, intervals stay as configured
+        :param stats: Where to write what the monitor itself cost to on exit, as JSON, if anywhere. If given, it is
+            measured from the start (see `Instruments`)
+        """
+        super().__init__()
+        self.provider = provider
+        self.interfaces = interfaces if interfaces is not None else InterfaceSelection()
+        self.recorder = recorder
+        self.recording = recording
+        self.speed = speed
+        self.intervals = intervals
+        self.adaptive = adaptive
+        self.stats = stats
+
+        # What the monitor itself costs, measured only while the overlay is shown, or when writing it to `stats`
+        self.instruments = Instruments()
+        self.overlay: InstrumentsOverlay | None = None
+
     def on_mount(self) -> None:
         """
-        Set the initial MainScreen screen
+        Set the initial MainScreen screen, and start collecting system data (or replaying the recording) once it
+        has been painted
         """
+        if self.recording is not None:
+            self.collector = Player(self, self.recording, self.speed, self.intervals)
+        else:
+            self.collector = Collector(self, self.provider, self.intervals, self.adaptive)
+            self.collector.recorder = self.recorder
+        self.collector.instruments = self.instruments
+        if self.stats is not None:
+            self.instruments.enable(instrumented_classes())
+        self.screen_change_signal.subscribe(self, self._move_overlay)
+        self.screen_change_signal.subscribe(self, self._instrument_screen, immediate=True)
         self.push_screen("main")
+        self.call_after_refresh(self.collector.start)
+
+    def on_unmount(self) -> None:
+        """
+        Stop collecting system data, and write what the monitor cost if asked to
+        """
+        self.collector.stop()
+        self.instruments.disable()
+        if self.stats is not None:
+            self.instruments.export(self.stats)
+
+    def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
+        """
+        Hand finished samples over to the collector
+
+        :param event: The Worker StateChanged event
+        """
+        self.collector.on_worker_state_changed(event.worker)
+
+    def on_sample_progress(self, event: SampleProgress) -> None:
+        """
+        Hand samples that are still being taken over to the collector
+
+        :param event: The SampleProgress message
+        """
+        self.collector.on_sample_progress(event.metric, event.sequence, event.data)
+
+    def watch_process_sort(self) -> None:
+        """
+        Re-sample processes straight away, since some sort keys need data that is only read on demand
+        """
+        self.collector.sample("processes")
+
+    def action_cycle_process_sort(self) -> None:
+        """
+        Rank processes by the next sort key
+        """
+        keys = list(PROCESS_SORT_KEYS)
+        self.process_sort = keys[(keys.index(self.process_sort) + 1) % len(keys)]
+
+    def check_action(self, action: str, parameters: tuple[object, ...]) -> bool | None:  # noqa: ARG002
+        """
+        Only allow replay actions when replaying a recording
+
+        :param action: The name of the action
+        :param parameters: The parameters of the action
+        :return: Whether the action is allowed
+        """
+        return self.recording is not None or action not in self.REPLAY_ACTIONS
+
+    def action_skip(self, seconds: float) -> None:
+        """
+        Jump forwards or backwards through the recording
+
+        :param seconds: How far to jump, in seconds. Negative to jump backwards
+        """
+        cast(Player, self.collector).skip(seconds)
+
+    def action_cycle_speed(self) -> None:
+        """
+        Replay the recording at the next speed
+        """
+        cast(Player, self.collector).cycle_speed()
+
+    def action_toggle_instruments(self) -> None:
+        """
+        Show or hide what the monitor itself costs. Measuring starts when shown, and stops when hidden, unless it is
+        being written to a file
+        """
+        if self.overlay is not None:
+            self.overlay.remove()
+            self.overlay = None
+            if self.stats is None:
+                self.instruments.disable()
+            return
+        self.instruments.enable(instrumented_classes())
+        self.overlay = InstrumentsOverlay()
+        self.screen.mount(self.overlay)
+
+    def _instrument_screen(self, _screen: Screen[None]) -> None:
+        """
+        Measure the renders of screens imported since instruments were enabled, e.g. the first time they are
+        switched to
+
+        :param _screen: The screen that came to the front
+        """
+        if self.instruments.enabled:
+            self.instruments.enable(instrumented_classes())
+
+    def _move_overlay(self, screen: Screen[None]) -> None:
+        """
+        Keep the overlay in front when switching screens
+
+        :param screen: The screen that came to the front
+        """
+        if self.overlay is not None and self.overlay.screen is not screen:
+            self.overlay.remove()
+            self.overlay = InstrumentsOverlay()
+            screen.mount(self.overlay)
 
     def action_switch_base(self) -> None:
         """
@@ -0,0 +1,245 @@
+import argparse
+from collections.abc import Callable, Sequence
+
+from .adaptive import DEFAULT_CPU_BUDGET, AdaptiveSchedule
+from .config import REFRESH_NAMES, default_config_path, load_intervals, parse_interval
+from .interfaces import INTERFACE_TYPES, SCREEN_INTERFACES, InterfaceSelection
+from .providers import PROVIDER_NAMES
+
+
+def _refresh_interval(text: str) -> tuple[str, float]:
+    """
+    Parse a refresh interval, for argparse to report what is wrong with it
+
+    :param text: The interval, as `NAME=SECONDS`
+    :return: The name, and the interval in seconds
+    """
+    try:
+        return parse_interval(text)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error)) from error
+
+
+def _interface_count(text: str) -> int:
+    """
+    Parse how many interfaces to show, for argparse to report what is wrong with it
+
+    :param text: The number of interfaces, or 0 for all of them
+    :return: The number of interfaces
+    """
+    count = int(text)
+    if count < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 (for all of them) or more, got {count}")
+    return count
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the parser for the `tsm` command
+
+    :return: The argument parser
+    """
+    parser = argparse.ArgumentParser(prog="tsm", description="A simple system monitor, in the terminal")
+    parser.add_argument(
+        "--provider",
+        choices=PROVIDER_NAMES,
+        default="auto",
+        help="Where to sample the system from. 'fake' simulates a system, for trying things out (default: auto)",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="append",
+        default=[],
+        type=_refresh_interval,
+        metavar="NAME=SECONDS",
+        help=f"How often to refresh one of: {', '.join(REFRESH_NAMES)} (e.g. 'cpu=0.5'). Takes precedence over the "
+        "config file. Can be given more than once",
+    )
+    parser.add_argument(
+        "--config",
+        metavar="PATH",
+        help=f"The config file to read refresh intervals from (default: {default_config_path()}, if it exists)",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Refresh metrics less often while they hold still, and whenever tsm goes over its CPU budget. "
+        "Refresh intervals become the fastest each metric is refreshed at",
+    )
+    parser.add_argument(
+        "--cpu-budget",
+        type=float,
+        default=DEFAULT_CPU_BUDGET,
+        metavar="PERCENT",
+        help="With --adaptive, how much CPU tsm may use, as a percentage of one core "
+        f"(default: {DEFAULT_CPU_BUDGET:g})",
+    )
+    parser.add_argument(
+        "--stats",
+        metavar="PATH",
+        help="Measure what tsm itself costs from the start, and write it to this file as JSON on exit. Press 'i' "
+        "to see it while running",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="Profile tsm by sampling, write the profile to this file for pstats to read, and sum it up on exit",
+    )
+
+    interfaces = parser.add_argument_group("network interfaces", "Which interfaces the Network pane and screen show")
+    interfaces.add_argument(
+        "--interface",
+        action="append",
+        default=[],
+        dest="interfaces",
+        metavar="PATTERN",
+        help="Only show interfaces whose name matches this glob (e.g. 'eth*'), or this regular expression if it "
+        "starts with 're:'. Can be given more than once",
+    )
+    interfaces.add_argument(
+        "--interface-type",
+        action="append",
+        default=[],
+        dest="interface_types",
+        choices=INTERFACE_TYPES,
+        help="Only show interfaces of this type. Can be given more than once",
+    )
+    interfaces.add_argument(
+        "--group-virtual",
+        action="store_true",
+        help="Show one line per type of virtual interface (bridges, veths, etc.), adding them all up",
+    )
+    interfaces.add_argument(
+        "--top-interfaces",
+        type=_interface_count,
+        default=SCREEN_INTERFACES,
+        metavar="N",
+        help=f"Only show the N busiest interfaces on the Network screen, or all of them if 0 (default: "
+        f"{SCREEN_INTERFACES})",
+    )
+
+    modes = parser.add_subparsers(dest="mode", metavar="MODE")
+
+    record = modes.add_parser("record", help="Monitor the system, recording every sample to a file")
+    record.add_argument("file", help="The file to record to. Samples are appended if it is already a recording")
+
+    replay = modes.add_parser("replay", help="Replay a recording instead of monitoring the system")
+    replay.add_argument("file", help="The recording to replay")
+    replay.add_argument(
+        "--speed",
+        type=int,
+        choices=(1, 10, 100),
+        default=1,
+        help="How many times faster than real time to replay (default: 1)",
+    )
+
+    export = modes.add_parser("export", help="Serve metrics for Prometheus to scrape, without the terminal app")
+    export.add_argument("--host", default="127.0.0.1", help="The address to listen on (default: 127.0.0.1)")
+    export.add_argument("--port", type=int, default=9877, help="The port to listen on (default: 9877)")
+    export.add_argument(
+        "--interval",
+        type=float,
+        default=5.0,
+        help="How often to sample the system, in seconds (default: 5)",
+    )
+
+    return parser
+
+
+def run_profiled(run: Callable[[], object], path: str | None) -> None:
+    """
+    Run tsm, profiling it if asked to (see `SamplingProfiler`)
+
+    :param run: Runs the app, or the exporter, until it exits
+    :param path: The file to write the profile to, or None not to profile
+    """
+    if path is None:
+        run()
+        return
+
+    from .profiler import SamplingProfiler
+
+    profiler = SamplingProfiler()
+    profiler.start()
+    try:
+        run()
+    finally:
+        profiler.stop()
+        profiler.dump(path)
+        print(f"Profile written to {path}")
+        print(profiler.summary())
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """
+    Run `tsm`
+
+    :param argv: The command-line arguments, or None to use `sys.argv`
+    """
+    args = build_parser().parse_args(argv)
+
+    from .providers.base import make_provider
+
+    # The exporter is headless, so it must not import the app (or Textual at all)
+    if args.mode == "export":
+        # What tsm costs is measured in the app, which the exporter doesn't run: it serves its own
+        # tsm_exporter_collect_seconds instead
+        if args.stats is not None:
+            build_parser().error("--stats can't be used with export: see the tsm_exporter_collect_seconds metric")
+
+        from .exporter import serve
+
+        try:
+            provider = make_provider(args.provider)
+            run_profiled(lambda: serve(args.host, args.port, args.interval, provider), args.profile)
+        except (OSError, ValueError) as error:
+            build_parser().error(str(error))
+        return
+
+    # Replays publish samples as they were recorded, so there are no intervals to stretch
+    if args.mode == "replay" and args.adaptive:
+        build_parser().error("--adaptive can't be used with replay: samples are replayed as they were recorded")
+
+    # Import the app only once the arguments are known to be valid, so that `tsm --help` stays fast
+    from .app import Monitor
+    from .recording import Recorder, Recording
+
+    try:
+        intervals = load_intervals(args.config, args.refresh)
+        adaptive = AdaptiveSchedule(args.cpu_budget) if args.adaptive else None
+        interfaces = InterfaceSelection(
+            args.interfaces,
+            args.interface_types,
+            group_virtual=args.group_virtual,
+            # 0 shows every interface
+            limit=args.top_interfaces or None,
+        )
+        if args.mode == "record":
+            app = Monitor(
+                recorder=Recorder(args.file),
+                provider=make_provider(args.provider),
+                interfaces=interfaces,
+                intervals=intervals,
+                adaptive=adaptive,
+                stats=args.stats,
+            )
+        elif args.mode == "replay":
+            app = Monitor(
+                recording=Recording(args.file),
+                speed=args.speed,
+                interfaces=interfaces,
+                intervals=intervals,
+                stats=args.stats,
+            )
+        else:
+            app = Monitor(
+                provider=make_provider(args.provider),
+                interfaces=interfaces,
+                intervals=intervals,
+                adaptive=adaptive,
+                stats=args.stats,
+            )
+    except (OSError, ValueError, TypeError) as error:
+        build_parser().error(str(error))
+
+    run_profiled(app.run, args.profile)
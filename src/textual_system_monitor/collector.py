@@ -0,0 +1,548 @@
+import math
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, replace
+from functools import partial
+from typing import TYPE_CHECKING, Any, cast
+from weakref import WeakKeyDictionary, WeakSet
+
+from textual.css.query import NoMatches
+from textual.message import Message
+
+from .adaptive import AdaptiveSchedule
+from .config import REFRESH_GRANULARITY
+from .history import HistoryStore
+from .instrumentation import Instruments
+from .providers.base import Provider, default_provider
+from .rates import DiskRates, NetworkRates
+from .recording import EncodedSample, Recorder, encode_json
+from .utilities import COMMON_INTERVAL, NET_INTERVAL, RARE_INTERVAL, UNCOMMON_INTERVAL, CPUData, MemoryData
+
+if TYPE_CHECKING:
+    from textual.screen import Screen
+    from textual.timer import Timer
+    from textual.widget import Widget
+    from textual.worker import Worker
+
+    from .app import Monitor
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Snapshot:
+    """
+    The latest sample of every metric, as published by the `Collector`.
+
+    A new Snapshot is published every time a metric is sampled. Metrics that were not re-sampled keep the exact
+    same object as in the previous Snapshot, so subscribers can tell what changed with an identity check.
+    A metric is None until it has been sampled for the first time.
+    """
+
+    cpu: CPUData | None = None
+    mem: MemoryData | None = None
+    network: tuple[dict[str, Any], ...] | None = None
+    disks: tuple[dict[str, Any], ...] | None = None
+    disk_io: tuple[dict[str, Any], ...] | None = None
+    processes: tuple[dict[str, Any], ...] | None = None
+
+
+class SampleProgress(Message):
+    """
+    Posted from a thread worker with part of a sample that is still being taken (e.g. the disks probed so far,
+    while a hung mount is still being probed), so that it can be shown without waiting for the rest
+    """
+
+    def __init__(self, metric: str, sequence: int, data: Any) -> None:
+        """
+        :param metric: The name of the metric being sampled
+        :param sequence: The sequence number of the sample
+        :param data: The sample so far
+        """
+        super().__init__()
+        self.metric = metric
+        self.sequence = sequence
+        self.data = data
+
+
+# How often each metric is sampled, in seconds
+METRIC_INTERVALS: dict[str, float] = {
+    "cpu": COMMON_INTERVAL,
+    "mem": COMMON_INTERVAL,
+    "network": NET_INTERVAL,
+    "disks": RARE_INTERVAL,
+    "disk_io": NET_INTERVAL,
+    "processes": UNCOMMON_INTERVAL,
+}
+
+# How often everything the `Collector` runs is refreshed by default, in seconds: every metric, the GPU panes, which
+# still read WMI themselves, and the instruments overlay (see `Collector.every`). Can be configured (see
+# `config.REFRESH_NAMES`)
+DEFAULT_INTERVALS: dict[str, float] = {**METRIC_INTERVALS, "gpu": RARE_INTERVAL, "instruments": NET_INTERVAL}
+
+
+# The shortest tick worth running the timer at, in seconds, unless an interval is shorter. Intervals that only
+# share a shorter tick (e.g. 0.35s and 1s) would wake the app up for nothing most of the time
+MIN_TICK = 0.1
+
+
+def _sample_encoded(work: Callable[[], Any]) -> EncodedSample:
+    """
+    Take a sample, and encode it as the JSON it is recorded as. Runs in a thread worker
+
+    :param work: What takes the sample
+    :return: The sample, with its JSON
+    """
+    data = work()
+    return EncodedSample(data, encode_json(data))
+
+
+def base_tick(intervals: Iterable[float]) -> float:
+    """
+    Find the longest tick that every interval is a whole number of, so that one timer can run everything. If that
+    tick would be shorter than `MIN_TICK` (and than every interval), the shortest interval is the tick instead, and
+    the other intervals have to be rounded to a whole number of it (see `Collector`)
+
+    :param intervals: The intervals, in seconds, rounded to `REFRESH_GRANULARITY`
+    :return: The tick, in seconds
+    """
+    steps = [max(1, round(interval / REFRESH_GRANULARITY)) for interval in intervals]
+    tick = math.gcd(*steps) * REFRESH_GRANULARITY
+    shortest = min(steps) * REFRESH_GRANULARITY
+    return tick if tick >= min(MIN_TICK, shortest) - 1e-9 else shortest
+
+
+class Collector:
+    """
+    Samples every metric on behalf of the whole app and publishes the results as a `Snapshot` on
+    `Monitor.snapshot`. Panes and screens never sample the system themselves; they `subscribe` to a metric instead.
+    Every sample is also recorded in `history`, for anything that needs more than the latest value.
+
+    A single timer ticks at the longest interval every refresh interval is a multiple of (see `base_tick`), and
+    starts every metric that is due together. Intervals that don't share a long enough tick are rounded to a whole
+    number of ticks of the shortest one. Samples that finish around the same time are published together, as
+    one Snapshot, so the app repaints once: as soon as nothing is left in flight, or on the next tick otherwise.
+
+    Sampling happens in thread workers so that a slow system never blocks the UI. There is at most one sample
+    in flight per metric: if the previous sample hasn't finished by the time the metric is due again, it is skipped.
+
+    Intervals may also be stretched while metrics hold still, or the monitor is over its CPU budget (see
+    `AdaptiveSchedule`).
+
+    Metrics are only sampled while a subscriber is visible (see `is_visible`), or while recording. When a hidden
+    subscriber comes to the front again, metrics whose ticks were skipped meanwhile are sampled straight away.
+    """
+
+    def __init__(
+        self,
+        app: "Monitor",
+        provider: Provider | None = None,
+        intervals: dict[str, float] | None = None,
+        adaptive: AdaptiveSchedule | None = None,
+    ) -> None:
+        """
+        :param app: The app to publish Snapshots on
+        :param provider: Where to sample every metric from. Defaults to the fastest provider for this system
+        :param intervals: How often to refresh some of what the collector runs, in seconds, overriding
+            `DEFAULT_INTERVALS`
+        :param adaptive: How to stretch intervals while metrics hold still, or the monitor is over its CPU budget.
+            If None, intervals stay as configured
+        """
+        self.app = app
+        self.running = False
+        self.timer: Timer | None = None
+
+        # How often everything is refreshed, and after how many ticks of the timer
+        configured = {**DEFAULT_INTERVALS, **(intervals or {})}
+        self.tick_seconds = base_tick(configured.values())
+        self.ticks_per_refresh = {
+            name: max(1, round(interval / self.tick_seconds)) for name, interval in configured.items()
+        }
+        self.intervals = {name: ticks * self.tick_seconds for name, ticks in self.ticks_per_refresh.items()}
+        for name, interval in configured.items():
+            if not math.isclose(self.intervals[name], interval, abs_tol=REFRESH_GRANULARITY / 2):
+                app.log.warning(
+                    f"The refresh interval of {name} was rounded from {interval:g}s to {self.intervals[name]:g}s, "
+                    f"a whole number of ticks of {self.tick_seconds:g}s"
+                )
+        self.ticks = 0
+        self.adaptive = adaptive
+
+        self.history = self.new_history()
+
+        # Network and disk IO samples go out with the rate of every counter, worked out as they are taken
+        self.network_rates = NetworkRates()
+        self.disk_rates = DiskRates()
+
+        # Where to record every sample to, if anywhere, and what measures how long samples take
+        self.recorder: Recorder | None = None
+        self.instruments: Instruments | None = None
+
+        # The samples currently in flight, mapped to the metric they sample and their sequence number
+        self.in_flight: dict[Worker[Any], tuple[str, int]] = {}
+
+        # The sequence number of the latest sample started and published for each metric
+        self.started: dict[str, int] = dict.fromkeys(METRIC_INTERVALS, 0)
+        self.published: dict[str, int] = dict.fromkeys(METRIC_INTERVALS, 0)
+
+        # The widgets subscribed to each metric, and the metrics whose ticks were skipped since nothing showed them
+        self.subscribers: dict[str, WeakSet[Widget]] = {metric: WeakSet() for metric in METRIC_INTERVALS}
+        self.skipped: set[str] = set()
+
+        # Samples waiting to be published together, the JSON they are recorded as if they were encoded while being
+        # taken, and what else runs on the timer, by widget (see `every`)
+        self.staged: dict[str, Any] = {}
+        self.encoded: dict[str, str] = {}
+        self.tasks: WeakKeyDictionary[Widget, tuple[str, Callable[[], None]]] = WeakKeyDictionary()
+
+        self.connect(provider)
+
+    def connect(self, provider: Provider | None) -> None:
+        """
+        Sample every metric from a provider
+
+        :param provider: Where to sample every metric from. If None, the fastest provider for this system
+        """
+        self.provider = provider if provider is not None else default_provider()
+        self.collectors: dict[str, Callable[[], Any]] = {
+            "cpu": self.provider.cpu,
+            "mem": self.provider.mem,
+            "network": lambda: tuple(self.network_rates.update(self.provider.network())),
+            "disks": self.sample_disks,
+            "disk_io": lambda: tuple(self.disk_rates.update(self.provider.disk_io())),
+            "processes": lambda: tuple(self.provider.processes(self.app.process_sort)),
+        }
+
+    def new_history(self) -> HistoryStore:
+        """
+        Make an empty history, for metrics sampled at their configured intervals
+
+        :return: The history
+        """
+        return HistoryStore({metric: self.intervals[metric] for metric in METRIC_INTERVALS})
+
+    def start(self) -> None:
+        """
+        Take an initial sample of every metric, then start the timer
+        """
+        self.running = True
+        for metric in METRIC_INTERVALS:
+            self.sample(metric)
+        self.timer = self.app.set_interval(self.tick_seconds, self.tick)
+
+    def stop(self) -> None:
+        """
+        Kill the timer to avoid timer-related threading issues, and close the recording if there is one.
+        Samples still in flight, or waiting to be published, are dropped
+        """
+        self.running = False
+        if self.timer is not None:
+            self.timer.stop()
+            self.timer = None
+        self.staged.clear()
+        self.encoded.clear()
+        if self.recorder is not None:
+            self.recorder.close()
+
+    def period(self, name: str) -> int:
+        """
+        Find how many ticks go by between refreshes of something, stretched if refreshes are adaptive
+
+        :param name: The name of what is refreshed (see `DEFAULT_INTERVALS`)
+        :return: The number of ticks
+        """
+        if self.adaptive is None:
+            return self.ticks_per_refresh[name]
+        return self.ticks_per_refresh[name] << self.adaptive.doublings(name)
+
+    def due(self, name: str) -> bool:
+        """
+        Check whether something is due to be refreshed on the current tick
+
+        :param name: The name of what is refreshed (see `DEFAULT_INTERVALS`)
+        :return: Whether as many ticks as its interval went by
+        """
+        return self.ticks % self.period(name) == 0
+
+    def tick(self) -> None:
+        """
+        Publish the samples that finished since the previous tick, then start every metric and task that is due
+        """
+        self.ticks += 1
+        if self.instruments is not None and self.instruments.enabled:
+            self.instruments.record_tick(self.tick_seconds)
+        self.flush()
+        if self.adaptive is not None:
+            self.adaptive.check_budget()
+        for metric in METRIC_INTERVALS:
+            if self.due(metric):
+                self.sample(metric)
+        for widget, (name, callback) in list(self.tasks.items()):
+            if self.due(name) and widget.is_attached:
+                callback()
+
+    def every(self, widget: "Widget", name: str, callback: Callable[[], None]) -> None:
+        """
+        Call `callback` on the timer, as often as `name` is refreshed, for as long as `widget` is mounted. For widgets
+        that refresh something that isn't a metric, without a timer of their own
+
+        :param widget: The widget the callback belongs to
+        :param name: The name of what the callback refreshes (see `DEFAULT_INTERVALS`)
+        :param callback: The function to call
+        """
+        self.tasks[widget] = (name, callback)
+
+    def cancel(self, widget: "Widget") -> None:
+        """
+        Stop calling a widget's callback on the timer (see `every`)
+
+        :param widget: The widget the callback belongs to
+        """
+        self.tasks.pop(widget, None)
+
+    def add_subscriber(self, metric: str, widget: "Widget") -> None:
+        """
+        Sample a metric for as long as a widget is visible, catching it up every time it comes to the front
+
+        :param metric: The name of the metric the widget subscribes to
+        :param widget: The widget
+        """
+        self.subscribers[metric].add(widget)
+        on_visible(widget, partial(self.catch_up, metric))
+        self.catch_up(metric)
+
+    def wanted(self, metric: str) -> bool:
+        """
+        Check whether a metric needs sampling
+
+        :param metric: The name of the metric
+        :return: Whether any of its subscribers is visible, or every sample is being recorded
+        """
+        return self.recorder is not None or any(is_visible(widget) for widget in self.subscribers[metric])
+
+    def catch_up(self, metric: str) -> None:
+        """
+        Sample a metric straight away if its ticks were skipped while it wasn't wanted, and it is wanted now
+
+        :param metric: The name of the metric
+        """
+        if metric in self.skipped and self.wanted(metric):
+            self.skipped.discard(metric)
+            self.sample(metric)
+
+    def sample(self, metric: str) -> None:
+        """
+        Start sampling a single metric in a thread worker, unless it is already being sampled, or nothing shows it
+
+        :param metric: The name of the metric to sample
+        """
+        if not self.running or any(sampling == metric for sampling, _ in self.in_flight.values()):
+            return
+
+        if not self.wanted(metric):
+            self.skipped.add(metric)
+            return
+
+        work = self.collectors[metric]
+        if self.recorder is not None:
+            # Encode the sample for the recording in the worker too, rather than on the UI thread
+            work = partial(_sample_encoded, work)
+        if self.instruments is not None and self.instruments.enabled:
+            work = self.instruments.wrap(f"collect {metric}", work)
+
+        self.started[metric] += 1
+        worker = self.app.run_worker(
+            work,
+            name=f"collect-{metric}",
+            group="collector",
+            exit_on_error=False,
+            thread=True,
+        )
+        self.in_flight[worker] = (metric, self.started[metric])
+
+    def sample_disks(self) -> tuple[dict[str, Any], ...]:
+        """
+        Sample disks, posting the disks probed so far while a slow mount is still being probed. Runs in a thread worker
+
+        :return: The disk sample
+        """
+        sequence = self.started["disks"]
+
+        def _progress(disks: list[dict[str, Any]]) -> None:
+            """
+            Hand the disks probed so far over to the app, which is thread-safe, unlike publishing them from here
+            """
+            self.app.post_message(SampleProgress("disks", sequence, tuple(disks)))
+
+        return tuple(self.provider.disks(_progress))
+
+    def on_sample_progress(self, metric: str, sequence: int, data: Any) -> None:
+        """
+        Publish part of a sample that is still being taken. It is only shown, not recorded: the whole sample is,
+        once it is taken
+
+        :param metric: The name of the metric being sampled
+        :param sequence: The sequence number of the sample
+        :param data: The sample so far
+        """
+        if not self.running or sequence <= self.published[metric]:
+            return
+        self.app.snapshot = replace(self.app.snapshot, **{metric: data})
+
+    def on_worker_state_changed(self, worker: "Worker[Any]") -> None:
+        """
+        Publish the result of a finished sample, unless it is stale
+
+        :param worker: The worker whose state changed
+        """
+        if not worker.is_finished or worker not in self.in_flight:
+            return
+
+        metric, sequence = self.in_flight.pop(worker)
+
+        if worker.error is not None:
+            self.app.log.error(f"Failed to sample {metric}: {worker.error!r}")
+            return
+
+        # Drop results that arrive after the collector stopped, or after a newer sample was already published
+        if not self.running or worker.is_cancelled or sequence <= self.published[metric]:
+            return
+
+        # Wait for the rest of the samples in flight, up to the next tick, to publish them all at once
+        self.published[metric] = sequence
+        result = worker.result
+        if isinstance(result, EncodedSample):
+            result, self.encoded[metric] = result
+        self.staged[metric] = result
+        if not self.in_flight:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Publish every sample waiting to be published
+        """
+        if self.staged:
+            staged, self.staged = self.staged, {}
+            self.publish_all(staged)
+
+    def publish(self, metric: str, data: Any) -> None:
+        """
+        Publish a new sample of a single metric straight away (see `publish_all`)
+
+        :param metric: The name of the metric that was sampled
+        :param data: The newly-sampled data for that metric
+        """
+        self.publish_all({metric: data})
+
+    def publish_all(self, samples: dict[str, Any]) -> None:
+        """
+        Record new samples in the history (and the recording, if there is one), then publish a new Snapshot in
+        which only the metrics that were sampled have changed
+
+        :param samples: The newly-sampled data, by the name of the metric
+        """
+        for metric, data in samples.items():
+            self.history.record(metric, data)
+            if self.recorder is not None:
+                self.recorder.record(metric, data, self.encoded.pop(metric, None))
+            if self.adaptive is not None:
+                self.adaptive.observe(metric, data)
+        self.app.snapshot = replace(self.app.snapshot, **samples)
+
+
+def is_visible(widget: "Widget") -> bool:
+    """
+    Check whether a widget is on the screen in front. Screens stay alive after being switched away from, so their
+    widgets stay mounted while hidden
+
+    :param widget: The widget
+    :return: Whether the widget's screen is the current screen (or a screen showing behind a modal screen)
+    """
+    return widget.is_attached and widget.screen.is_current
+
+
+def interval_title(widget: "Widget", name: str) -> str:
+    """
+    Make a border title that says how often what a widget shows is refreshed, since intervals can be configured
+
+    :param widget: The pane or screen
+    :param name: The name of what it shows (see `DEFAULT_INTERVALS`)
+    :return: The widget's `BORDER_TITLE`, followed by its refresh interval
+    """
+    collector = cast("Monitor", widget.app).collector
+    interval = collector.intervals[name]
+    if collector.adaptive is not None:
+        return f"{widget.BORDER_TITLE} - Updated every {interval:g}s or slower"
+    return f"{widget.BORDER_TITLE} - Updated every {interval:g}s"
+
+
+def run_every(widget: "Widget", name: str, callback: Callable[[], None]) -> None:
+    """
+    Call `callback` on the app's timer, as often as `name` is refreshed, until `stop_running` (see `Collector.every`)
+
+    :param widget: The widget the callback belongs to
+    :param name: The name of what the callback refreshes (see `DEFAULT_INTERVALS`)
+    :param callback: The function to call
+    """
+    cast("Monitor", widget.app).collector.every(widget, name, callback)
+
+
+def stop_running(widget: "Widget") -> None:
+    """
+    Stop calling a widget's callback on the app's timer (see `run_every`)
+
+    :param widget: The widget the callback belongs to
+    """
+    cast("Monitor", widget.app).collector.cancel(widget)
+
+
+def on_visible(widget: "Widget", callback: Callable[[], None]) -> None:
+    """
+    Call `callback` every time the screen of `widget` comes to the front again, for as long as it is mounted
+
+    :param widget: The widget
+    :param callback: The function to call
+    """
+
+    def _on_screen_change(screen: "Screen[Any]") -> None:
+        """
+        Call the callback if the widget's screen is the one that came to the front
+        """
+        if widget.is_attached and screen is widget.screen:
+            callback()
+
+    widget.app.screen_change_signal.subscribe(widget, _on_screen_change)
+
+
+def subscribe(widget: "Widget", metric: str, callback: Callable[[Any], None]) -> None:
+    """
+    Call `callback` with every new sample of `metric`, for as long as `widget` is mounted.
+
+    The callback is only called when the metric was actually re-sampled, so it runs once per sample of its own
+    metric rather than once per published Snapshot. It is also called straight away with the latest sample, if any.
+    While the widget is hidden (see `is_visible`), samples aren't passed on, and the metric isn't sampled on its
+    behalf. When it comes to the front again, it is caught up with the latest sample, then a fresh one.
+
+    :param widget: The widget that is subscribing
+    :param metric: The name of the metric to subscribe to (a field of `Snapshot`)
+    :param callback: The function to call with each new sample
+    """
+    latest = None
+
+    def _on_snapshot(snapshot: Snapshot) -> None:
+        """
+        Pass the metric on to the callback if it changed in this Snapshot, and the widget can be seen
+        """
+        nonlocal latest
+        data = getattr(snapshot, metric)
+        if data is None or data is latest or not is_visible(widget):
+            return
+        latest = data
+
+        try:
+            callback(data)
+        except NoMatches:
+            # The widget's screen is being removed, so there is nothing left to render into
+            return
+
+    widget.watch(widget.app, "snapshot", _on_snapshot)
+    app = cast("Monitor", widget.app)
+    on_visible(widget, lambda: _on_snapshot(app.snapshot))
+    app.collector.add_subscriber(metric, widget)
@@ -0,0 +1,90 @@
+import os
+import tomllib
+from collections.abc import Iterable
+from typing import Any
+
+# Everything whose refresh interval can be configured: every metric the `Collector` samples, the GPU panes, and the
+# instruments overlay. Defined here, rather than next to `DEFAULT_INTERVALS`, so that the command line doesn't import
+# the app
+REFRESH_NAMES = ("cpu", "mem", "network", "disks", "disk_io", "processes", "gpu", "instruments")
+
+# Intervals are run on a common tick (see `Collector`), so they are rounded to this many seconds
+REFRESH_GRANULARITY = 0.05
+
+
+def default_config_path() -> str:
+    """
+    Find where the config file is by default, following the XDG Base Directory Specification
+
+    :return: `$XDG_CONFIG_HOME/tsm/config.toml`, or `~/.config/tsm/config.toml`
+    """
+    config_home = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(config_home, "tsm", "config.toml")
+
+
+def check_intervals(intervals: dict[str, Any]) -> dict[str, float]:
+    """
+    Check that refresh intervals are for things that can be refreshed, and are long enough to be run on a tick
+
+    :param intervals: The intervals, in seconds, by name (see `REFRESH_NAMES`)
+    :return: The same intervals, as floats
+    """
+    unknown = intervals.keys() - set(REFRESH_NAMES)
+    if unknown:
+        raise ValueError(
+            f"Unknown refresh intervals: {', '.join(sorted(unknown))}. Pick from: {', '.join(REFRESH_NAMES)}"
+        )
+
+    checked = {}
+    for name, seconds in intervals.items():
+        if isinstance(seconds, bool) or not isinstance(seconds, int | float) or seconds < REFRESH_GRANULARITY:
+            raise ValueError(f"The refresh interval of {name} must be at least {REFRESH_GRANULARITY}s, got {seconds!r}")
+        checked[name] = float(seconds)
+    return checked
+
+
+def parse_interval(text: str) -> tuple[str, float]:
+    """
+    Parse a refresh interval given on the command line
+
+    :param text: The interval, as `NAME=SECONDS` (e.g. `cpu=0.5`)
+    :return: The name, and the interval in seconds
+    """
+    name, separator, seconds = text.partition("=")
+    if not separator:
+        raise ValueError(f"Expected NAME=SECONDS, got {text!r}")
+    try:
+        value = float(seconds)
+    except ValueError:
+        raise ValueError(f"Expected a number of seconds, got {seconds!r}") from None
+    return next(iter(check_intervals({name.strip(): value}).items()))
+
+
+def load_intervals(path: str | None = None, overrides: Iterable[tuple[str, float]] = ()) -> dict[str, float]:
+    """
+    Read refresh intervals from the `[refresh]` table of a config file, e.g.
+
+        [refresh]
+        cpu = 0.5
+        disks = 30
+
+    :param path: The config file. If None, the default config file is read if there is one (see
+        `default_config_path`)
+    :param overrides: Intervals that take precedence over the config file (e.g. from the command line)
+    :return: The configured intervals, by name. What isn't configured keeps its default
+    """
+    if path is None:
+        path = default_config_path()
+        if not os.path.exists(path):
+            return dict(overrides)
+
+    with open(path, "rb") as file:
+        try:
+            config = tomllib.load(file)
+        except tomllib.TOMLDecodeError as error:
+            raise ValueError(f"Invalid config file {path}: {error}") from error
+
+    refresh = config.get("refresh", {})
+    if not isinstance(refresh, dict):
+        raise TypeError(f"Invalid config file {path}: [refresh] must be a table")
+    return {**check_intervals(refresh), **dict(overrides)}
@@ -0,0 +1,335 @@
+# A headless exporter, serving the same numbers as the app in the Prometheus text exposition format.
+# This module must not import Textual (directly or not), so that the exporter stays light
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from .providers.base import Provider, default_provider
+from .utilities import CPU_BREAKDOWN_FIELDS, CPUData, MemoryData, rank_processes
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 9877
+
+# How often the system is sampled, in seconds. Scrapes are answered from the latest sample
+EXPORT_INTERVAL = 5.0
+
+# How long to wait between priming the samplers and the first sample, in seconds, so that the first CPU load isn't
+# measured over next to no time
+PRIME_INTERVAL = 0.5
+
+# How many of the heaviest processes are exported, by CPU load and by memory
+TOP_PROCESSES = 10
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+logger = logging.getLogger(__name__)
+
+
+def _escape(value: object) -> str:
+    """
+    Escape a label value, as the exposition format requires
+
+    :param value: The label value
+    :return: The escaped label value
+    """
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsWriter:
+    """
+    Builds a page in the Prometheus text exposition format, one metric family at a time
+    """
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+
+    def family(
+        self,
+        name: str,
+        kind: str,
+        description: str,
+        samples: Iterable[tuple[dict[str, Any], float]],
+    ) -> None:
+        """
+        Add a metric family
+
+        :param name: The name of the metric
+        :param kind: The type of the metric ('gauge' or 'counter')
+        :param description: What the metric measures
+        :param samples: The labels and value of each sample
+        """
+        self.lines.append(f"# HELP {name} {description}")
+        self.lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            if labels:
+                label_string = ",".join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+                self.lines.append(f"{name}{{{label_string}}} {value}")
+            else:
+                self.lines.append(f"{name} {value}")
+
+    def render(self) -> bytes:
+        """
+        Get the page
+
+        :return: The page, encoded
+        """
+        return ("\n".join(self.lines) + "\n").encode()
+
+
+def render_metrics(
+    cpu: CPUData,
+    mem: MemoryData,
+    network: Iterable[dict[str, Any]],
+    disks: Iterable[dict[str, Any]],
+    processes: Iterable[dict[str, Any]],
+) -> bytes:
+    """
+    Render a sample of every metric in the Prometheus text exposition format
+
+    :param cpu: The CPU sample
+    :param mem: The memory sample
+    :param network: The network sample
+    :param disks: The disk sample
+    :param processes: The process sample
+    :return: The page, encoded
+    """
+    writer = MetricsWriter()
+
+    writer.family("tsm_cpu_cores", "gauge", "Number of logical CPU cores.", [({}, cpu.cores)])
+    writer.family("tsm_cpu_usage_percent", "gauge", "Overall CPU load.", [({}, cpu.overall)])
+    writer.family(
+        "tsm_cpu_core_usage_percent",
+        "gauge",
+        "CPU load per core.",
+        [({"core": core}, load) for core, load in enumerate(cpu.individual)],
+    )
+    writer.family(
+        "tsm_cpu_mode_percent",
+        "gauge",
+        "Overall CPU load, broken down by where the time was spent.",
+        [({"mode": mode}, getattr(cpu, mode)) for mode in CPU_BREAKDOWN_FIELDS],
+    )
+
+    for field in ("total", "available", "used", "buffers", "cached", "shared", "slab"):
+        writer.family(f"tsm_memory_{field}_bytes", "gauge", f"Memory: {field}.", [({}, getattr(mem, field))])
+    writer.family("tsm_memory_usage_percent", "gauge", "Memory in use.", [({}, mem.percent)])
+    writer.family("tsm_swap_total_bytes", "gauge", "Swap: total.", [({}, mem.swap_total)])
+    writer.family("tsm_swap_used_bytes", "gauge", "Swap: used.", [({}, mem.swap_used)])
+
+    network = list(network)
+    writer.family(
+        "tsm_network_receive_bytes_total",
+        "counter",
+        "Bytes received per network interface.",
+        [({"interface": stat["interface"]}, stat["bytes_recv"]) for stat in network],
+    )
+    writer.family(
+        "tsm_network_transmit_bytes_total",
+        "counter",
+        "Bytes sent per network interface.",
+        [({"interface": stat["interface"]}, stat["bytes_sent"]) for stat in network],
+    )
+
+    disks = [disk for disk in disks if disk["usage"] is not None]
+    for field in ("total", "used", "free"):
+        writer.family(
+            f"tsm_disk_{field}_bytes",
+            "gauge",
+            f"Drive space: {field}.",
+            [
+                (
+                    {"device": disk["device"], "mountpoint": disk["mountpoint"], "fstype": disk["fstype"]},
+                    disk["usage"][field],
+                )
+                for disk in disks
+            ],
+        )
+
+    processes = list(processes)
+    for sort_key, name, description in (
+        ("cpu_percent", "tsm_process_cpu_percent", "CPU load of the heaviest processes by CPU load."),
+        ("rss", "tsm_process_resident_memory_bytes", "Resident memory of the heaviest processes by memory."),
+    ):
+        writer.family(
+            name,
+            "gauge",
+            description,
+            [
+                ({"pid": proc["pid"], "name": proc["name"] or ""}, proc[sort_key])
+                for proc in rank_processes(processes, sort_key, limit=TOP_PROCESSES)
+                if proc[sort_key] is not None
+            ],
+        )
+
+    return writer.render()
+
+
+class Exporter:
+    """
+    Samples the system on its own cadence, in a background thread, and keeps the latest sample rendered.
+
+    Scrapes are answered with the pre-rendered page, so any number of scrapers cost no more than one.
+    """
+
+    def __init__(self, interval: float = EXPORT_INTERVAL, provider: Provider | None = None) -> None:
+        """
+        :param interval: How often to sample the system, in seconds
+        :param provider: Where to sample every metric from. Defaults to the fastest provider for this system
+        """
+        self.interval = interval
+        self.provider = provider if provider is not None else default_provider()
+
+        # The latest page, and the metrics it was rendered from. The metrics are kept when a sample fails, so that
+        # scrapes keep being answered, with `tsm_exporter_up` telling the samples are stale
+        self.page = b""
+        self.metrics = b""
+
+        # How long the latest sample took to take and render, in seconds, whether it succeeded, and when the latest
+        # successful one was taken, as a Unix timestamp
+        self.collect_seconds = 0.0
+        self.up = False
+        self.last_success = 0.0
+
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="tsm-exporter", daemon=True)
+
+    def prime(self) -> None:
+        """
+        Take a throwaway sample of everything measured since the previous sample (CPU load, per process too), then
+        wait a moment, so that the first sample served covers a meaningful stretch of time
+        """
+        self.provider.cpu()
+        self.provider.processes()
+        self.stopped.wait(min(PRIME_INTERVAL, self.interval))
+
+    def collect(self) -> None:
+        """
+        Sample every metric, and render the page
+        """
+        start = time.perf_counter()
+        self.metrics = render_metrics(
+            self.provider.cpu(),
+            self.provider.mem(),
+            self.provider.network(),
+            self.provider.disks(),
+            self.provider.processes(),
+        )
+        self.collect_seconds = time.perf_counter() - start
+        self.up = True
+        self.last_success = time.time()
+        self.publish()
+
+    def publish(self) -> None:
+        """
+        Render the page from the latest metrics, and how the exporter itself is doing
+        """
+        self.page = (
+            self.metrics
+            + (
+                "# HELP tsm_exporter_collect_seconds Time taken to sample and render every metric.\n"
+                "# TYPE tsm_exporter_collect_seconds gauge\n"
+                f"tsm_exporter_collect_seconds {self.collect_seconds}\n"
+                "# HELP tsm_exporter_up Whether the latest sample succeeded (1) or failed (0).\n"
+                "# TYPE tsm_exporter_up gauge\n"
+                f"tsm_exporter_up {int(self.up)}\n"
+                "# HELP tsm_exporter_last_success_timestamp_seconds When the latest successful sample was taken.\n"
+                "# TYPE tsm_exporter_last_success_timestamp_seconds gauge\n"
+                f"tsm_exporter_last_success_timestamp_seconds {self.last_success}\n"
+            ).encode()
+        )
+
+    def collect_safely(self) -> None:
+        """
+        Sample every metric, and render the page. A failed sample is logged and marked on the page, rather than
+        raised, so that the exporter keeps running
+        """
+        try:
+            self.collect()
+        except Exception:
+            logger.exception("Failed to sample the system")
+            self.up = False
+            self.publish()
+
+    def _run(self) -> None:
+        """
+        Sample the system every `interval` seconds, until stopped
+        """
+        while not self.stopped.wait(self.interval):
+            self.collect_safely()
+
+    def start(self) -> None:
+        """
+        Prime the samplers and take the first sample, then keep sampling in the background
+        """
+        self.prime()
+        self.collect_safely()
+        self.thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop sampling
+        """
+        self.stopped.set()
+
+
+def make_handler(get_page: Callable[[], bytes]) -> type[BaseHTTPRequestHandler]:
+    """
+    Create a request handler that serves a page at `/metrics`
+
+    :param get_page: A function returning the latest page
+    :return: The request handler class
+    """
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            """
+            Serve the latest page at `/metrics`, and nothing else
+            """
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+
+            page = get_page()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(page)))
+            self.end_headers()
+            self.wfile.write(page)
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+            """
+            Don't log every scrape
+            """
+
+    return MetricsHandler
+
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    interval: float = EXPORT_INTERVAL,
+    provider: Provider | None = None,
+) -> None:
+    """
+    Sample the system and serve the metrics until interrupted
+
+    :param host: The address to listen on
+    :param port: The port to listen on
+    :param interval: How often to sample the system, in seconds
+    :param provider: Where to sample every metric from. Defaults to the fastest provider for this system
+    """
+    exporter = Exporter(interval, provider)
+    exporter.start()
+
+    with ThreadingHTTPServer((host, port), make_handler(lambda: exporter.page)) as server:
+        print(f"Serving metrics on http://{host}:{server.server_port}/metrics")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            exporter.stop()
@@ -0,0 +1,263 @@
+from array import array
+from collections.abc import Iterable
+from time import monotonic
+from typing import Any
+
+from .utilities import CPUData, MemoryData
+
+# How far back the history of every metric goes, in seconds
+HISTORY_SECONDS = 5 * 60
+
+# The metrics that have a history, rather than only their latest sample
+HISTORY_METRICS = ("cpu", "mem", "network", "disks")
+
+
+def describe_span(seconds: float) -> str:
+    """
+    Describe how much time a chart covers, for its title
+
+    :param seconds: The time between its oldest and latest samples
+    :return: The time, in whole seconds below a minute and in whole minutes above (e.g. `40 Seconds`, `5 Minutes`)
+    """
+    if seconds < 60:
+        count, unit = round(seconds), "Second"
+    else:
+        count, unit = round(seconds / 60), "Minute"
+    return f"{count} {unit}" if count == 1 else f"{count} {unit}s"
+
+
+class RingBuffer:
+    """
+    A fixed-capacity series of floats, where appending past capacity overwrites the oldest value.
+
+    Values are stored in an `array('d')` of twice the capacity, and every value is written twice, `capacity` apart.
+    That way, the latest `n` values are always contiguous in memory, so `window` can return a memoryview of them
+    without copying anything, and appending stays O(1).
+    """
+
+    __slots__ = ("capacity", "count", "data", "head", "total", "view")
+
+    def __init__(self, capacity: int) -> None:
+        """
+        :param capacity: How many values to keep
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+
+        self.capacity = capacity
+        self.data = array("d", bytes(2 * capacity * array("d").itemsize))
+        self.view = memoryview(self.data)
+
+        # Where the next value goes, how many values are held, and how many were ever appended
+        self.head = 0
+        self.count = 0
+        self.total = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, value: float) -> None:
+        """
+        Append a value, overwriting the oldest one if the buffer is full
+
+        :param value: The value to append
+        """
+        self.data[self.head] = self.data[self.head + self.capacity] = value
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.total += 1
+
+    def window(self, size: int | None = None) -> memoryview:
+        """
+        Get the latest values, oldest first.
+
+        The window is a view into the buffer rather than a copy, so it is only valid until the next append.
+
+        :param size: How many of the latest values to get, or None to get all of them
+        :return: A memoryview of up to `size` floats
+        """
+        size = self.count if size is None else min(max(size, 0), self.count)
+        end = self.head + self.capacity
+        return self.view[end - size : end]
+
+    def latest(self) -> float | None:
+        """
+        Get the latest value
+
+        :return: The latest value, or None if nothing was appended yet
+        """
+        return self.data[self.head + self.capacity - 1] if self.count else None
+
+
+class HistoryStore:
+    """
+    The rolling history of every metric, recorded from each sample the `Collector` publishes.
+
+    Series are named after what they measure:
+
+    - `cpu` and `cpu:<core>`: overall and per-core CPU load, in %
+    - `mem` and `swap`: memory and swap usage, in %
+    - `net:<interface>:rx` and `net:<interface>:tx`: download and upload rates, in bytes/s
+    - `net:rx` and `net:tx`: download and upload rates over all interfaces, in bytes/s
+    - `disk:<mountpoint>`: drive usage, in %
+
+    Series of interfaces and mounts that are gone are dropped, so the store doesn't grow as they come and go.
+
+    Series hold as many samples as `seconds` fit at the configured interval of their metric. Intervals may be
+    stretched (see `AdaptiveSchedule`), and metrics aren't sampled while nothing shows them, so series may cover
+    more time than that: when each sample was taken is kept too, once per metric, so that charts can say how much
+    time they actually cover (see `span`).
+    """
+
+    def __init__(self, intervals: dict[str, float], seconds: float = HISTORY_SECONDS) -> None:
+        """
+        :param intervals: How often each metric is sampled, in seconds
+        :param seconds: How far back the history of every metric goes
+        """
+        self.intervals = intervals
+        self.seconds = seconds
+        self.series: dict[str, RingBuffer] = {}
+
+        # When each sample of every metric was taken. A series only has the latest of these if it is newer than
+        # its metric (e.g. an interface that just came up)
+        self.times: dict[str, RingBuffer] = {}
+
+    def get(self, name: str) -> RingBuffer | None:
+        """
+        Get a series by name
+
+        :param name: The name of the series
+        :return: The series, or None if it was never recorded
+        """
+        return self.series.get(name)
+
+    def span(self, metric: str, name: str) -> float:
+        """
+        Find how much time a series covers
+
+        :param metric: The metric the series belongs to
+        :param name: The name of the series
+        :return: The time between the oldest sample still in the series and the latest, in seconds
+        """
+        series = self.series.get(name)
+        times = self.times.get(metric)
+        if series is None or times is None:
+            return 0.0
+        window = times.window(len(series))
+        return window[-1] - window[0] if len(window) else 0.0
+
+    def _capacity(self, metric: str) -> int:
+        """
+        Find how many samples the series of a metric hold
+
+        :param metric: The name of the metric
+        :return: How many of its samples are taken in `seconds`, at its configured interval
+        """
+        return max(1, round(self.seconds / self.intervals[metric]))
+
+    def _append(self, metric: str, name: str, value: float) -> None:
+        """
+        Append a value to a series, creating the series if needed
+
+        :param metric: The metric the series belongs to, which determines its capacity
+        :param name: The name of the series
+        :param value: The value to append
+        """
+        series = self.series.get(name)
+        if series is None:
+            series = self.series[name] = RingBuffer(self._capacity(metric))
+        series.append(value)
+
+    def _prune(self, prefix: str, names: Iterable[str]) -> None:
+        """
+        Drop the series starting with `prefix` that weren't just recorded
+
+        :param prefix: The prefix of the series that belong to one metric
+        :param names: The series that were just recorded
+        """
+        keep = set(names)
+        for name in [name for name in self.series if name.startswith(prefix) and name not in keep]:
+            del self.series[name]
+
+    def record(self, metric: str, data: Any, moment: float | None = None) -> None:
+        """
+        Record a new sample of a metric
+
+        :param metric: The name of the metric that was sampled (a field of `Snapshot`)
+        :param data: The newly-sampled data for that metric
+        :param moment: When the sample was taken, in seconds, on any clock as long as it is the same for every
+            sample (e.g. when it was recorded, when replaying). If None, now, on the monotonic clock
+        """
+        if metric not in HISTORY_METRICS:
+            return
+
+        times = self.times.get(metric)
+        if times is None:
+            times = self.times[metric] = RingBuffer(self._capacity(metric))
+        times.append(monotonic() if moment is None else moment)
+
+        if metric == "cpu":
+            self._record_cpu(data)
+        elif metric == "mem":
+            self._record_mem(data)
+        elif metric == "network":
+            self._record_network(data)
+        else:
+            self._record_disks(data)
+
+    def _record_cpu(self, cpu: CPUData) -> None:
+        """
+        Record overall and per-core CPU load
+
+        :param cpu: The CPU sample
+        """
+        self._append("cpu", "cpu", cpu.overall)
+        names = [f"cpu:{core}" for core in range(len(cpu.individual))]
+        for name, load in zip(names, cpu.individual, strict=True):
+            self._append("cpu", name, load)
+        self._prune("cpu:", names)
+
+    def _record_mem(self, mem: MemoryData) -> None:
+        """
+        Record memory and swap usage
+
+        :param mem: The memory sample
+        """
+        self._append("mem", "mem", mem.percent)
+        self._append("mem", "swap", mem.swap_percent)
+
+    def _record_network(self, network: Iterable[dict[str, Any]]) -> None:
+        """
+        Record download and upload rates per interface
+
+        :param network: The network sample, with rates (see `NetworkRates`)
+        """
+        names = ["net:rx", "net:tx"]
+        totals = {"rx": 0.0, "tx": 0.0}
+        for stat in network:
+            for direction, key in (("rx", "bytes_recv_rate"), ("tx", "bytes_sent_rate")):
+                name = f"net:{stat['interface']}:{direction}"
+                rate = stat.get(key, 0.0)
+                self._append("network", name, rate)
+                totals[direction] += rate
+                names.append(name)
+
+        for direction, rate in totals.items():
+            self._append("network", f"net:{direction}", rate)
+
+        self._prune("net:", names)
+
+    def _record_disks(self, disks: Iterable[dict[str, Any]]) -> None:
+        """
+        Record usage per drive. Drives without usage info (e.g. CD drives) are skipped
+
+        :param disks: The disk sample
+        """
+        names = []
+        for disk in disks:
+            if disk["usage"] is None:
+                continue
+            name = f"disk:{disk['mountpoint']}"
+            self._append("disks", name, disk["usage"]["percent"])
+            names.append(name)
+        self._prune("disk:", names)
@@ -0,0 +1,177 @@
+import json
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from functools import wraps
+from time import perf_counter, thread_time
+from typing import Any
+
+from psutil import Process
+
+# The watchers that render samples, on every pane and screen that has them
+WATCHERS = ("watch_cpu_data", "watch_processes", "watch_io", "watch_disks", "watch_mem_data")
+
+
+@dataclass(slots=True)
+class Timing:
+    """
+    How long calls to one thing took, added up
+    """
+
+    count: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    max_wall: float = 0.0
+
+    def add(self, wall: float, cpu: float) -> None:
+        """
+        Count one more call
+
+        :param wall: How long the call took, in seconds
+        :param cpu: How much CPU time the call used, in seconds
+        """
+        self.count += 1
+        self.wall += wall
+        self.cpu += cpu
+        self.max_wall = max(self.max_wall, wall)
+
+    def report(self) -> dict[str, float]:
+        """
+        Sum the calls up, in milliseconds
+
+        :return: The number of calls, and their total, average, and longest wall time, and total and average CPU time
+        """
+        count = max(1, self.count)
+        return {
+            "count": self.count,
+            "wall_ms": self.wall * 1000,
+            "mean_wall_ms": self.wall * 1000 / count,
+            "max_wall_ms": self.max_wall * 1000,
+            "cpu_ms": self.cpu * 1000,
+            "mean_cpu_ms": self.cpu * 1000 / count,
+        }
+
+
+class Instruments:
+    """
+    Measures what the monitor itself costs: the wall and CPU time of every sample the `Collector` takes and of every
+    render (see `WATCHERS`), how late the collector's tick runs, and the memory of the whole process.
+
+    Nothing is measured, and nothing is wrapped, until `enable` is called. Renders are then measured by wrapping the
+    watchers of the given classes, and `disable` puts the originals back, so that they cost nothing while disabled.
+    CPU time is the time of the calling thread, so samples taken in thread workers are measured on their own.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.timings: dict[str, Timing] = {}
+
+        # How far apart ticks actually ran, compared to how far apart they should have
+        self.jitter = Timing()
+        self.last_tick: float | None = None
+
+        # The watchers replaced by wrappers, to put back once disabled
+        self.originals: list[tuple[type, str, Any]] = []
+
+    def enable(self, classes: Iterable[type] = ()) -> None:
+        """
+        Start measuring, including the renders of the given classes. If already measuring, only the renders of
+        classes that aren't measured yet are added
+
+        :param classes: The panes and screens whose watchers to measure
+        """
+        if not self.enabled:
+            self.enabled = True
+            self.last_tick = None
+        wrapped = {owner for owner, _, _ in self.originals}
+        for owner in classes:
+            if owner in wrapped:
+                continue
+            for name in WATCHERS:
+                original = owner.__dict__.get(name)
+                if original is not None:
+                    self.originals.append((owner, name, original))
+                    setattr(owner, name, self.wrap(f"{owner.__name__}.{name}", original))
+
+    def disable(self) -> None:
+        """
+        Stop measuring, and put every watcher back as it was. What was measured so far is kept
+        """
+        self.enabled = False
+        for owner, name, original in self.originals:
+            setattr(owner, name, original)
+        self.originals.clear()
+
+    def record(self, name: str, wall: float, cpu: float) -> None:
+        """
+        Count one more call to something
+
+        :param name: What was called
+        :param wall: How long the call took, in seconds
+        :param cpu: How much CPU time the call used, in seconds
+        """
+        timing = self.timings.get(name)
+        if timing is None:
+            timing = self.timings[name] = Timing()
+        timing.add(wall, cpu)
+
+    def wrap(self, name: str, function: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Wrap a function so that every call to it is measured
+
+        :param name: The name to measure calls under
+        :param function: The function
+        :return: The wrapped function, with the same signature
+        """
+
+        @wraps(function)
+        def _measured(*args: Any, **kwargs: Any) -> Any:
+            """
+            Call the function, measuring how long it takes
+            """
+            wall, cpu = perf_counter(), thread_time()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(name, perf_counter() - wall, thread_time() - cpu)
+
+        return _measured
+
+    def record_tick(self, interval: float) -> None:
+        """
+        Count one more tick of the collector, and how late or early it ran
+
+        :param interval: How far apart ticks should run, in seconds
+        """
+        now = perf_counter()
+        if self.last_tick is not None:
+            self.jitter.add(abs(now - self.last_tick - interval), 0.0)
+        self.last_tick = now
+
+    def report(self) -> dict[str, Any]:
+        """
+        Sum up everything measured so far
+
+        :return: The timings of every sample and render, slowest first, the tick jitter, and the process's RSS
+        """
+        jitter = self.jitter.report()
+        return {
+            "timings": {
+                name: timing.report()
+                for name, timing in sorted(self.timings.items(), key=lambda item: item[1].wall, reverse=True)
+            },
+            "tick_jitter": {
+                "ticks": jitter["count"],
+                "mean_ms": jitter["mean_wall_ms"],
+                "max_ms": jitter["max_wall_ms"],
+            },
+            "rss_bytes": Process().memory_info().rss,
+        }
+
+    def export(self, path: str) -> None:
+        """
+        Write everything measured so far to a file, as JSON (see `report`)
+
+        :param path: The file to write to
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.report(), file, indent=2)
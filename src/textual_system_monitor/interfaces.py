@@ -0,0 +1,149 @@
+import heapq
+import re
+from collections.abc import Iterable, Sequence
+from fnmatch import translate
+from typing import Any
+
+# The types network interfaces are sorted into (see `utilities.interface_type`). Defined here, rather than next to
+# `interface_type`, so that the command line can offer them without importing psutil
+INTERFACE_TYPES = ("physical", "bridge", "veth", "loopback", "other")
+
+# The types of interface that are grouped together when virtual interfaces are grouped (see `InterfaceSelection`)
+VIRTUAL_TYPES = ("bridge", "veth", "other")
+
+# How many interfaces the Network pane and Network Screen show, at most, by default
+PANE_INTERFACES = 10
+SCREEN_INTERFACES = 100
+
+# Patterns starting with this are regular expressions, rather than globs
+REGEX_PREFIX = "re:"
+
+
+def current_rate(stat: dict[str, Any]) -> float:
+    """
+    How busy an interface is right now
+
+    :param stat: The interface, with rates (see `NetworkRates`)
+    :return: Its download and upload rates added up, in bytes/s
+    """
+    return stat.get("bytes_recv_rate", 0.0) + stat.get("bytes_sent_rate", 0.0)
+
+
+def aggregate(kind: str, stats: Sequence[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Add up the counters and rates of several interfaces of the same type into one.
+
+    The peak of the aggregate is the sum of the peaks of its interfaces, which may not have peaked at the same time.
+
+    :param kind: The type of the interfaces
+    :param stats: The interfaces, with rates
+    :return: The aggregate, named after the type of its interfaces and how many there are
+    """
+    totals: dict[str, Any] = {"interface": f"all {kind} ({len(stats)})", "type": kind}
+    for stat in stats:
+        for key, value in stat.items():
+            if key not in ("interface", "type"):
+                totals[key] = totals.get(key, 0) + value
+    return totals
+
+
+class InterfaceSelection:
+    """
+    Which network interfaces the Network pane and Network Screen show, out of every interface in a sample.
+
+    Interfaces are filtered by name and type, then virtual interfaces may be grouped by type into aggregates, then
+    only the busiest interfaces are kept (by current rate, with a bounded heap). What's kept stays in the order of
+    the sample, which puts the interfaces that received the most in total first (see `get_network_stats`), so rows
+    don't jump around as rates change. Only what's kept is formatted and rendered.
+    """
+
+    def __init__(
+        self,
+        patterns: Iterable[str] = (),
+        types: Iterable[str] = (),
+        group_virtual: bool = False,
+        limit: int | None = SCREEN_INTERFACES,
+    ) -> None:
+        """
+        :param patterns: Only show interfaces whose name matches one of these. Patterns are globs (e.g. `eth*`), or
+            regular expressions if they start with `re:` (e.g. `re:^(eth|wlan)\\d+$`). Show every name if empty
+        :param types: Only show interfaces of these types (see `INTERFACE_TYPES`). Show every type if empty
+        :param group_virtual: Whether to show one aggregate per type of virtual interface (see `VIRTUAL_TYPES`),
+            instead of each virtual interface
+        :param limit: How many interfaces the Network Screen shows, at most, or None to show every interface
+        """
+        self.patterns = tuple(patterns)
+        self.types = frozenset(types)
+        self.group_virtual = group_virtual
+        self.limit = limit
+
+        unknown = self.types - set(INTERFACE_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown interface types: {', '.join(sorted(unknown))}")
+
+        # Globs are compiled into one regular expression that must match the whole name, and regular expressions
+        # into another that may match anywhere in it
+        globs = [translate(pattern) for pattern in self.patterns if not pattern.startswith(REGEX_PREFIX)]
+        regexes = [pattern.removeprefix(REGEX_PREFIX) for pattern in self.patterns if pattern.startswith(REGEX_PREFIX)]
+        try:
+            self.glob = re.compile("|".join(f"(?:{glob})" for glob in globs)) if globs else None
+            self.regex = re.compile("|".join(f"(?:{regex})" for regex in regexes)) if regexes else None
+        except re.error as error:
+            raise ValueError(f"Invalid interface pattern: {error}") from error
+
+        # Whether each name matches, so that names aren't matched again on every sample
+        self.matched: dict[str, bool] = {}
+
+    def _name_matches(self, name: str) -> bool:
+        """
+        Check whether an interface name matches the patterns
+
+        :param name: The name of the interface
+        :return: Whether the interface should be shown
+        """
+        if not self.patterns:
+            return True
+        matched = self.matched.get(name)
+        if matched is None:
+            # Interfaces come and go on container hosts, so don't remember every name ever seen
+            if len(self.matched) > 8192:
+                self.matched.clear()
+            matched = self.matched[name] = (self.glob is not None and self.glob.fullmatch(name) is not None) or (
+                self.regex is not None and self.regex.search(name) is not None
+            )
+        return matched
+
+    def select(self, stats: Iterable[dict[str, Any]], limit: int | None) -> tuple[list[dict[str, Any]], int]:
+        """
+        Pick the interfaces to show
+
+        :param stats: Every interface in the latest network sample, with rates (see `NetworkRates`)
+        :param limit: How many interfaces to show, at most, or None for no limit
+        :return: The interfaces to show, and how many there were to choose from (after filtering and grouping)
+        """
+        selected = [
+            stat
+            for stat in stats
+            if (not self.types or stat.get("type") in self.types) and self._name_matches(stat["interface"])
+        ]
+
+        if self.group_virtual:
+            grouped: dict[str, list[dict[str, Any]]] = {}
+            kept: list[dict[str, Any] | str] = []
+            for stat in selected:
+                kind = stat.get("type")
+                if kind in VIRTUAL_TYPES:
+                    # Aggregates take the place of the first interface of their type
+                    if kind not in grouped:
+                        grouped[kind] = []
+                        kept.append(kind)
+                    grouped[kind].append(stat)
+                else:
+                    kept.append(stat)
+            selected = [aggregate(item, grouped[item]) if isinstance(item, str) else item for item in kept]
+
+        total = len(selected)
+        if limit is not None and total > limit:
+            busiest = heapq.nlargest(limit, range(total), key=lambda index: current_rate(selected[index]))
+            selected = [selected[index] for index in sorted(busiest)]
+        return selected, total
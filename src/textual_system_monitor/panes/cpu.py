@@ -2,35 +2,36 @@ from textual import getters
 from textual.app import ComposeResult
 from textual.containers import VerticalScroll
 from textual.reactive import reactive
-from textual.timer import Timer
 from textual.widgets import Static
 
-from ..utilities import COMMON_INTERVAL, get_cpu_data, get_palette, update_CPU_static
+from ..collector import interval_title, subscribe
+from ..rendering import get_styles, update_CPU_static
+from ..sparkline import HistorySparkline
+from ..utilities import CPUData
 
 
 class CPU_Usage(Static):
-    BORDER_TITLE = f"CPU Usage - Updated every {COMMON_INTERVAL}s"
+    BORDER_TITLE = "CPU Usage"
 
-    update_timer: Timer
-
-    cpu_data = reactive(get_cpu_data())
+    cpu_data: reactive[CPUData | None] = reactive(None, init=False)
 
     static = getters.query_one("#cpu_pane_static", expect_type=Static)
 
-    def update_cpu_data(self) -> None:
+    def update_cpu_data(self, cpu_data: CPUData) -> None:
         """
         Update CPU data
+
+        :param cpu_data: The latest CPU sample
         """
-        self.cpu_data = get_cpu_data()
+        self.cpu_data = cpu_data
 
-    def watch_cpu_data(self, cpu_data: dict[str, int | float | list[float] | None]) -> None:
+    def watch_cpu_data(self, cpu_data: CPUData) -> None:
         """
         Watch CPU data and update the Static Widget with the new information
 
-        :param cpu_data: A dictionary containing updated CPU data with keys 'cores', 'overall', and 'individual'.
+        :param cpu_data: The updated CPU data
         """
-        palette = get_palette(self.app.theme)
-        static_content = update_CPU_static(cpu_data, palette)
+        static_content = update_CPU_static(cpu_data, get_styles(self.app.theme))
         self.static.update(static_content)
 
     def on_click(self) -> None:
@@ -41,22 +42,17 @@ class CPU_Usage(Static):
 
     def compose(self) -> ComposeResult:
         """
-        Start off with a VerticalScroll Widget with a Static Widget insider
+        Start off with a chart of the overall CPU load, then a VerticalScroll Widget with a Static Widget insider
 
-        :return: The ComposeResult featuring the VerticalScroll and Static Widgets
+        :return: The ComposeResult featuring the chart, and the VerticalScroll and Static Widgets
         """
+        yield HistorySparkline("cpu", "cpu", "blue", classes="pane-sparkline")
         with VerticalScroll():
             yield Static(id="cpu_pane_static")
 
     def on_mount(self) -> None:
         """
-        Set intervals to update cpu usage
-        """
-        self.update_timer = self.set_interval(COMMON_INTERVAL, self.update_cpu_data)
-
-    def on_unmount(self) -> None:
-        """
-        Kill the timer on unmount to avoid timer-related threading issues
+        Show how often it is refreshed, and subscribe to the app's CPU samples
         """
-        if self.update_timer:
-            self.update_timer.stop()
+        self.border_title = interval_title(self, "cpu")
+        subscribe(self, "cpu", self.update_cpu_data)
@@ -1,49 +1,47 @@
-from typing import cast
+from typing import Any, cast
 
-from psutil import disk_partitions, disk_usage
 from textual import getters
 from textual.app import ComposeResult
 from textual.containers import VerticalScroll
 from textual.reactive import reactive
-from textual.timer import Timer
 from textual.widgets import Static
 
-from ..utilities import RARE_INTERVAL, bytes_to_human, get_color_formatted_string, get_palette
+from ..collector import interval_title, subscribe
+from ..rendering import Token, disk_io_tokens, get_styles, join_tokens, percentage_token
+from ..utilities import bytes_to_human
 
 
 class DriveUsage(Static):
-    BORDER_TITLE = f"Drive Usage - Updated every {RARE_INTERVAL}s"
+    BORDER_TITLE = "Drive Usage"
 
-    update_timer: Timer
-
-    # Set the default disks value to an initial call to the function
-    disks = reactive(
-        {
-            "device": item.device,
-            "mountpoint": item.mountpoint,
-            "fstype": item.fstype,
-            "opts": item.opts,
-        }
-        for item in disk_partitions()
-    )
+    disks: reactive[tuple[dict[str, Any], ...] | None] = reactive(None, init=False)
+    io: reactive[tuple[dict[str, Any], ...] | None] = reactive(None, init=False)
 
     static = getters.query_one("#drives_pane_static", expect_type=Static)
 
-    def update_disks(self) -> None:
+    def update_disks(self, disks: tuple[dict[str, Any], ...]) -> None:
         """
         Define how to update `self.disks`
+
+        :param disks: The latest disk sample
+        """
+        self.disks = disks
+
+    def update_io(self, io: tuple[dict[str, Any], ...]) -> None:
+        """
+        Define how to update `self.io`
+
+        :param io: The latest disk IO sample, with rates
+        """
+        self.io = io
+
+    def watch_io(self) -> None:
         """
-        self.disks = (
-            {
-                "device": item.device,
-                "mountpoint": item.mountpoint,
-                "fstype": item.fstype,
-                "opts": item.opts,
-            }
-            for item in disk_partitions()
-        )
-
-    def watch_disks(self, disks: list[dict[str, str]]) -> None:
+        Re-render the pane with the latest IO summary, even if disks haven't been sampled yet
+        """
+        self.watch_disks(self.disks or ())
+
+    def watch_disks(self, disks: tuple[dict[str, Any], ...]) -> None:
         """
         Define what happens when `self.disks` changes.
 
@@ -56,9 +54,10 @@ class DriveUsage(Static):
 
         kb_size = cast(Monitor, self.app).CONTEXT["kb_size"]
 
-        palette = get_palette(self.app.theme)
+        styles = get_styles(self.app.theme)
 
-        static_content = ""
+        # The IO of every disk is summed up at the top
+        tokens: list[Token] = [] if self.io is None else disk_io_tokens(self.io, kb_size, styles)
 
         # Next, go through each updated disk, get its info, and update the content of the Static with
         # the updated info for each drive
@@ -67,37 +66,40 @@ class DriveUsage(Static):
             device = str(disk["device"]).replace(":\\", "")
             fs = disk["fstype"] or "N/A"
 
+            usage = disk["usage"]
+
+            # A mount that didn't answer in time (e.g. a hung network share) has no usage either, but isn't a CD drive
+            if disk.get("unresponsive"):
+                tokens += (
+                    (f"Disk: {device} | Options: {options} | Filesystem: {fs} | Usage: ", None),
+                    ("Unresponsive", styles["red"]),
+                    ("\n\n", None),
+                )
             # If the drive is a CD drive, treat it differently
-            if options == "cdrom":
-                static_content += f"Disk: {device} | Options: {options}\n\n"
+            elif usage is None:
+                tokens.append((f"Disk: {device} | Options: {options}\n\n", None))
             else:
-                usage = disk_usage(disk["mountpoint"])
-                used = bytes_to_human(usage.used, kb_size)
-                free = bytes_to_human(usage.free, kb_size)
-                total = bytes_to_human(usage.total, kb_size)
+                used = bytes_to_human(usage["used"], kb_size)
+                free = bytes_to_human(usage["free"], kb_size)
+                total = bytes_to_human(usage["total"], kb_size)
 
                 # Add the new info for this drive to the content of the Static widget
-                static_content += (
-                    f"Disk: {device} | Options: {options} | Filesystem: {fs} | "
-                    f"Usage: {get_color_formatted_string(palette, usage.percent)} % | "
-                    f"Total: {total} | Used: {used} | Free: {free}\n\n"
+                tokens += (
+                    (f"Disk: {device} | Options: {options} | Filesystem: {fs} | Usage: ", None),
+                    percentage_token(styles, usage["percent"]),
+                    (f" % | Total: {total} | Used: {used} | Free: {free}\n\n", None),
                 )
 
         # Update the content of the Static widget with the new info for all drives
-        self.static.update(static_content)
+        self.static.update(join_tokens(tokens))
 
     def on_mount(self) -> None:
         """
-        Hook up the `update_disks` function, set to a long interval
-        """
-        self.update_timer = self.set_interval(RARE_INTERVAL, self.update_disks)
-
-    def on_unmount(self) -> None:
-        """
-        Kill the timer on unmount to avoid timer-related threading issues
+        Show how often it is refreshed, and subscribe to the app's disk and disk IO samples
         """
-        if self.update_timer:
-            self.update_timer.stop()
+        self.border_title = interval_title(self, "disks")
+        subscribe(self, "disks", self.update_disks)
+        subscribe(self, "disk_io", self.update_io)
 
     def on_click(self) -> None:
         """
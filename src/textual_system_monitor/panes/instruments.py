@@ -0,0 +1,78 @@
+from typing import TYPE_CHECKING, cast
+
+from textual.widgets import Static
+
+from ..collector import run_every, stop_running
+from ..rendering import Token, get_styles, join_tokens
+from ..utilities import bytes_to_human
+
+if TYPE_CHECKING:
+    from ..app import Monitor
+
+# How many of the most expensive samples and renders the overlay lists
+OVERLAY_ROWS = 16
+
+
+class InstrumentsOverlay(Static):
+    """
+    Shows what the monitor itself costs (see `Instruments`), on top of whatever screen is in front. Refreshed on the
+    app's timer, as often as `instruments` is (see `collector.DEFAULT_INTERVALS`)
+    """
+
+    BORDER_TITLE = "tsm's Own Cost"
+    DEFAULT_CSS = """
+    InstrumentsOverlay {
+        overlay: screen;
+        position: absolute;
+        offset: 2 2;
+        width: 84;
+        max-width: 100%;
+        height: auto;
+        padding: 0 1;
+        background: $panel;
+        border: round $accent;
+    }
+    """
+
+    def on_mount(self) -> None:
+        """
+        Show the latest measurements, then keep them up to date on the app's timer
+        """
+        self.refresh_report()
+        run_every(self, "instruments", self.refresh_report)
+
+    def on_unmount(self) -> None:
+        """
+        Stop refreshing on the app's timer on unmount to avoid timer-related threading issues
+        """
+        stop_running(self)
+
+    def refresh_report(self) -> None:
+        """
+        Render everything measured so far
+        """
+        app = cast("Monitor", self.app)
+        report = app.instruments.report()
+        heading = get_styles(app.theme)["green"]
+
+        tokens: list[Token] = [
+            (f"{'Call':<36} {'Calls':>7} {'Mean (ms)':>10} {'Max (ms)':>9} {'Mean CPU (ms)':>13}", heading),
+        ]
+        for name, timing in list(report["timings"].items())[:OVERLAY_ROWS]:
+            row = (
+                f"\n{name:<36} {timing['count']:>7} {timing['mean_wall_ms']:>10.2f} {timing['max_wall_ms']:>9.2f} "
+                f"{timing['mean_cpu_ms']:>13.2f}"
+            )
+            tokens.append((row, None))
+        jitter = report["tick_jitter"]
+        tokens += (
+            ("\n\n", None),
+            ("Tick Jitter", heading),
+            (
+                f": {jitter['mean_ms']:.2f} ms mean, {jitter['max_ms']:.2f} ms max over {jitter['ticks']} ticks\n",
+                None,
+            ),
+            ("RSS", heading),
+            (f": {bytes_to_human(report['rss_bytes'], app.CONTEXT['kb_size'])}", None),
+        )
+        self.update(join_tokens(tokens))
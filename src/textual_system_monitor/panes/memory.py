@@ -4,28 +4,30 @@ from textual import getters
 from textual.app import ComposeResult
 from textual.containers import VerticalScroll
 from textual.reactive import reactive
-from textual.timer import Timer
 from textual.widgets import Static
 
-from ..utilities import COMMON_INTERVAL, bytes_to_human, get_color_formatted_string, get_mem_data, get_palette
+from ..collector import interval_title, subscribe
+from ..rendering import Token, get_styles, join_tokens, percentage_token
+from ..sparkline import HistorySparkline
+from ..utilities import MemoryData, bytes_to_human
 
 
 class MemUsage(Static):
-    BORDER_TITLE = f"Memory Usage - Updated every {COMMON_INTERVAL}s"
+    BORDER_TITLE = "Memory Usage"
 
-    update_timer: Timer
-
-    mem_data = reactive(get_mem_data())
+    mem_data: reactive[MemoryData | None] = reactive(None, init=False)
 
     static = getters.query_one("#mem_pane_static", expect_type=Static)
 
-    def update_mem_data(self) -> None:
+    def update_mem_data(self, mem_data: MemoryData) -> None:
         """
-        Update the memory information by calling `get_mem_data()`
+        Update the memory information
+
+        :param mem_data: The latest memory sample
         """
-        self.mem_data = get_mem_data()
+        self.mem_data = mem_data
 
-    def watch_mem_data(self, data: dict[str, int | float]) -> None:
+    def watch_mem_data(self, data: MemoryData) -> None:
         """
         Watch for changes in the memory data and update the Static widget accordingly
 
@@ -36,14 +38,22 @@ class MemUsage(Static):
 
         kb_size = cast(Monitor, self.app).CONTEXT["kb_size"]
 
-        palette = get_palette(self.app.theme)
+        styles = get_styles(self.app.theme)
+
+        total = bytes_to_human(data.total, kb_size)
+        available = bytes_to_human(data.available, kb_size)
+        used = bytes_to_human(data.used, kb_size)
+        swap_used = bytes_to_human(data.swap_used, kb_size)
+        swap_total = bytes_to_human(data.swap_total, kb_size)
 
-        self.static.update(
-            f"Total Memory: {bytes_to_human(data['total'], kb_size)}\n\n"
-            f"Available Memory: {bytes_to_human(data['available'], kb_size)}\n\n"
-            f"Used: {bytes_to_human(data['used'], kb_size)}\n\n"
-            f"Percentage Used: {get_color_formatted_string(palette, data['percent'])} %",
-        )
+        tokens: list[Token] = [
+            (f"Total Memory: {total}\n\nAvailable Memory: {available}\n\nUsed: {used}\n\nPercentage Used: ", None),
+            percentage_token(styles, data.percent),
+            (f" %\n\nSwap Used: {swap_used} of {swap_total} (", None),
+            percentage_token(styles, data.swap_percent),
+            (" %)", None),
+        ]
+        self.static.update(join_tokens(tokens))
 
     def on_click(self) -> None:
         """
@@ -53,22 +63,18 @@ class MemUsage(Static):
 
     def compose(self) -> ComposeResult:
         """
-        Generate a ComposeResult by yielding a vertically scrolling Static widget with the memory information.
+        Generate a ComposeResult by yielding a chart of memory usage, then a vertically scrolling Static widget
+        with the memory information.
 
         :return: The ComposeResult
         """
+        yield HistorySparkline("mem", "mem", "yellow", classes="pane-sparkline")
         with VerticalScroll():
             yield Static(id="mem_pane_static")
 
     def on_mount(self) -> None:
         """
-        Set intervals to update the memory information.
-        """
-        self.update_timer = self.set_interval(COMMON_INTERVAL, self.update_mem_data)
-
-    def on_unmount(self) -> None:
-        """
-        Kill the timer on unmount to avoid timer-related threading issues
+        Show how often it is refreshed, and subscribe to the app's memory samples
         """
-        if self.update_timer:
-            self.update_timer.stop()
+        self.border_title = interval_title(self, "mem")
+        subscribe(self, "mem", self.update_mem_data)
@@ -1,67 +1,66 @@
-from typing import cast
+from typing import Any, cast
 
 from textual import getters
 from textual.app import ComposeResult
 from textual.containers import VerticalScroll
 from textual.reactive import reactive
-from textual.timer import Timer
 from textual.widgets import Static
 
-from ..utilities import NET_INTERVAL, get_network_stats, get_palette, update_network_static
+from ..collector import interval_title, subscribe
+from ..interfaces import PANE_INTERFACES
+from ..rendering import get_styles, update_network_static
+from ..sparkline import HistorySparkline
 
-type NetworkStatsType = list[dict[str, str | int]]
+type NetworkStatsType = tuple[dict[str, Any], ...]
 
 
 class NetInfo(Static):
-    BORDER_TITLE = f"Network Info - Updated every {NET_INTERVAL}s"
+    BORDER_TITLE = "Network Info"
 
-    update_timer: Timer
-
-    io = reactive(get_network_stats())
+    # Every sample is new, so always update rather than compare every counter of every interface
+    io: reactive[NetworkStatsType | None] = reactive(None, init=False, always_update=True)
 
     static = getters.query_one("#network_pane_static", expect_type=Static)
 
-    def update_io(self) -> None:
+    def update_io(self, io: NetworkStatsType) -> None:
         """
         Define how to update `self.io`
+
+        :param io: The latest network sample
         """
-        self.io = get_network_stats()
+        self.io = io
 
-    def watch_io(self, old: NetworkStatsType, new: NetworkStatsType) -> None:
+    def watch_io(self, io: NetworkStatsType) -> None:
         """
         Define what happens when `self.io` changes.
 
         Update the Network pane with new info for each network interface
 
-        :param old: The list of old interface info to use
-        :param new: The list of new interface info to use
+        :param io: The latest network sample, with rates
         """
 
         from textual_system_monitor.app import Monitor  # Need to import here to avoid circular import
 
-        kb_size = cast(Monitor, self.app).CONTEXT["kb_size"]
+        app = cast(Monitor, self.app)
+        kb_size = app.CONTEXT["kb_size"]
 
-        palette = get_palette(self.app.theme)
+        # Only the interfaces that are shown are formatted
+        shown, total = app.interfaces.select(io, PANE_INTERFACES)
+        self.border_subtitle = f"Top {len(shown)} of {total:,} by Speed" if len(shown) < total else ""
 
-        # Go through each updated network interface, get its info, and update the Static widget
+        # Go through each shown network interface, get its info, and update the Static widget
         # with the new info for each interface
-        static_content = update_network_static(new, old, kb_size, palette)
+        static_content = update_network_static(shown, kb_size, get_styles(self.app.theme))
 
         # Update the content of the Static widget with the new info for all interfaces
         self.static.update(static_content)
 
     def on_mount(self) -> None:
         """
-        Hook up the `update_io` function, set to an interval of 1 second
-        """
-        self.update_timer = self.set_interval(NET_INTERVAL, self.update_io)
-
-    def on_unmount(self) -> None:
-        """
-        Kill the timer on unmount to avoid timer-related threading issues
+        Show how often it is refreshed, and subscribe to the app's network samples
         """
-        if self.update_timer:
-            self.update_timer.stop()
+        self.border_title = interval_title(self, "network")
+        subscribe(self, "network", self.update_io)
 
     def on_click(self) -> None:
         """
@@ -71,9 +70,11 @@ class NetInfo(Static):
 
     def compose(self) -> ComposeResult:
         """
-        Start off with a simple VerticalScroll Widget with a Static attached
+        Start off with charts of the total download and upload speeds, then a VerticalScroll Widget with a Static
 
-        :return: The ComposeResult featuring the VerticalScroll and Static
+        :return: The ComposeResult featuring the charts, and the VerticalScroll and Static
         """
+        yield HistorySparkline("network", "net:rx", "green", maximum=None, classes="pane-sparkline")
+        yield HistorySparkline("network", "net:tx", "blue", maximum=None, classes="pane-sparkline")
         with VerticalScroll():
             yield Static("", id="network_pane_static")
@@ -1,49 +1,38 @@
-from collections.abc import Iterator
-from typing import cast
+from typing import TYPE_CHECKING, Any, cast
 
-from psutil import Process, process_iter
 from textual import getters
 from textual.app import ComposeResult
 from textual.containers import VerticalScroll
 from textual.reactive import reactive
-from textual.timer import Timer
 from textual.widgets import Static
 
-from ..utilities import UNCOMMON_INTERVAL, get_color_formatted_string, get_non_zero_procs, get_palette
+from ..collector import interval_title, subscribe
+from ..rendering import Token, get_styles, join_tokens, percentage_token
+from ..utilities import PROCESS_SORT_KEYS, bytes_to_human, rank_processes
+
+if TYPE_CHECKING:
+    from ..app import Monitor
 
 
 class Processes(Static):
-    BORDER_TITLE = f"Processes - Updated every {UNCOMMON_INTERVAL}s"
+    BORDER_TITLE = "Processes"
     BORDER_SUBTITLE = "Top 10 by CPU Load"
 
-    update_timer: Timer
-
     initial = True  # When app starts, want to wait a tick before displaying processes. This variable helps with that
 
-    # Set the default processes value to an initial call to the function
-    procs = process_iter(["pid", "name", "username", "exe", "cpu_percent"])
-    processes = reactive(
-        sorted(
-            get_non_zero_procs(procs),
-            key=lambda x: cast(float, x.info.get("cpu_percent")),
-            reverse=True,
-        )[:10],
-    )
+    processes: reactive[tuple[dict[str, Any], ...] | None] = reactive(None, init=False)
 
     static = getters.query_one("#procs_pane_static", expect_type=Static)
 
-    def update_processes(self) -> None:
+    def update_processes(self, processes: tuple[dict[str, Any], ...]) -> None:
         """
-        Update the list of processes with the top 10 by CPU load.
+        Update the list of processes
+
+        :param processes: The latest process sample
         """
-        procs = process_iter(["pid", "name", "username", "exe", "cpu_percent"])
-        self.processes = sorted(
-            get_non_zero_procs(procs),
-            key=lambda x: x.info["cpu_percent"],
-            reverse=True,
-        )[:10]
-
-    def watch_processes(self, procs: Iterator[Process]) -> None:
+        self.processes = processes
+
+    def watch_processes(self, procs: tuple[dict[str, Any], ...]) -> None:
         """
         Define what happens when `self.processes` changes.
 
@@ -52,45 +41,69 @@ class Processes(Static):
         :param procs: The list of new processes to render
         """
 
-        palette = get_palette(self.app.theme)
+        app = cast("Monitor", self.app)
+        styles = get_styles(app.theme)
+        kb_size = app.CONTEXT["kb_size"]
+        sort_key = app.process_sort
 
         # Don't bother if this is the first tick of the update function
         if self.initial:
             self.initial = False
             return
 
-        static_content = ""
+        tokens: list[Token] = []
+
+        # Only the top 10 are shown, so there is no need to sort every process
+        top_procs = rank_processes(procs, sort_key, limit=10)
 
         # Go through each updated process, get its info, and update the Static widget
         # with the new info for each process
-        for proc in procs:
-            PID = proc.info["pid"]
-            name = proc.info["name"] or "N/A"
-            exe = proc.info["exe"] or "N/A"
-            cpu_percent = get_color_formatted_string(palette, proc.info["cpu_percent"])
-            user_name = proc.info["username"] or "N/A"
+        for proc in top_procs:
+            PID = proc["pid"]
+            name = proc["name"] or "N/A"
+            exe = proc["exe"] or "N/A"
+            user_name = proc["username"] or "N/A"
+            rss = bytes_to_human(proc["rss"], kb_size) if proc["rss"] is not None else "N/A"
+
+            # Also show what the processes are ranked by, if it isn't shown already
+            ranked_by = ""
+            if sort_key in ("io_rate", "num_threads", "num_fds"):
+                value = proc[sort_key]
+                if value is None:
+                    value = "N/A"
+                elif sort_key == "io_rate":
+                    value = f"{bytes_to_human(value, kb_size)}/s"
+                ranked_by = f"{PROCESS_SORT_KEYS[sort_key]}: {value} | "
 
             # Add the new info for this process to the content of the Static widget
-            static_content += (
-                f"PID: {PID} | CPU Load: {cpu_percent} % | Name: [bold {palette['orange']}]{name}[/] | "
-                f"Username: {user_name} | EXE: {exe}\n\n"
+            tokens += (
+                (f"PID: {PID} | CPU Load: ", None),
+                percentage_token(styles, proc["cpu_percent"]),
+                (f" % | Memory: {rss} | {ranked_by}Name: ", None),
+                (name, styles["orange"]),
+                (f" | Username: {user_name} | EXE: {exe}\n\n", None),
             )
 
         # Update the content of the Static widget with the new info for all processes
-        self.static.update(static_content)
+        self.static.update(join_tokens(tokens))
 
     def on_mount(self) -> None:
         """
-        Hook up the `update_processes` function, set to a long interval
-        """
-        self.update_timer = self.set_interval(UNCOMMON_INTERVAL, self.update_processes)
-
-    def on_unmount(self) -> None:
-        """
-        Kill the timer on unmount to avoid timer-related threading issues
+        Show how often it is refreshed, subscribe to the app's process samples, and re-rank them whenever the sort
+        key changes
         """
-        if self.update_timer:
-            self.update_timer.stop()
+        self.border_title = interval_title(self, "processes")
+        subscribe(self, "processes", self.update_processes)
+
+        def _on_sort_change(sort_key: str) -> None:
+            """
+            Update the subtitle, and re-rank the latest sample by the new sort key
+            """
+            self.border_subtitle = f"Top 10 by {PROCESS_SORT_KEYS[sort_key]}"
+            if self.processes is not None:
+                self.watch_processes(self.processes)
+
+        self.watch(self.app, "process_sort", _on_sort_change)
 
     def on_click(self) -> None:
         """
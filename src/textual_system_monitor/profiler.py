@@ -0,0 +1,255 @@
+import marshal
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from itertools import pairwise
+from types import CodeType, FrameType
+from typing import Any
+
+# How often every thread is sampled, in seconds
+PROFILE_INTERVAL = 0.005
+
+# The libraries time is attributed to as a whole, rather than per module
+LIBRARIES = ("textual", "rich", "psutil")
+
+# How many of the hottest functions the summary lists
+SUMMARY_ROWS = 15
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# A function, as pstats knows it: its file, first line, and name
+FunctionKey = tuple[str, int, str]
+
+# What pstats reads for every function: primitive and total calls, own and cumulative time, and the same per caller
+FunctionStats = tuple[int, int, float, float, dict[FunctionKey, tuple[int, int, float, float]]]
+
+
+def _key(code: CodeType) -> FunctionKey:
+    """
+    Name a function the way pstats does
+
+    :param code: The code object of the function
+    :return: Its file, first line, and name
+    """
+    return code.co_filename, code.co_firstlineno, code.co_name
+
+
+def area(filename: str) -> str:
+    """
+    Find what part of the app, or which library, a file belongs to
+
+    :param filename: The file a function is defined in
+    :return: The file relative to the package (e.g. `panes/cpu.py`) for our own modules, the name of the library
+        for `LIBRARIES`, or `python` for anything else
+    """
+    path = os.path.abspath(filename)
+    if path.startswith(PACKAGE_DIR + os.sep):
+        return os.path.relpath(path, PACKAGE_DIR).replace(os.sep, "/")
+    for library in LIBRARIES:
+        if f"{os.sep}{library}{os.sep}" in path:
+            return library
+    return "python"
+
+
+def _location(filename: str) -> str:
+    """
+    Shorten the file a function is defined in, for the summary
+
+    :param filename: The file
+    :return: The file relative to the package, or to the library it belongs to (e.g. `textual/widget.py`), or just
+        its name otherwise
+    """
+    name = area(filename)
+    if name == "python":
+        return os.path.basename(filename)
+    if name in LIBRARIES:
+        path = os.path.abspath(filename)
+        return path[path.rindex(f"{os.sep}{name}{os.sep}") + 1 :].replace(os.sep, "/")
+    return name
+
+
+def _thread_cpu(ident: int) -> float | None:
+    """
+    Read how much CPU time a thread has used
+
+    :param ident: The identifier of the thread
+    :return: Its CPU time, in seconds, or None where threads' CPU time can't be read (e.g. on Windows)
+    """
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(ident))
+    except (AttributeError, OSError):
+        return None
+
+
+class SamplingProfiler:
+    """
+    A statistical profiler for the whole app, every thread included.
+
+    A background thread looks at the stack of every other thread (with `sys._current_frames`) every
+    `PROFILE_INTERVAL` seconds. Unlike `cProfile`, nothing runs on each function call, so hot functions that are
+    called thousands of times per render (e.g. `bytes_to_human`) aren't slowed down by being measured.
+
+    Each stack is weighted by the CPU time its thread used since it was last sampled, so that threads waiting on
+    IO or a timer don't count. Where threads' CPU time can't be read, each stack is weighted by the interval
+    instead. Identical stacks are only counted, so memory stays flat however long the profile runs.
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL) -> None:
+        """
+        :param interval: How often every thread is sampled, in seconds
+        """
+        self.interval = interval
+        self.thread: threading.Thread | None = None
+        self.stopping = threading.Event()
+
+        # The weight of every stack seen, as a tuple of code objects from the outermost frame in, and how often it
+        # was seen
+        self.weights: Counter[tuple[CodeType, ...]] = Counter()
+        self.counts: Counter[tuple[CodeType, ...]] = Counter()
+        self.samples = 0
+        self.started = 0.0
+        self.elapsed = 0.0
+
+        # The CPU time of every thread when it was last sampled, so that only what it used since is counted
+        self.cpu_times: dict[int, float] = {}
+
+    def start(self) -> None:
+        """
+        Start sampling, on a daemon thread so that it never holds up exiting
+        """
+        self.started = time.perf_counter()
+        for ident in sys._current_frames():
+            cpu = _thread_cpu(ident)
+            if cpu is not None:
+                self.cpu_times[ident] = cpu
+        self.thread = threading.Thread(target=self._run, name="tsm-profiler", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop sampling
+        """
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join()
+        self.elapsed = time.perf_counter() - self.started
+
+    def _run(self) -> None:
+        """
+        Sample every thread until stopped. Runs in the profiler's own thread
+        """
+        own = threading.get_ident()
+        while not self.stopping.wait(self.interval):
+            self.sample(own)
+
+    def sample(self, skip: int | None = None) -> None:
+        """
+        Record the stack of every thread
+
+        :param skip: The identifier of a thread not to sample (the profiler's own)
+        """
+        self.samples += 1
+        cpu_times = {}
+        for ident, frame in sys._current_frames().items():
+            if ident == skip:
+                continue
+            weight = self.interval
+            cpu = _thread_cpu(ident)
+            if cpu is not None:
+                # A thread seen for the first time started since the previous sample (or its identifier was reused
+                # by one that did), so it used all of its CPU time since then
+                previous = self.cpu_times.get(ident, 0.0)
+                weight = cpu - previous if cpu >= previous else cpu
+                cpu_times[ident] = cpu
+            stack = self._stack(frame)
+            self.weights[stack] += weight
+            self.counts[stack] += 1
+        self.cpu_times = cpu_times
+
+    @staticmethod
+    def _stack(frame: FrameType | None) -> tuple[CodeType, ...]:
+        """
+        Read a thread's stack
+
+        :param frame: The frame the thread is running
+        :return: The code object of every frame, from the outermost one in
+        """
+        codes = []
+        while frame is not None:
+            codes.append(frame.f_code)
+            frame = frame.f_back
+        codes.reverse()
+        return tuple(codes)
+
+    def stats(self) -> dict[FunctionKey, FunctionStats]:
+        """
+        Turn the samples into the statistics `pstats` reads. Call counts are sample counts, and times are weights
+
+        :return: For every function: how often it was seen (twice over, as primitive and total calls), its own time,
+            its cumulative time, and the same for every function it was seen being called from
+        """
+        own: Counter[FunctionKey] = Counter()
+        cumulative: Counter[FunctionKey] = Counter()
+        seen: Counter[FunctionKey] = Counter()
+        callers: dict[FunctionKey, Counter[FunctionKey]] = {}
+        caller_weights: dict[FunctionKey, Counter[FunctionKey]] = {}
+
+        for stack, weight in self.weights.items():
+            count = self.counts[stack]
+            keys = [_key(code) for code in stack]
+            own[keys[-1]] += weight
+
+            # Recursive functions only count once per stack towards their cumulative time
+            for key in set(keys):
+                cumulative[key] += weight
+                seen[key] += count
+            for caller, callee in set(pairwise(keys)):
+                callers.setdefault(callee, Counter())[caller] += count
+                caller_weights.setdefault(callee, Counter())[caller] += weight
+
+        return {
+            key: (
+                seen[key],
+                seen[key],
+                own[key],
+                cumulative[key],
+                {
+                    caller: (count, count, 0.0, caller_weights[key][caller])
+                    for caller, count in callers.get(key, Counter()).items()
+                },
+            )
+            for key in seen
+        }
+
+    def dump(self, path: str) -> None:
+        """
+        Write the profile to a file that `pstats` (or snakeviz, etc.) can read
+
+        :param path: The file to write to
+        """
+        with open(path, "wb") as file:
+            marshal.dump(self.stats(), file)
+
+    def summary(self) -> str:
+        """
+        Sum the profile up: how much time went to each of our modules versus Textual and the other libraries, and
+        which functions are the hottest
+
+        :return: The summary, as text
+        """
+        stats = self.stats()
+        total = sum(own for _, _, own, _, _ in stats.values()) or 1.0
+
+        areas: Counter[str] = Counter()
+        for (filename, _, _), (_, _, own, _, _) in stats.items():
+            areas[area(filename)] += own
+
+        lines = [f"{self.samples} samples over {self.elapsed:.1f}s", "", "Time by area:"]
+        lines += [f"  {own / total:6.1%}  {name}" for name, own in areas.most_common()]
+        lines += ["", "Hottest functions (own time):"]
+        hottest: list[tuple[FunctionKey, Any]] = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)
+        for (filename, line, name), (_, _, own, _, _) in hottest[:SUMMARY_ROWS]:
+            lines.append(f"  {own / total:6.1%}  {_location(filename)}:{line} {name}")
+        return "\n".join(lines)
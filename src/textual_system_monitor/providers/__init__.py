@@ -0,0 +1,3 @@
+# The providers that can be picked by name, e.g. on the command line. Kept here, away from the providers
+# themselves, so that the command line can offer them without importing any
+PROVIDER_NAMES = ("auto", "psutil", "procfs", "fake")
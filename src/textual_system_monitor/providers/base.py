@@ -0,0 +1,57 @@
+from collections.abc import Callable
+from typing import Any, Protocol
+
+from ..utilities import CPUData, MemoryData
+from . import PROVIDER_NAMES
+from .fake import FakeProvider
+from .procfs import ProcFSProvider, is_supported
+from .psutil_provider import PsutilProvider
+
+
+class Provider(Protocol):
+    """
+    Where the `Collector` (and the exporter) get every metric from. There is one method per field of `Snapshot`.
+
+    Providers may keep state between samples (e.g. to work out CPU load since the previous sample), so each
+    consumer should have its own. Methods are called from thread workers, but never concurrently for one metric.
+    Disks may take a while to sample, so `disks` may also hand over partial samples to `progress` while sampling.
+    """
+
+    def cpu(self) -> CPUData: ...
+
+    def mem(self) -> MemoryData: ...
+
+    def network(self) -> list[dict[str, Any]]: ...
+
+    def disks(self, progress: Callable[[list[dict[str, Any]]], None] | None = None) -> list[dict[str, Any]]: ...
+
+    def disk_io(self) -> list[dict[str, Any]]: ...
+
+    def processes(self, sort_key: str = "cpu_percent") -> list[dict[str, Any]]: ...
+
+
+def default_provider() -> Provider:
+    """
+    Pick the fastest provider that works on this system
+
+    :return: A `ProcFSProvider` on Linux, a `PsutilProvider` elsewhere
+    """
+    return ProcFSProvider() if is_supported() else PsutilProvider()
+
+
+def make_provider(name: str) -> Provider:
+    """
+    Create a provider by name
+
+    :param name: One of `PROVIDER_NAMES`
+    :return: The provider
+    """
+    if name == "auto":
+        return default_provider()
+    if name == "psutil":
+        return PsutilProvider()
+    if name == "procfs":
+        return ProcFSProvider()
+    if name == "fake":
+        return FakeProvider()
+    raise ValueError(f"Unknown provider {name!r}. Pick one of: {', '.join(PROVIDER_NAMES)}")
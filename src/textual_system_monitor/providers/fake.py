@@ -0,0 +1,339 @@
+import math
+import random
+import time
+from collections.abc import Callable
+from typing import Any
+
+from ..utilities import CPUData, MemoryData
+
+# A load curve maps the seconds since a `FakeProvider` was created to a load between 0 and 1
+type LoadCurve = Callable[[float], float]
+
+GIB = 1024**3
+
+
+def constant(level: float) -> LoadCurve:
+    """
+    A load that never changes
+
+    :param level: The load, between 0 and 1
+    :return: The load curve
+    """
+    return lambda _seconds: level
+
+
+def sine(period: float = 60.0, low: float = 0.1, high: float = 0.9) -> LoadCurve:
+    """
+    A load that rises and falls smoothly
+
+    :param period: How long one rise and fall takes, in seconds
+    :param low: The lowest load
+    :param high: The highest load
+    :return: The load curve
+    """
+    return lambda seconds: low + (high - low) * (1 - math.cos(2 * math.pi * seconds / period)) / 2
+
+
+def ramp(duration: float, start: float = 0.0, end: float = 1.0) -> LoadCurve:
+    """
+    A load that goes from one level to another, then stays there
+
+    :param duration: How long it takes to get from `start` to `end`, in seconds
+    :param start: The load at first
+    :param end: The load from `duration` on
+    :return: The load curve
+    """
+    return lambda seconds: start + (end - start) * min(max(seconds / duration, 0.0), 1.0)
+
+
+def spikes(every: float, length: float, base: float = 0.1, peak: float = 1.0) -> LoadCurve:
+    """
+    A low load with regular bursts
+
+    :param every: How often a burst starts, in seconds
+    :param length: How long each burst lasts, in seconds
+    :param base: The load between bursts
+    :param peak: The load during bursts
+    :return: The load curve
+    """
+    return lambda seconds: peak if seconds % every < length else base
+
+
+def _interface(number: int) -> tuple[str, str]:
+    """
+    Name an interface like a container host would: a loopback, a couple of NICs, a bridge, then veths
+
+    :param number: The number of the interface
+    :return: The name and type of the interface (see `interface_type`)
+    """
+    if number == 0:
+        return "lo", "loopback"
+    if number < 3:
+        return f"eth{number - 1}", "physical"
+    if number == 3:
+        return "docker0", "bridge"
+    return f"veth{number:07x}", "veth"
+
+
+class FakeProvider:
+    """
+    A scripted system of any size, whose load follows a `LoadCurve`, for testing and benchmarking the whole app
+    without a machine of that size.
+
+    Every core, interface, and process lags behind the curve by its own phase, so that they don't all move in
+    lockstep, and a few processes take most of the load, like on a real system. Everything is derived from the
+    seed and the readings of `clock`, so the same script read at the same times always gives the same samples.
+    """
+
+    def __init__(
+        self,
+        cores: int = 8,
+        processes: int = 300,
+        interfaces: int = 4,
+        mounts: int = 4,
+        load: LoadCurve | None = None,
+        seed: int = 0,
+        lifetime: float | None = None,
+        clock: Callable[[], float] | None = None,
+    ) -> None:
+        """
+        :param cores: How many CPU cores there are
+        :param processes: How many processes are running at any time
+        :param interfaces: How many network interfaces there are
+        :param mounts: How many partitions there are
+        :param load: How the load changes over time. Defaults to a sine wave over a minute
+        :param seed: The seed of everything that isn't scripted (names, sizes, phases, etc.)
+        :param lifetime: How long each process runs before another takes its place (with a new PID), in seconds,
+            or None for processes to never exit
+        :param clock: Where to read the time from, in seconds. Defaults to `time.monotonic`
+        """
+        rng = random.Random(seed)
+        self.load = load or sine()
+        self.lifetime = lifetime
+        self.clock = clock or time.monotonic
+        self.start = self.clock()
+
+        self.core_phases = [rng.uniform(0, 30) for _ in range(cores)]
+
+        # Each interface peaks at the speed of its link, in bytes/s, and counts every byte since it came up
+        self.interfaces = [
+            (*_interface(number), rng.uniform(0, 30), rng.choice((1.25e6, 1.25e7, 1.25e8)))
+            for number in range(interfaces)
+        ]
+        self.counters = [[0.0, 0.0] for _ in range(interfaces)]
+        self.last_network: float | None = None
+
+        # Each partition's size, and how full it is
+        self.mounts = [
+            (f"/dev/sd{number}", f"/mnt/disk{number}", 2 ** rng.randint(35, 42), rng.uniform(0.1, 0.9))
+            for number in range(mounts)
+        ]
+
+        # Each partition's disk peaks at this many IOPS, and counts every read, write, and busy ms since it came up
+        self.disk_speeds = [rng.choice((200.0, 5_000.0, 50_000.0)) for _ in range(mounts)]
+        self.ios = [[0.0, 0.0, 0.0] for _ in range(mounts)]
+        self.last_disk_io: float | None = None
+
+        # Most processes idle, while a few take most of the load
+        self.slots = [
+            {
+                "name": f"{rng.choice(('worker', 'server', 'daemon', 'shell', 'browser'))}-{slot}",
+                "username": rng.choice(("root", "user", "www-data")),
+                "weight": rng.random() ** 8,
+                "phase": rng.uniform(0, 30),
+                "rss": rng.randint(1 << 20, 1 << 31),
+                "num_threads": rng.randint(1, 64),
+                "num_fds": rng.randint(3, 512),
+                "offset": rng.uniform(0, lifetime or 1),
+            }
+            for slot in range(processes)
+        ]
+
+        self.mem_total = 64 * GIB
+        self.swap_total = 8 * GIB
+
+    def elapsed(self) -> float:
+        """
+        How far into the script the provider is
+
+        :return: The seconds since the provider was created
+        """
+        return self.clock() - self.start
+
+    def _load(self, seconds: float) -> float:
+        """
+        Read the load curve, clamped between 0 and 1
+
+        :param seconds: The seconds since the provider was created
+        :return: The load
+        """
+        return min(max(self.load(seconds), 0.0), 1.0)
+
+    def cpu(self) -> CPUData:
+        """
+        Sample CPU load: each core follows the curve, with its own phase
+
+        :return: The CPU sample
+        """
+        now = self.elapsed()
+        individual = tuple(round(self._load(now - phase) * 100, 1) for phase in self.core_phases)
+        overall = round(sum(individual) / len(individual), 1) if individual else 0.0
+        return CPUData(
+            cores=len(individual),
+            overall=overall,
+            individual=individual,
+            user=round(overall * 0.7, 1),
+            system=round(overall * 0.2, 1),
+            iowait=round(overall * 0.05, 1),
+            irq=round(overall * 0.05, 1),
+        )
+
+    def mem(self) -> MemoryData:
+        """
+        Sample memory usage, which goes from 30% to 90% with the load. Swap fills up from 70% on
+
+        :return: The memory sample
+        """
+        share = 0.3 + 0.6 * self._load(self.elapsed())
+        used = int(self.mem_total * share)
+        swap_used = int(self.swap_total * max(share - 0.7, 0.0) / 0.2)
+        return MemoryData(
+            total=self.mem_total,
+            available=self.mem_total - used,
+            used=used,
+            percent=round(share * 100, 1),
+            swap_total=self.swap_total,
+            swap_used=swap_used,
+            swap_percent=round(swap_used / self.swap_total * 100, 1),
+            buffers=self.mem_total // 64,
+            cached=self.mem_total // 8,
+            shared=self.mem_total // 128,
+            slab=self.mem_total // 256,
+        )
+
+    def network(self) -> list[dict[str, Any]]:
+        """
+        Sample the counters of every interface, which count up at a rate that follows the curve. Packets average
+        1 KB, one in 10,000 is dropped, and one in a million is an error
+
+        :return: The network sample, sorted by bytes received like `get_network_stats`
+        """
+        now = self.elapsed()
+        seconds = now - self.last_network if self.last_network is not None else 0.0
+        self.last_network = now
+
+        for (_, _, phase, speed), counter in zip(self.interfaces, self.counters, strict=True):
+            rate = speed * self._load(now - phase)
+            counter[0] += rate * seconds * 0.3
+            counter[1] += rate * seconds
+
+        stats = [
+            {
+                "interface": name,
+                "type": kind,
+                "bytes_sent": int(sent),
+                "bytes_recv": int(recv),
+                "packets_sent": int(sent / 1e3),
+                "packets_recv": int(recv / 1e3),
+                "errin": int(recv / 1e9),
+                "errout": int(sent / 1e9),
+                "dropin": int(recv / 1e7),
+                "dropout": int(sent / 1e7),
+            }
+            for (name, kind, _, _), (sent, recv) in zip(self.interfaces, self.counters, strict=True)
+        ]
+        return sorted(stats, key=lambda stat: stat["bytes_recv"], reverse=True)
+
+    def disks(self, progress: Callable[[list[dict[str, Any]]], None] | None = None) -> list[dict[str, Any]]:  # noqa: ARG002
+        """
+        Sample every partition, each of which slowly fills up
+
+        :param progress: Unused, since fake partitions are never slow to probe
+        :return: The disk sample, as `get_disk_data` returns it
+        """
+        now = self.elapsed()
+        disks = []
+        for device, mountpoint, total, fill in self.mounts:
+            used = int(total * min(fill + now / 86_400, 0.99))
+            disks.append(
+                {
+                    "device": device,
+                    "mountpoint": mountpoint,
+                    "fstype": "ext4",
+                    "opts": "rw,relatime",
+                    "usage": {
+                        "total": total,
+                        "used": used,
+                        "free": total - used,
+                        "percent": round(used / total * 100, 1),
+                    },
+                    "unresponsive": False,
+                },
+            )
+        return disks
+
+    def disk_io(self) -> list[dict[str, Any]]:
+        """
+        Sample the IO counters of every partition's disk, which count up at a rate that follows the curve. IOs
+        average 64 KiB, and a third of them are writes. The busier a disk is, the longer its IOs take
+
+        :return: The disk IO sample, as `get_disk_io_stats` returns it
+        """
+        now = self.elapsed()
+        seconds = now - self.last_disk_io if self.last_disk_io is not None else 0.0
+        self.last_disk_io = now
+
+        stats = []
+        for (device, _, _, _), speed, ios in zip(self.mounts, self.disk_speeds, self.ios, strict=True):
+            load = self._load(now)
+            ios[0] += speed * load * seconds * 2 / 3
+            ios[1] += speed * load * seconds / 3
+            ios[2] += load * seconds * 1000
+            reads, writes = int(ios[0]), int(ios[1])
+            latency = 1000 / speed * (1 + 4 * load)
+            stats.append(
+                {
+                    "device": device.removeprefix("/dev/"),
+                    "partition": False,
+                    "virtual": False,
+                    "read_count": reads,
+                    "write_count": writes,
+                    "read_bytes": reads * 65_536,
+                    "write_bytes": writes * 65_536,
+                    "read_time": int(reads * latency),
+                    "write_time": int(writes * latency),
+                    "busy_time": int(ios[2]),
+                    "weighted_time": int((reads + writes) * latency),
+                },
+            )
+        return stats
+
+    def processes(self, sort_key: str = "cpu_percent") -> list[dict[str, Any]]:
+        """
+        Sample every process. Each one's CPU load and IO follow the curve, scaled by how heavy the process is.
+        Like the real providers, IO and open files are only filled in when processes are ranked by them
+
+        :param sort_key: The key processes are currently ranked by (see `PROCESS_SORT_KEYS`)
+        :return: The process sample, as `ProcessSampler.sample` returns it
+        """
+        now = self.elapsed()
+        count = len(self.slots)
+        rows = []
+        for slot, process in enumerate(self.slots):
+            # Once a process has run for its lifetime, another takes its place with the next free PID
+            generation = int((now + process["offset"]) // self.lifetime) if self.lifetime else 0
+            load = process["weight"] * self._load(now - process["phase"])
+            rows.append(
+                {
+                    "pid": 100 + slot + generation * count,
+                    "name": process["name"],
+                    "username": process["username"],
+                    "exe": f"/usr/bin/{process['name'].rsplit('-', 1)[0]}",
+                    "cpu_percent": round(load * 100, 1),
+                    "rss": process["rss"],
+                    "num_threads": process["num_threads"],
+                    "num_fds": process["num_fds"] if sort_key == "num_fds" else None,
+                    "io_rate": load * 5e6 if sort_key == "io_rate" else None,
+                },
+            )
+        return rows
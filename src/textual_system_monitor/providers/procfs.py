@@ -0,0 +1,308 @@
+import os
+import pwd
+import sys
+import time
+from typing import Any
+
+from ..utilities import CPUSampler, DiskProber, MountTable, is_partition, is_virtual
+from .psutil_provider import PsutilProvider
+
+PROC_PATH = "/proc"
+DISKSTATS_PATH = "/proc/diskstats"
+
+# `/proc/diskstats` counts sectors of 512 bytes, whatever the actual sector size of the device
+DISKSTATS_SECTOR = 512
+
+# Indices of the fields of `/proc/[pid]/stat` we need, counted from the process state (the first field after
+# the command name). See `man 5 proc`
+STAT_UTIME = 11
+STAT_STIME = 12
+STAT_NUM_THREADS = 17
+STAT_STARTTIME = 19
+STAT_RSS = 21
+
+# The kernel truncates command names to this many characters
+COMM_LENGTH = 15
+
+
+def is_supported() -> bool:
+    """
+    Whether the process table can be read straight from /proc on this system
+
+    :return: True on Linux with /proc mounted
+    """
+    return sys.platform == "linux" and os.path.isdir(f"{PROC_PATH}/self")
+
+
+def _read(path: str) -> bytes:
+    """
+    Read a small file in one go, without the overhead of a buffered file object
+
+    :param path: The path of the file to read
+    :return: The contents of the file
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, 4096)
+    finally:
+        os.close(fd)
+
+
+def read_diskstats(path: str = DISKSTATS_PATH) -> list[dict[str, Any]]:
+    """
+    Read the IO counters of every block device straight from `/proc/diskstats`, which, unlike psutil, also
+    counts how long IOs spent queued (`weighted_time`). See the kernel's Documentation/admin-guide/iostats.rst
+
+    :param path: The path of the disk statistics
+    :return: The same counters as `get_disk_io_stats`, plus `weighted_time`, in ms
+    """
+    with open(path, "rb") as file:
+        lines = file.read().decode().splitlines()
+
+    stats = []
+    for line in lines:
+        fields = line.split()
+        if len(fields) < 14:
+            continue
+        name = fields[2]
+        stats.append(
+            {
+                "device": name,
+                "partition": is_partition(name),
+                "virtual": is_virtual(name),
+                "read_count": int(fields[3]),
+                "write_count": int(fields[7]),
+                "read_bytes": int(fields[5]) * DISKSTATS_SECTOR,
+                "write_bytes": int(fields[9]) * DISKSTATS_SECTOR,
+                "read_time": int(fields[6]),
+                "write_time": int(fields[10]),
+                "busy_time": int(fields[12]),
+                "weighted_time": int(fields[13]),
+            },
+        )
+    return stats
+
+
+class ProcFSReader:
+    """
+    Reads the process table straight from /proc, as a faster alternative to `psutil.process_iter()` on Linux.
+
+    Each sample reads a single file per process (`/proc/[pid]/stat`). Fields that never change for the
+    lifetime of a process (name, username, and executable) are read once, from `/proc/[pid]/status`,
+    `/proc/[pid]/cmdline`, and `/proc/[pid]/exe`, and cached until the process exits.
+
+    Produces the same rows as `ProcessSampler`, including a `cpu_percent` that matches psutil's: the share of
+    a single CPU used since the previous sample. Like there, IO counters (`/proc/[pid]/io`) and open file
+    descriptors (`/proc/[pid]/fd`) are only read when processes are ranked by them.
+    """
+
+    def __init__(self) -> None:
+        self.clock_ticks = os.sysconf("SC_CLK_TCK")
+        self.page_size = os.sysconf("SC_PAGE_SIZE")
+
+        # Static fields per process, keyed by PID and start time, so that a reused PID is never mistaken
+        # for the process that used to have it
+        self.static: dict[tuple[int, int], tuple[str, str | None, str | None]] = {}
+
+        # CPU time (in clock ticks) per process at the previous sample, and when that sample was taken
+        self.cpu_ticks: dict[tuple[int, int], int] = {}
+        self.io_bytes: dict[tuple[int, int], int] = {}
+        self.last_sample = time.monotonic()
+
+        self.usernames: dict[int, str] = {}
+
+    def _username(self, uid: int) -> str:
+        """
+        Look up the name of a user, caching the result since there are far fewer users than processes
+
+        :param uid: The user ID
+        :return: The username, or the user ID as a string if the user has no name
+        """
+        if uid not in self.usernames:
+            try:
+                self.usernames[uid] = pwd.getpwuid(uid).pw_name
+            except KeyError:
+                self.usernames[uid] = str(uid)
+        return self.usernames[uid]
+
+    def _read_static(self, pid: int, comm: str) -> tuple[str, str | None, str | None]:
+        """
+        Read the fields of a process that never change
+
+        :param pid: The PID of the process
+        :param comm: The (possibly truncated) command name from `/proc/[pid]/stat`
+        :return: The name, username, and executable of the process
+        """
+        name = comm
+        username = exe = None
+
+        # Like psutil, prefer the full name from the command line if the kernel truncated it
+        if len(comm) >= COMM_LENGTH:
+            try:
+                cmdline = _read(f"{PROC_PATH}/{pid}/cmdline").split(b"\0", 1)[0]
+            except OSError:
+                cmdline = b""
+            full_name = os.path.basename(cmdline.decode(errors="replace"))
+            if full_name.startswith(comm):
+                name = full_name
+
+        try:
+            for line in _read(f"{PROC_PATH}/{pid}/status").splitlines():
+                if line.startswith(b"Uid:"):
+                    username = self._username(int(line.split()[1]))
+                    break
+        except OSError:
+            pass
+
+        # Like psutil, kernel threads have an empty executable, while processes we may not inspect have none
+        try:
+            exe = os.readlink(f"{PROC_PATH}/{pid}/exe").removesuffix(" (deleted)")
+        except FileNotFoundError:
+            exe = ""
+        except OSError:
+            pass
+
+        return name, username, exe
+
+    @staticmethod
+    def _read_io_bytes(pid: int) -> int | None:
+        """
+        Read how many bytes a process has read from and written to storage over its lifetime
+
+        :param pid: The PID of the process
+        :return: The number of bytes, or None if we may not inspect the process
+        """
+        try:
+            lines = _read(f"{PROC_PATH}/{pid}/io").splitlines()
+        except OSError:
+            return None
+
+        total = 0
+        for line in lines:
+            if line.startswith((b"read_bytes:", b"write_bytes:")):
+                total += int(line.split()[1])
+        return total
+
+    @staticmethod
+    def _count_fds(pid: int) -> int | None:
+        """
+        Count the file descriptors a process has open
+
+        :param pid: The PID of the process
+        :return: The number of file descriptors, or None if we may not inspect the process
+        """
+        try:
+            return len(os.listdir(f"{PROC_PATH}/{pid}/fd"))
+        except OSError:
+            return None
+
+    def sample(self, sort_key: str = "cpu_percent") -> list[dict[str, Any]]:
+        """
+        Read every running process
+
+        :param sort_key: The key processes are currently ranked by (see `PROCESS_SORT_KEYS`)
+        :return: A list of dictionaries with keys 'pid', 'name', 'username', 'exe', 'cpu_percent', 'rss',
+            'num_threads', 'num_fds', and 'io_rate'
+        """
+        now = time.monotonic()
+        elapsed = now - self.last_sample
+        elapsed_ticks = elapsed * self.clock_ticks
+        self.last_sample = now
+
+        read_io = sort_key == "io_rate"
+        read_fds = sort_key == "num_fds"
+
+        rows: list[dict[str, Any]] = []
+        cpu_ticks: dict[tuple[int, int], int] = {}
+        io_bytes: dict[tuple[int, int], int] = {}
+        static: dict[tuple[int, int], tuple[str, str | None, str | None]] = {}
+
+        for entry in os.listdir(PROC_PATH):
+            if not entry.isdigit():
+                continue
+
+            pid = int(entry)
+            try:
+                stat = _read(f"{PROC_PATH}/{entry}/stat")
+            except OSError:
+                continue  # The process exited since the directory was listed
+
+            # The command name is in parentheses and may itself contain spaces or parentheses
+            comm, _, rest = stat.partition(b" (")[2].rpartition(b") ")
+            fields = rest.split()
+            key = (pid, int(fields[STAT_STARTTIME]))
+            ticks = int(fields[STAT_UTIME]) + int(fields[STAT_STIME])
+
+            if key not in self.static:
+                self.static[key] = self._read_static(pid, comm.decode(errors="replace"))
+            static[key] = self.static[key]
+            cpu_ticks[key] = ticks
+
+            # A process seen for the first time has nothing to compare against, just like in psutil
+            previous = self.cpu_ticks.get(key)
+            cpu_percent = 0.0
+            if previous is not None and elapsed_ticks > 0:
+                cpu_percent = round((ticks - previous) / elapsed_ticks * 100, 1)
+
+            io_rate = None
+            if read_io and (current := self._read_io_bytes(pid)) is not None:
+                io_bytes[key] = current
+                previous_io = self.io_bytes.get(key, current)
+                io_rate = (current - previous_io) / elapsed if elapsed > 0 else 0.0
+
+            name, username, exe = static[key]
+            rows.append(
+                {
+                    "pid": pid,
+                    "name": name,
+                    "username": username,
+                    "exe": exe,
+                    "cpu_percent": cpu_percent,
+                    "rss": int(fields[STAT_RSS]) * self.page_size,
+                    "num_threads": int(fields[STAT_NUM_THREADS]),
+                    "num_fds": self._count_fds(pid) if read_fds else None,
+                    "io_rate": io_rate,
+                }
+            )
+
+        # Only keep what belongs to processes that are still running
+        self.static = static
+        self.cpu_ticks = cpu_ticks
+        self.io_bytes = io_bytes
+
+        return rows
+
+
+class ProcFSProvider(PsutilProvider):
+    """
+    Reads processes straight from /proc with a `ProcFSReader`, since `process_iter` is much slower on large hosts,
+    and disk IO from `/proc/diskstats`, for how long IOs spent queued. Every other metric is read as in
+    `PsutilProvider` (memory already comes from `/proc/meminfo` on Linux).
+    """
+
+    def __init__(self) -> None:
+        if not is_supported():
+            raise ValueError("Reading processes from /proc is only supported on Linux")
+        # Only what is read as in `PsutilProvider` is set up, rather than calling its `__init__`, which would also make
+        # a `ProcessSampler` that is never used
+        self.cpu_sampler = CPUSampler()
+        self.disk_prober = DiskProber()
+        self.mount_table = MountTable()
+        self.process_reader = ProcFSReader()
+
+    def processes(self, sort_key: str = "cpu_percent") -> list[dict[str, Any]]:
+        """
+        Read every running process from /proc
+
+        :param sort_key: The key processes are currently ranked by (see `PROCESS_SORT_KEYS`)
+        :return: The same rows as `PsutilProvider.processes`
+        """
+        return self.process_reader.sample(sort_key)
+
+    def disk_io(self) -> list[dict[str, Any]]:
+        """
+        Read the IO counters of every block device from /proc
+
+        :return: The same counters as `PsutilProvider.disk_io`, plus how long IOs spent queued
+        """
+        return read_diskstats()
@@ -0,0 +1,79 @@
+from collections.abc import Callable
+from typing import Any
+
+from ..utilities import (
+    CPUData,
+    CPUSampler,
+    DiskProber,
+    MemoryData,
+    MountTable,
+    ProcessSampler,
+    get_disk_data,
+    get_disk_io_stats,
+    get_mem_data,
+    get_network_stats,
+)
+
+
+class PsutilProvider:
+    """
+    Reads every metric through psutil. Works on every platform psutil supports.
+    """
+
+    def __init__(self) -> None:
+        self.cpu_sampler = CPUSampler()
+        self.process_sampler = ProcessSampler()
+        self.disk_prober = DiskProber()
+        self.mount_table = MountTable()
+
+    def cpu(self) -> CPUData:
+        """
+        Sample CPU load since the previous sample
+
+        :return: The CPU sample
+        """
+        return self.cpu_sampler.sample()
+
+    def mem(self) -> MemoryData:
+        """
+        Sample memory and swap usage
+
+        :return: The memory sample
+        """
+        return get_mem_data()
+
+    def network(self) -> list[dict[str, Any]]:
+        """
+        Sample the byte counters of every network interface
+
+        :return: The network sample, as `get_network_stats` returns it
+        """
+        return get_network_stats()
+
+    def disks(self, progress: Callable[[list[dict[str, Any]]], None] | None = None) -> list[dict[str, Any]]:
+        """
+        Sample every partition and its usage, probing mounts in parallel so that a hung mount can't hold up the rest.
+        Partitions are only listed again when the mount table changes, and bind mounts of the same filesystem are
+        only shown (and probed) once
+
+        :param progress: Called with the partitions probed so far while a slow mount is still being probed
+        :return: The disk sample, as `get_disk_data` returns it
+        """
+        return get_disk_data(self.disk_prober, progress, self.mount_table)
+
+    def disk_io(self) -> list[dict[str, Any]]:
+        """
+        Sample the IO counters of every block device
+
+        :return: The disk IO sample, as `get_disk_io_stats` returns it
+        """
+        return get_disk_io_stats()
+
+    def processes(self, sort_key: str = "cpu_percent") -> list[dict[str, Any]]:
+        """
+        Sample every running process
+
+        :param sort_key: The key processes are currently ranked by (see `PROCESS_SORT_KEYS`)
+        :return: The process sample, as `ProcessSampler.sample` returns it
+        """
+        return self.process_sampler.sample(sort_key)
@@ -0,0 +1,225 @@
+import math
+from collections.abc import Iterable
+from time import monotonic
+from typing import Any
+
+# The counters of every network interface that rates are worked out for (see `get_network_stats`)
+NETWORK_COUNTERS = (
+    "bytes_recv",
+    "bytes_sent",
+    "packets_recv",
+    "packets_sent",
+    "errin",
+    "errout",
+    "dropin",
+    "dropout",
+)
+
+# Some platforms keep interface counters in 32 bits, so they wrap around every 4 GiB
+COUNTER_WRAP = 1 << 32
+
+# How quickly the smoothed rates follow the current ones: the weight of older samples halves every this many seconds
+SMOOTHING_HALF_LIFE = 5.0
+
+
+def counter_delta(old: int, new: int) -> int | None:
+    """
+    Work out how much a counter went up between two samples.
+
+    A 32-bit counter that goes down wrapped around, unless it went down by so much that it more likely restarted
+    from 0 (e.g. the interface was deleted, then created again under the same name).
+
+    :param old: The previous value of the counter
+    :param new: The current value of the counter
+    :return: How much the counter went up, or None if it restarted, in which case there is nothing to compare against
+    """
+    if new >= old:
+        return new - old
+    if old < COUNTER_WRAP:
+        wrapped = new + COUNTER_WRAP - old
+        if wrapped < COUNTER_WRAP // 2:
+            return wrapped
+    return None
+
+
+def physical_disks(stats: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Pick the devices whose IO adds up to the IO of the whole system: physical disks, without their partitions, or the
+    virtual devices (see `utilities.is_virtual`) stacked on top of them, whose IO is counted on the disks as well
+
+    :param stats: Every block device in a disk IO sample
+    :return: The physical disks
+    """
+    return [stat for stat in stats if not stat.get("partition") and not stat.get("virtual")]
+
+
+class NetworkRates:
+    """
+    Works out the rate of every network interface counter, per second, from consecutive samples.
+
+    Interfaces are matched by name, so they may be re-ordered, appear, or disappear between samples. Rates are
+    worked out over the time that actually went by between samples, rather than the interval they were meant to
+    be taken at. For every counter in `NETWORK_COUNTERS`, each interface gets:
+
+    - `<counter>_rate`: the rate since the previous sample
+    - `<counter>_avg`: the rate, smoothed with an exponentially-weighted moving average
+    - `<counter>_peak`: the highest rate since the interface was first seen
+
+    An interface seen for the first time (or whose counters restarted) has nothing to compare against, so its
+    rates are 0 until the next sample.
+    """
+
+    def __init__(self, half_life: float = SMOOTHING_HALF_LIFE) -> None:
+        """
+        :param half_life: How quickly smoothed rates follow the current ones (see `SMOOTHING_HALF_LIFE`)
+        """
+        self.half_life = half_life
+        self.last_time: float | None = None
+
+        # The previous counters of every interface, and its smoothed and peak rates
+        self.last: dict[str, dict[str, Any]] = {}
+        self.smoothed: dict[str, dict[str, float]] = {}
+        self.peaks: dict[str, dict[str, float]] = {}
+
+    def update(self, stats: Iterable[dict[str, Any]], now: float | None = None) -> list[dict[str, Any]]:
+        """
+        Work out rates from a new sample
+
+        :param stats: The counters of every interface, as `get_network_stats` returns them
+        :param now: When the sample was taken, in seconds. Defaults to `time.monotonic()`
+        :return: The counters of every interface, in the same order, with their rates added
+        """
+        now = monotonic() if now is None else now
+        elapsed = now - self.last_time if self.last_time is not None else 0.0
+        self.last_time = now
+
+        # The weight of the current rate in the smoothed rate, for the time that went by
+        weight = 1 - math.pow(0.5, elapsed / self.half_life) if elapsed > 0 else 0.0
+
+        current: dict[str, dict[str, Any]] = {}
+        results = []
+        for stat in stats:
+            interface = stat["interface"]
+            previous = self.last.get(interface)
+            smoothed = self.smoothed.setdefault(interface, {})
+            peaks = self.peaks.setdefault(interface, {})
+            result = dict(stat)
+
+            for counter in NETWORK_COUNTERS:
+                value = stat.get(counter)
+                if value is None:
+                    continue
+
+                delta = None
+                if previous is not None and elapsed > 0 and previous.get(counter) is not None:
+                    delta = counter_delta(previous[counter], value)
+
+                if delta is None:
+                    rate = 0.0
+                    average = smoothed.get(counter, 0.0)
+                else:
+                    # Smoothing starts from the first rate there is
+                    rate = delta / elapsed
+                    average = smoothed.get(counter)
+                    average = rate if average is None else average + weight * (rate - average)
+                    smoothed[counter] = average
+                peaks[counter] = max(peaks.get(counter, 0.0), rate)
+
+                result[f"{counter}_rate"] = rate
+                result[f"{counter}_avg"] = average
+                result[f"{counter}_peak"] = peaks[counter]
+
+            current[interface] = stat
+            results.append(result)
+
+        # Forget interfaces that are gone, so that state doesn't pile up as they come and go
+        for gone in self.last.keys() - current.keys():
+            self.smoothed.pop(gone, None)
+            self.peaks.pop(gone, None)
+        self.last = current
+        return results
+
+
+# The counters of every block device that disk rates are worked out from (see `get_disk_io_stats`). Times are in ms
+DISK_COUNTERS = (
+    "read_count",
+    "write_count",
+    "read_bytes",
+    "write_bytes",
+    "read_time",
+    "write_time",
+    "busy_time",
+    "weighted_time",
+)
+
+
+class DiskRates:
+    """
+    Works out what `iostat -x` shows for every block device, from consecutive samples of its counters.
+
+    Devices are matched by name, and rates are worked out over the time that actually went by between samples,
+    as in `NetworkRates`. Each device gets:
+
+    - `read_bytes_rate` and `write_bytes_rate`: throughput, in bytes/s
+    - `read_count_rate` and `write_count_rate`: IOPS
+    - `await`: how long each IO took on average, queueing included, in ms
+    - `queue`: how many IOs were in flight on average, or None if the platform doesn't count the time IOs spend queued
+    - `util`: the share of the time the device was busy, in %, or None if the platform doesn't count it
+
+    A device seen for the first time (or whose counters restarted) has nothing to compare against, so its
+    rates are 0 until the next sample.
+    """
+
+    def __init__(self) -> None:
+        self.last_time: float | None = None
+
+        # The previous counters of every device
+        self.last: dict[str, dict[str, Any]] = {}
+
+    def update(self, stats: Iterable[dict[str, Any]], now: float | None = None) -> list[dict[str, Any]]:
+        """
+        Work out rates from a new sample
+
+        :param stats: The counters of every device, as `get_disk_io_stats` returns them
+        :param now: When the sample was taken, in seconds. Defaults to `time.monotonic()`
+        :return: The counters of every device, in the same order, with their rates added
+        """
+        now = monotonic() if now is None else now
+        elapsed = now - self.last_time if self.last_time is not None else 0.0
+        self.last_time = now
+
+        current: dict[str, dict[str, Any]] = {}
+        results = []
+        for stat in stats:
+            device = stat["device"]
+            previous = self.last.get(device)
+
+            # Counters that are missing, or that restarted, didn't go up as far as rates are concerned
+            deltas = dict.fromkeys(DISK_COUNTERS, 0)
+            if previous is not None and elapsed > 0:
+                for counter in DISK_COUNTERS:
+                    if stat.get(counter) is not None and previous.get(counter) is not None:
+                        deltas[counter] = counter_delta(previous[counter], stat[counter]) or 0
+
+            # Rates are all 0 when no time went by, so any duration will do
+            seconds = elapsed if elapsed > 0 else 1.0
+            ios = deltas["read_count"] + deltas["write_count"]
+
+            result = dict(stat)
+            result["read_bytes_rate"] = deltas["read_bytes"] / seconds
+            result["write_bytes_rate"] = deltas["write_bytes"] / seconds
+            result["read_count_rate"] = deltas["read_count"] / seconds
+            result["write_count_rate"] = deltas["write_count"] / seconds
+            result["await"] = (deltas["read_time"] + deltas["write_time"]) / ios if ios else 0.0
+            result["queue"] = (
+                deltas["weighted_time"] / (seconds * 1000) if stat.get("weighted_time") is not None else None
+            )
+            result["util"] = (
+                min(deltas["busy_time"] / (seconds * 1000) * 100, 100.0) if stat.get("busy_time") is not None else None
+            )
+
+            current[device] = stat
+            results.append(result)
+
+        self.last = current
+        return results
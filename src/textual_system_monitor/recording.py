@@ -0,0 +1,378 @@
+import json
+import os
+import struct
+import time
+import zlib
+from bisect import bisect_right
+from collections.abc import Callable, Iterator
+from typing import IO, Any, NamedTuple
+
+from .utilities import CPUData, MemoryData
+
+# Every recording starts with this
+MAGIC = b"TSMREC1\n"
+
+# Every block starts with a header: its kind, the length of its payload, and the time of its first event. Events
+# in a data block are timed in seconds since that time
+BLOCK_HEADER = struct.Struct(">cId")
+DATA_BLOCK = b"D"
+INDEX_BLOCK = b"I"
+
+# A cleanly closed recording ends with a trailer pointing at its last index block
+TRAILER = struct.Struct(">8sQ")
+TRAILER_MAGIC = b"TSMTRAIL"
+
+# How many seconds of samples go in a data block, and how many data blocks go between index blocks
+BLOCK_SECONDS = 15
+BLOCKS_PER_INDEX = 8
+
+# The metrics that are recorded (the fields of `Snapshot`)
+METRICS = ("cpu", "mem", "network", "disks", "disk_io", "processes")
+
+
+def encode(data: Any) -> Any:
+    """
+    Turn a sample into something that can be stored as JSON
+
+    :param data: The sample
+    :return: The sample, as JSON-compatible data
+    """
+    # CPU and memory samples are named tuples, and the other metrics are tuples of dictionaries
+    return list(data)
+
+
+def encode_json(data: Any) -> str:
+    """
+    Turn a sample into the JSON it is stored as. Thread-safe, so that samples can be encoded in the thread worker
+    that took them, rather than on the UI thread (see `Collector.sample`)
+
+    :param data: The sample
+    :return: The sample, as JSON
+    """
+    return json.dumps(encode(data), separators=(",", ":"))
+
+
+class EncodedSample(NamedTuple):
+    """
+    A sample, along with the JSON it is recorded as
+    """
+
+    data: Any
+    json: str
+
+
+def decode(metric: str, data: Any) -> Any:
+    """
+    Turn a sample stored as JSON back into what the `Collector` publishes
+
+    :param metric: The name of the metric that was sampled
+    :param data: The sample, as stored
+    :return: The sample
+    """
+    if metric == "cpu":
+        cores, overall, individual, *breakdown = data
+        return CPUData(cores, overall, tuple(individual), *breakdown)
+    if metric == "mem":
+        return MemoryData(*data)
+    return tuple(data)
+
+
+def _read_header(file: IO[bytes]) -> tuple[bytes, int, float] | None:
+    """
+    Read the header of the block at the current position
+
+    :param file: The recording
+    :return: The kind, payload length, and time of the block, or None at the end of the blocks
+    """
+    header = file.read(BLOCK_HEADER.size)
+    if len(header) < BLOCK_HEADER.size or header[:1] not in (DATA_BLOCK, INDEX_BLOCK):
+        return None
+    return BLOCK_HEADER.unpack(header)
+
+
+def _read_trailer(file: IO[bytes]) -> int | None:
+    """
+    Find the last index block through the trailer of a cleanly closed recording
+
+    :param file: The recording
+    :return: The offset of the last index block, or None if there is no trailer
+    """
+    size = file.seek(0, os.SEEK_END)
+    if size < len(MAGIC) + TRAILER.size:
+        return None
+    file.seek(size - TRAILER.size)
+    magic, offset = TRAILER.unpack(file.read(TRAILER.size))
+    return offset if magic == TRAILER_MAGIC else None
+
+
+def _scan(file: IO[bytes]) -> tuple[list[tuple[float, int]], int | None, list[tuple[float, int]], int]:
+    """
+    Walk every block header of a recording, skipping over payloads. Only needed for recordings that weren't
+    closed cleanly, since others can be read through their index
+
+    :param file: The recording
+    :return: The data blocks (time and offset), the offset of the last index block, the data blocks after that
+        index block, and where the last complete block ends
+    """
+    blocks: list[tuple[float, int]] = []
+    unindexed: list[tuple[float, int]] = []
+    last_index = None
+    size = file.seek(0, os.SEEK_END)
+    end = file.seek(len(MAGIC))
+
+    while (header := _read_header(file)) is not None:
+        kind, length, first_time = header
+        if end + BLOCK_HEADER.size + length > size:
+            break  # The recording was cut off in the middle of this block
+        if kind == DATA_BLOCK:
+            blocks.append((first_time, end))
+            unindexed.append((first_time, end))
+        else:
+            last_index = end
+            unindexed = []
+        end = file.seek(length, os.SEEK_CUR)
+
+    return blocks, last_index, unindexed, end
+
+
+class Recorder:
+    """
+    Appends every sample the `Collector` publishes to a recording.
+
+    Samples are buffered and written a block at a time. Each data block is a zlib-compressed batch of JSON lines,
+    starting with a keyframe of the latest sample of every metric, so that replay can start from any block.
+    Samples are timed on a monotonic clock, from the wall-clock time of the first sample, so that the recording
+    doesn't jump when the system clock is adjusted.
+    Every few data blocks, an index block lists when each of them starts and where it is, so that replay can seek
+    without reading the whole recording. Closing the recording writes a final index block and a trailer pointing at
+    it. A recording that wasn't closed cleanly (e.g. after a crash) loses at most the samples still in the buffer.
+    """
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        :param path: The file to record to. If it is already a recording, samples are appended to it
+        :param clock: Where to read how much time went by since the first sample from, in seconds
+        """
+        self.path = path
+        self.clock = clock
+        self.file = open(path, "a+b")  # noqa: SIM115
+
+        # Where the index chain ends, and the data blocks that no index block lists yet
+        self.last_index: int | None = None
+        self.unindexed: list[tuple[float, int]] = []
+
+        if self.file.seek(0, os.SEEK_END) == 0:
+            self.file.write(MAGIC)
+        else:
+            self.file.seek(0)
+            if self.file.read(len(MAGIC)) != MAGIC:
+                self.file.close()
+                raise ValueError(f"{path} is not a recording")
+
+            trailer = _read_trailer(self.file)
+            if trailer is not None:
+                self.last_index = trailer
+                self.file.truncate(self.file.seek(-TRAILER.size, os.SEEK_END))
+            else:
+                _, self.last_index, self.unindexed, end = _scan(self.file)
+                self.file.truncate(end)
+
+        # The wall-clock time of the first sample, and the time on `clock` it was taken at
+        self.start: float | None = None
+        self.origin = 0.0
+
+        # The latest sample of every metric as JSON, for keyframes, the lines waiting to be written, and when the
+        # first of them was taken, in seconds since the first sample
+        self.latest: dict[str, str] = {}
+        self.lines: list[str] = []
+        self.block_start: float | None = None
+        self.blocks_since_index = 0
+
+    def record(self, metric: str, data: Any, encoded: str | None = None) -> None:
+        """
+        Buffer a new sample. A block is written once it spans `BLOCK_SECONDS`
+
+        :param metric: The name of the metric that was sampled
+        :param data: The sample
+        :param encoded: The sample as JSON (see `encode_json`), if it was already encoded, e.g. by the thread worker
+            that took it. If None, it is encoded here
+        """
+        now = self.clock()
+        if self.start is None:
+            self.start, self.origin = time.time(), now
+        offset = now - self.origin
+        if encoded is None:
+            encoded = encode_json(data)
+
+        if self.block_start is None:
+            self.block_start = offset
+            keyframe = ",".join(f'"{name}":{sample}' for name, sample in self.latest.items())
+            self.lines.append(f'{{"t":0,"k":{{{keyframe}}}}}')
+
+        self.latest[metric] = encoded
+        self.lines.append(f'{{"t":{round(offset - self.block_start, 3)},"m":"{metric}","d":{encoded}}}')
+
+        if offset - self.block_start >= BLOCK_SECONDS:
+            self.flush()
+
+    def _write_block(self, kind: bytes, payload: bytes, first_time: float) -> int:
+        """
+        Write a block at the end of the recording
+
+        :param kind: The kind of block
+        :param payload: The payload of the block
+        :param first_time: The time of the first event in the block
+        :return: The offset of the block
+        """
+        offset = self.file.seek(0, os.SEEK_END)
+        self.file.write(BLOCK_HEADER.pack(kind, len(payload), first_time))
+        self.file.write(payload)
+        return offset
+
+    def _write_index(self) -> None:
+        """
+        Write an index block listing the data blocks written since the previous one
+        """
+        payload = json.dumps({"prev": self.last_index, "blocks": self.unindexed}).encode()
+        self.last_index = self._write_block(INDEX_BLOCK, payload, 0.0)
+        self.unindexed = []
+        self.blocks_since_index = 0
+
+    def flush(self) -> None:
+        """
+        Write the buffered samples as a data block, then an index block if one is due
+        """
+        if self.block_start is None or self.start is None:
+            return
+
+        first_time = round(self.start + self.block_start, 3)
+        payload = zlib.compress("\n".join(self.lines).encode())
+        offset = self._write_block(DATA_BLOCK, payload, first_time)
+        self.unindexed.append((first_time, offset))
+        self.lines = []
+        self.block_start = None
+
+        self.blocks_since_index += 1
+        if self.blocks_since_index >= BLOCKS_PER_INDEX:
+            self._write_index()
+        self.file.flush()
+
+    def close(self) -> None:
+        """
+        Write everything still buffered, a final index block, and the trailer
+        """
+        if self.file.closed:
+            return
+        self.flush()
+        if self.unindexed or self.last_index is None:
+            self._write_index()
+        self.file.write(TRAILER.pack(TRAILER_MAGIC, self.last_index))
+        self.file.close()
+
+
+class Recording:
+    """
+    Reads a recording made by `Recorder`.
+
+    Only the index is read up front: data blocks are decompressed when they are needed.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: The recording to read
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a recording")
+            self.blocks = self._read_index(file)
+
+        if not self.blocks:
+            raise ValueError(f"{path} has no samples")
+
+        self.block_times = [first_time for first_time, _ in self.blocks]
+        self.cached_block: tuple[int, list[dict[str, Any]]] | None = None
+
+        self.start = self.blocks[0][0]
+        self.end = self.read_block(len(self.blocks) - 1)[-1]["t"]
+
+    @staticmethod
+    def _read_index(file: IO[bytes]) -> list[tuple[float, int]]:
+        """
+        Find every data block, by following the chain of index blocks back from the trailer, or by scanning the
+        recording if it wasn't closed cleanly
+
+        :param file: The recording
+        :return: The time and offset of every data block, in order
+        """
+        offset = _read_trailer(file)
+        if offset is None:
+            return _scan(file)[0]
+
+        blocks: list[tuple[float, int]] = []
+        while offset is not None:
+            file.seek(offset)
+            header = _read_header(file)
+            if header is None or header[0] != INDEX_BLOCK:
+                raise ValueError(f"Corrupt index block at offset {offset}")
+            index = json.loads(file.read(header[1]))
+            blocks[:0] = [(first_time, block_offset) for first_time, block_offset in index["blocks"]]
+            offset = index["prev"]
+        return blocks
+
+    def read_block(self, number: int) -> list[dict[str, Any]]:
+        """
+        Read the events of a data block. The last block read is cached, since replay reads blocks in order
+
+        :param number: The number of the block, in order of time
+        :return: The events in the block, starting with its keyframe
+        """
+        if self.cached_block is not None and self.cached_block[0] == number:
+            return self.cached_block[1]
+
+        with open(self.path, "rb") as file:
+            file.seek(self.blocks[number][1])
+            header = _read_header(file)
+            if header is None or header[0] != DATA_BLOCK:
+                raise ValueError(f"Corrupt data block at offset {self.blocks[number][1]}")
+            lines = zlib.decompress(file.read(header[1])).decode().splitlines()
+
+        # Events are timed from the start of their block
+        first_time = header[2]
+        events = [json.loads(line) for line in lines]
+        for event in events:
+            event["t"] = round(first_time + event["t"], 3)
+        self.cached_block = (number, events)
+        return events
+
+    def events(self, start: float, end: float) -> Iterator[dict[str, Any]]:
+        """
+        Get the samples taken in a span of time, without the keyframes
+
+        :param start: The start of the span (exclusive)
+        :param end: The end of the span (inclusive)
+        :return: The events in the span, with keys 't' (when the sample was taken), 'm' (the metric), and 'd'
+            (the sample, as stored)
+        """
+        for number in range(max(bisect_right(self.block_times, start) - 1, 0), len(self.blocks)):
+            if self.block_times[number] > end:
+                return
+            for event in self.read_block(number):
+                if "m" in event and start < event["t"] <= end:
+                    yield event
+
+    def state_at(self, moment: float) -> dict[str, Any]:
+        """
+        Get the latest sample of every metric at a moment, seeking through the index
+
+        :param moment: The moment, as a timestamp
+        :return: The latest sample of every metric that had been sampled by then, as stored
+        """
+        number = max(bisect_right(self.block_times, moment) - 1, 0)
+        events = self.read_block(number)
+        state = dict(events[0]["k"])
+        for event in events[1:]:
+            if event["t"] > moment:
+                break
+            state[event["m"]] = event["d"]
+        return state
@@ -0,0 +1,166 @@
+from collections.abc import Sequence
+from functools import cache
+from typing import Any
+
+from rich.style import Style
+from rich.text import Text
+
+from .rates import physical_disks
+from .utilities import CPUData, bytes_to_human, compute_percentage_color, get_palette
+
+# A piece of text, and its style (or None to leave it unstyled). Renderers collect these and build one `Text` out of
+# them, so nothing is concatenated or parsed as markup on every update
+type Token = tuple[str, Style | None]
+
+
+@cache
+def get_styles(theme: str) -> dict[str, Style]:
+    """
+    Get the bold style of every color in a theme's palette. Styles are only built once per theme.
+
+    :param theme: The name of the current color theme
+    :return: The styles, by color name (see `COLOR_MAP`)
+    """
+    return {name: Style(bold=True, color=color) for name, color in get_palette(theme).items()}
+
+
+def percentage_token(styles: dict[str, Style], num: float) -> tuple[str, Style]:
+    """
+    Color a percentage depending on how high it is, like `compute_percentage_color`
+
+    :param styles: The styles of the current theme (see `get_styles`)
+    :param num: The percentage
+    :return: The colored percentage
+    """
+    _, color = compute_percentage_color(num)
+    return str(num), styles[color]
+
+
+def join_tokens(tokens: Sequence[Token]) -> Text:
+    """
+    Build a single `Text` out of tokens
+
+    :param tokens: The pieces of text, in order, with their styles
+    :return: The Text, ready to update a Static with
+    """
+    text = Text()
+    text.append_tokens(tokens)
+    return text
+
+
+def styled_text(content: str, style: Style) -> Text:
+    """
+    Style a piece of text, e.g. for a DataTable cell.
+
+    The style is kept in a span rather than as the base style of the Text, since Texts that only differ in their
+    base style compare equal, and `sync_table` would then skip cells whose color changed.
+
+    :param content: The text
+    :param style: The style to give it (see `get_styles`)
+    :return: The styled Text
+    """
+    return join_tokens(((content, style),))
+
+
+def percentage_text(styles: dict[str, Style], num: float) -> Text:
+    """
+    Color a percentage depending on how high it is, e.g. for a DataTable cell
+
+    :param styles: The styles of the current theme (see `get_styles`)
+    :param num: The percentage
+    :return: The colored percentage
+    """
+    return styled_text(*percentage_token(styles, num))
+
+
+def update_network_static(stats: Sequence[dict[str, Any]], base: int, styles: dict[str, Style]) -> Text:
+    """
+    Generate the updated network info for each interface
+
+    :param stats: The latest network sample, with rates (see `NetworkRates`)
+    :param base: The base to use for the conversion (1000 or 1024)
+    :param styles: The styles of the current theme (see `get_styles`)
+
+    :return: The Text needed to update the Static widget with the new info
+    """
+
+    tokens: list[Token] = []
+
+    # For each interface, format the new info and add it to the text to return
+    for stat in stats:
+        interface = str(stat["interface"])
+        download = bytes_to_human(stat["bytes_recv"], base)
+        upload = bytes_to_human(stat["bytes_sent"], base)
+        download_speed = bytes_to_human(round(stat.get("bytes_recv_rate", 0.0), 2), base)
+        upload_speed = bytes_to_human(round(stat.get("bytes_sent_rate", 0.0), 2), base)
+
+        tokens += (
+            (interface, styles["green"]),
+            (": ", None),
+            ("Download", styles["blue"]),
+            (f": {download} at {download_speed} /s | ", None),
+            ("Upload", styles["blue"]),
+            (f": {upload} at {upload_speed} /s\n\n", None),
+        )
+
+    return join_tokens(tokens)
+
+
+def update_CPU_static(cpu_data: CPUData, styles: dict[str, Style]) -> Text:
+    """
+    Generates the updated CPU data to update the CPU pane Static with
+
+    :param cpu_data: The updated CPU data
+    :param styles: The styles of the current theme (see `get_styles`)
+    :return: The Text of updated CPU data
+    """
+    tokens: list[Token] = [
+        (f"Cores: {cpu_data.cores}\n\nOverall: ", None),
+        percentage_token(styles, cpu_data.overall),
+        (" %\n\nPer Core: \n", None),
+    ]
+
+    # For each core, colorize the percentage and add it to the text
+    last = len(cpu_data.individual) - 1
+    for core_index, core_percentage in enumerate(cpu_data.individual):
+        separator = " | " if core_index < last else ""
+        tokens += (
+            (f"Core {core_index + 1}: ", None),
+            percentage_token(styles, core_percentage),
+            (f" % {separator}", None),
+        )
+
+    tokens.append(("\n\n", None))
+    return join_tokens(tokens)
+
+
+def disk_io_tokens(io: Sequence[dict[str, Any]], base: int, styles: dict[str, Style]) -> list[Token]:
+    """
+    Sum up the IO of every physical disk (partitions and virtual devices are left out, so their IO isn't counted
+    twice), and point out the busiest disk
+
+    :param io: The latest disk IO sample, with rates (see `DiskRates`)
+    :param base: The base to use for the conversion (1000 or 1024)
+    :param styles: The styles of the current theme (see `get_styles`)
+    :return: The summary, on a line of its own
+    """
+    disks = physical_disks(io)
+    read = bytes_to_human(round(sum(stat["read_bytes_rate"] for stat in disks), 2), base)
+    write = bytes_to_human(round(sum(stat["write_bytes_rate"] for stat in disks), 2), base)
+    iops = sum(stat["read_count_rate"] + stat["write_count_rate"] for stat in disks)
+
+    tokens: list[Token] = [
+        ("I/O", styles["blue"]),
+        (f": Read: {read} /s | Write: {write} /s | IOPS: {iops:,.0f}", None),
+    ]
+
+    busiest = max((stat for stat in disks if stat["util"] is not None), key=lambda stat: stat["util"], default=None)
+    if busiest is not None:
+        tokens += (
+            (f" | Busiest: {busiest['device']} at ", None),
+            percentage_token(styles, round(busiest["util"], 1)),
+            (" %", None),
+        )
+
+    tokens.append(("\n\n", None))
+    return tokens
@@ -0,0 +1,156 @@
+from collections.abc import Callable
+from dataclasses import replace
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from .collector import Collector, Snapshot
+from .history import HISTORY_SECONDS
+from .recording import Recording, decode
+
+if TYPE_CHECKING:
+    from textual.timer import Timer
+    from textual.widget import Widget
+
+    from .app import Monitor
+    from .providers.base import Provider
+
+# How often the replay moves forward, in seconds of real time
+REPLAY_TICK = 1 / 10
+
+# The speeds a recording can be replayed at, as multiples of real time
+REPLAY_SPEEDS = (1, 10, 100)
+
+
+class Player(Collector):
+    """
+    Publishes the samples of a recording instead of sampling the system, so that the same panes and screens can
+    show what happened while it was being recorded.
+
+    The replay moves forward on a timer, at one of `REPLAY_SPEEDS`. Seeking goes through the recording's index,
+    and fills the history with what came just before the new position, so that charts make sense straight away.
+    """
+
+    def __init__(
+        self,
+        app: "Monitor",
+        recording: Recording,
+        speed: int = 1,
+        intervals: dict[str, float] | None = None,
+    ) -> None:
+        """
+        :param app: The app to publish Snapshots on
+        :param recording: The recording to replay
+        :param speed: How many times faster than real time to replay
+        :param intervals: How often metrics were sampled while recording, and how often to refresh the GPU panes, in
+            seconds, overriding `DEFAULT_INTERVALS`. Recordings don't keep their intervals, so these are the
+            configured ones
+        """
+        super().__init__(app, intervals=intervals)
+        self.recording = recording
+        self.speed = speed
+
+        # The moment of the recording on display, as a timestamp
+        self.position = recording.start
+        self.timer: Timer | None = None
+
+    def start(self) -> None:
+        """
+        Show the start of the recording, then start moving forward
+        """
+        self.running = True
+        self.seek(self.recording.start)
+        self.timer = self.app.set_interval(REPLAY_TICK, self.advance)
+
+    def stop(self) -> None:
+        """
+        Stop moving forward
+        """
+        self.running = False
+        if self.timer is not None:
+            self.timer.stop()
+
+    def connect(self, provider: "Provider | None") -> None:
+        """
+        Do nothing, since a recording is never sampled, so that replaying doesn't start probing the system
+
+        :param provider: Where metrics would be sampled from
+        """
+
+    def sample(self, metric: str) -> None:
+        """
+        Do nothing, since a recording can't be re-sampled
+
+        :param metric: The name of the metric to sample
+        """
+
+    def every(self, widget: "Widget", name: str, callback: Callable[[], None]) -> None:
+        """
+        Call `callback` on a timer of the widget's own, since what isn't a metric isn't recorded, so it is still
+        refreshed live, whatever the speed of the replay
+
+        :param widget: The widget the callback belongs to
+        :param name: The name of what the callback refreshes (see `DEFAULT_INTERVALS`)
+        :param callback: The function to call
+        """
+        widget.set_interval(self.intervals[name], callback)
+
+    def update_title(self) -> None:
+        """
+        Show where in the recording the replay is, and how fast it goes
+        """
+        position = datetime.fromtimestamp(self.position).strftime("%Y-%m-%d %H:%M:%S")
+        elapsed = int(self.position - self.recording.start)
+        total = int(self.recording.end - self.recording.start)
+        self.app.sub_title = f"Replaying {position} ({elapsed}s of {total}s) at {self.speed}x"
+
+    def advance(self) -> None:
+        """
+        Move forward by one tick. Every sample taken in that time is recorded in the history, but only the latest
+        sample of each metric is published, so that fast replays don't render more often than live data does
+        """
+        end = min(self.position + REPLAY_TICK * self.speed, self.recording.end)
+        latest: dict[str, Any] = {}
+        for event in self.recording.events(self.position, end):
+            latest[event["m"]] = data = decode(event["m"], event["d"])
+            self.history.record(event["m"], data, event["t"])
+
+        if latest:
+            self.app.snapshot = replace(self.app.snapshot, **latest)
+        self.position = end
+        self.update_title()
+
+    def seek(self, moment: float) -> None:
+        """
+        Jump to a moment of the recording
+
+        :param moment: The moment to jump to, as a timestamp. Clamped to the span of the recording
+        """
+        moment = min(max(moment, self.recording.start), self.recording.end)
+
+        # Rebuild the history from the samples taken in the time it covers, rather than keep stale history around
+        self.history = self.new_history()
+        history_start = max(moment - HISTORY_SECONDS, self.recording.start)
+        for metric, data in self.recording.state_at(history_start).items():
+            self.history.record(metric, decode(metric, data), history_start)
+        for event in self.recording.events(history_start, moment):
+            self.history.record(event["m"], decode(event["m"], event["d"]), event["t"])
+
+        state = {metric: decode(metric, data) for metric, data in self.recording.state_at(moment).items()}
+        self.app.snapshot = Snapshot(**state)
+        self.position = moment
+        self.update_title()
+
+    def skip(self, seconds: float) -> None:
+        """
+        Jump forwards or backwards
+
+        :param seconds: How far to jump, in seconds of the recording. Negative to jump backwards
+        """
+        self.seek(self.position + seconds)
+
+    def cycle_speed(self) -> None:
+        """
+        Replay at the next speed
+        """
+        self.speed = REPLAY_SPEEDS[(REPLAY_SPEEDS.index(self.speed) + 1) % len(REPLAY_SPEEDS)]
+        self.update_title()
@@ -1,4 +1,4 @@
-from typing import ClassVar, cast
+from typing import Any, ClassVar, cast
 
 from textual import getters
 from textual.app import ComposeResult
@@ -6,14 +6,17 @@ from textual.binding import Binding
 from textual.containers import Container, VerticalScroll
 from textual.reactive import reactive
 from textual.screen import Screen
-from textual.timer import Timer
 from textual.widgets import DataTable, Footer, Header, Static
 
-from textual_system_monitor.utilities import COMMON_INTERVAL, get_color_formatted_string, get_cpu_data, get_palette
+from textual_system_monitor.collector import interval_title, subscribe
+from textual_system_monitor.rendering import Token, get_styles, join_tokens, percentage_text, percentage_token
+from textual_system_monitor.sparkline import HistorySparkline
+from textual_system_monitor.tables import sync_table
+from textual_system_monitor.utilities import CPUData, get_palette
 
 
 class CPU_Screen(Screen[None]):
-    BORDER_TITLE = f"CPU Usage - Updated every {COMMON_INTERVAL}s"
+    BORDER_TITLE = "CPU Usage"
     CSS_PATH = "../styles/cpu_css.tcss"
     BINDINGS: ClassVar = [
         Binding(key="q", action="app.quit", description="Quit"),
@@ -26,44 +29,55 @@ class CPU_Screen(Screen[None]):
         Binding(key="/", action="", description=""),
     ]
 
-    update_timer: Timer
-
-    cpu_data = reactive(get_cpu_data())
+    cpu_data: reactive[CPUData | None] = reactive(None, init=False)
 
     static = getters.query_one("#cpu-screen-static", expect_type=Static)
-    table = getters.query_one("#cpu-screen-table", expect_type=DataTable)
+    table = cast(DataTable[Any], getters.query_one("#cpu-screen-table", expect_type=DataTable))
     container = getters.query_one("#cpu-screen-container", expect_type=Container)
 
-    def update_cpu_data(self) -> None:
+    def update_cpu_data(self, cpu_data: CPUData) -> None:
         """
         Update CPU data
+
+        :param cpu_data: The latest CPU sample
         """
-        self.cpu_data = get_cpu_data()
+        self.cpu_data = cpu_data
 
-    def watch_cpu_data(self, cpu_data: dict[str, int | float | list[float] | None]) -> None:
+    def watch_cpu_data(self, cpu_data: CPUData) -> None:
         """
         Watch CPU data and update the CPU Screen with the new information
 
-        :param cpu_data: A dictionary containing updated CPU data with keys 'cores', 'overall', and 'individual'.
+        :param cpu_data: The updated CPU data
         """
-        palette = get_palette(self.app.theme)
+        styles = get_styles(self.app.theme)
 
         # Get the updated overall data
-        cores = cpu_data["cores"]
-        overall = cpu_data["overall"]
-        indiv_list = cast(list[float], cpu_data["individual"])  # To please static analyzer
-        individual = [get_color_formatted_string(palette, core) for core in indiv_list]
+        tokens: list[Token] = [
+            (f"Cores: {cpu_data.cores}\n\nOverall: ", None),
+            percentage_token(styles, cpu_data.overall),
+            (" %\n", None),
+        ]
+        individual = [percentage_text(styles, core) for core in cpu_data.individual]
+
+        # Break the overall load down by where the time was spent
+        for label, pct in (
+            ("User", cpu_data.user),
+            ("System", cpu_data.system),
+            ("IO Wait", cpu_data.iowait),
+            ("Steal", cpu_data.steal),
+            ("IRQ", cpu_data.irq),
+        ):
+            tokens += ((f"\n{label}: ", None), percentage_token(styles, pct), (" %", None))
+        tokens.append(("\n\n", None))
 
         # Update the Static Widget
-        static_content = f"Cores: {cores}\n\nOverall: {get_color_formatted_string(palette, cast(float, overall))} %\n\n"
-        self.static.update(static_content)
+        self.static.update(join_tokens(tokens))
 
-        # Clear the table and add the columns
-        self.table.clear(columns=True)
-        self.table.add_columns("Core", "Percentage (%)")
-
-        # Update the table
-        self.table.add_rows([(core_num + 1, core_pct) for core_num, core_pct in enumerate(individual)])
+        # Update the table, keyed by core so that only the cores whose load changed are touched
+        sync_table(
+            self.table,
+            {str(core_num): (core_num + 1, core_pct) for core_num, core_pct in enumerate(individual)},
+        )
 
     def compose(self) -> ComposeResult:
         """
@@ -77,14 +91,18 @@ class CPU_Screen(Screen[None]):
                 yield Static(id="cpu-screen-static")
             with VerticalScroll():
                 yield DataTable(id="cpu-screen-table", show_cursor=False, zebra_stripes=True)
+            yield HistorySparkline("cpu", "cpu", "blue", title="Overall CPU Load", id="cpu-screen-sparkline")
         yield Footer()
 
     def on_mount(self) -> None:
         """
         Perform initial setup for the CPU Screen
         """
-        self.update_timer = self.set_interval(COMMON_INTERVAL, self.update_cpu_data)
-        self.container.border_title = self.BORDER_TITLE
+        self.table.add_column("Core", key="core")
+        self.table.add_column("Percentage (%)", key="percent")
+
+        subscribe(self, "cpu", self.update_cpu_data)
+        self.container.border_title = interval_title(self, "cpu")
         self.container.styles.border = ("round", get_palette(self.app.theme)["blue"])
 
         def _on_theme_change() -> None:
@@ -94,10 +112,3 @@ class CPU_Screen(Screen[None]):
             self.container.styles.border = ("round", get_palette(self.app.theme)["blue"])
 
         self.watch(self.app, "theme", _on_theme_change, init=False)
-
-    def on_unmount(self) -> None:
-        """
-        Kill the timer on unmount to avoid timer-related threading issues
-        """
-        if self.update_timer:
-            self.update_timer.stop()
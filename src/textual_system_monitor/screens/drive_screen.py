@@ -1,20 +1,22 @@
-from typing import ClassVar, cast
+from typing import Any, ClassVar, cast
 
-from psutil import disk_partitions, disk_usage
+from rich.text import Text
 from textual import getters
 from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.containers import Container, VerticalScroll
 from textual.reactive import reactive
 from textual.screen import Screen
-from textual.timer import Timer
 from textual.widgets import DataTable, Footer, Header
 
-from textual_system_monitor.utilities import RARE_INTERVAL, bytes_to_human, get_color_formatted_string, get_palette
+from textual_system_monitor.collector import interval_title, subscribe
+from textual_system_monitor.rendering import get_styles, percentage_text, styled_text
+from textual_system_monitor.tables import sync_table
+from textual_system_monitor.utilities import bytes_to_human, get_palette, io_device
 
 
 class DriveScreen(Screen[None]):
-    BORDER_TITLE = f"Drive Usage - Updated every {RARE_INTERVAL}s"
+    BORDER_TITLE = "Drive Usage"
     CSS_PATH = "../styles/drive_css.tcss"
     BINDINGS: ClassVar = [
         Binding(key="q", action="app.quit", description="Quit"),
@@ -26,37 +28,36 @@ class DriveScreen(Screen[None]):
         Binding(key="v", action="app.switch_screen('gpu')", description="GPU"),
     ]
 
-    update_timer: Timer
+    disks: reactive[tuple[dict[str, Any], ...] | None] = reactive(None, init=False)
+    io: reactive[tuple[dict[str, Any], ...] | None] = reactive(None, init=False)
 
-    # Set the default disks value to an initial call to the function
-    disks = reactive(
-        {
-            "device": item.device,
-            "mountpoint": item.mountpoint,
-            "fstype": item.fstype,
-            "opts": item.opts,
-        }
-        for item in disk_partitions()
-    )
-
-    table = getters.query_one("#drive-screen-table", expect_type=DataTable)
+    table = cast(DataTable[Any], getters.query_one("#drive-screen-table", expect_type=DataTable))
     container = getters.query_one("#drive-screen-container", expect_type=Container)
 
-    def update_disks(self) -> None:
+    def update_disks(self, disks: tuple[dict[str, Any], ...]) -> None:
         """
         Define how to update `self.disks`
+
+        :param disks: The latest disk sample
+        """
+        self.disks = disks
+
+    def update_io(self, io: tuple[dict[str, Any], ...]) -> None:
         """
-        self.disks = (
-            {
-                "device": item.device,
-                "mountpoint": item.mountpoint,
-                "fstype": item.fstype,
-                "opts": item.opts,
-            }
-            for item in disk_partitions()
-        )
-
-    def watch_disks(self, disks: list[dict[str, str]]) -> None:
+        Define how to update `self.io`
+
+        :param io: The latest disk IO sample, with rates
+        """
+        self.io = io
+
+    def watch_io(self) -> None:
+        """
+        Re-render the table with the latest IO rates
+        """
+        if self.disks is not None:
+            self.watch_disks(self.disks)
+
+    def watch_disks(self, disks: tuple[dict[str, Any], ...]) -> None:
         """
         Define what happens when `self.disks` changes.
 
@@ -69,42 +70,93 @@ class DriveScreen(Screen[None]):
 
         kb_size = cast(Monitor, self.app).CONTEXT["kb_size"]
 
-        palette = get_palette(self.app.theme)
+        styles = get_styles(self.app.theme)
 
-        self.table.clear(columns=True)
-        self.table.add_columns("Drive", "Options", "Filesystem", "Usage (%)", "Total", "Used", "Free")
+        # The IO rates of the block device of every partition, like `iostat -x`
+        io = {stat["device"]: stat for stat in self.io or ()}
 
-        # Next, go through each updated disk, get its info, and add it to the table
+        def _io_cells(device: str) -> tuple[str | Text, ...]:
+            """
+            Format the IO rates of a partition's block device, if it has one
+            """
+            stat = io.get(io_device(device))
+            if stat is None:
+                return ("N/A",) * 7
+            return (
+                bytes_to_human(round(stat["read_bytes_rate"], 2), kb_size),
+                bytes_to_human(round(stat["write_bytes_rate"], 2), kb_size),
+                f"{stat['read_count_rate']:,.1f}",
+                f"{stat['write_count_rate']:,.1f}",
+                f"{stat['await']:,.2f}",
+                "N/A" if stat["queue"] is None else f"{stat['queue']:,.2f}",
+                "N/A" if stat["util"] is None else percentage_text(styles, round(stat["util"], 1)),
+            )
+
+        # Next, go through each updated disk, get its info, and key its row by mountpoint so that only
+        # what changed since the last update is touched in the table
+        rows: dict[str, tuple[str | Text, ...]] = {}
         for disk in disks:
             options = disk["opts"]
             device = disk["device"]
             fs = disk["fstype"] or "N/A"
 
+            usage = disk["usage"]
+
+            # A mount that didn't answer in time (e.g. a hung network share) has no usage either, but isn't a CD drive
+            if disk.get("unresponsive"):
+                rows[disk["mountpoint"]] = (
+                    device,
+                    options,
+                    fs,
+                    styled_text("Unresponsive", styles["red"]),
+                    "N/A",
+                    "N/A",
+                    "N/A",
+                    *_io_cells(device),
+                )
             # If the drive is a CD drive, treat it differently
-            if options == "cdrom":
-                self.table.add_row(device, options, "N/A", "N/A", "N/A", "N/A", "N/A")
+            elif usage is None:
+                rows[disk["mountpoint"]] = (device, options, "N/A", "N/A", "N/A", "N/A", "N/A", *_io_cells(device))
             else:
-                usage = disk_usage(disk["mountpoint"])
-                used = bytes_to_human(usage.used, kb_size)
-                free = bytes_to_human(usage.free, kb_size)
-                total = bytes_to_human(usage.total, kb_size)
+                used = bytes_to_human(usage["used"], kb_size)
+                free = bytes_to_human(usage["free"], kb_size)
+                total = bytes_to_human(usage["total"], kb_size)
 
-                self.table.add_row(
+                rows[disk["mountpoint"]] = (
                     device,
                     options,
                     fs,
-                    get_color_formatted_string(palette, usage.percent),
+                    percentage_text(styles, usage["percent"]),
                     total,
                     used,
                     free,
+                    *_io_cells(device),
                 )
 
+        sync_table(self.table, rows)
+
     def on_mount(self) -> None:
         """
         Perform initial setup for the Drive Screen
         """
-        self.update_timer = self.set_interval(RARE_INTERVAL, self.update_disks)
-        self.container.border_title = self.BORDER_TITLE
+        self.table.add_column("Drive", key="device")
+        self.table.add_column("Options", key="opts")
+        self.table.add_column("Filesystem", key="fstype")
+        self.table.add_column("Usage (%)", key="percent")
+        self.table.add_column("Total", key="total")
+        self.table.add_column("Used", key="used")
+        self.table.add_column("Free", key="free")
+        self.table.add_column("Read (/s)", key="read_bytes_rate")
+        self.table.add_column("Write (/s)", key="write_bytes_rate")
+        self.table.add_column("Read IOPS", key="read_count_rate")
+        self.table.add_column("Write IOPS", key="write_count_rate")
+        self.table.add_column("Await (ms)", key="await")
+        self.table.add_column("Queue", key="queue")
+        self.table.add_column("Util (%)", key="util")
+
+        subscribe(self, "disks", self.update_disks)
+        subscribe(self, "disk_io", self.update_io)
+        self.container.border_title = interval_title(self, "disks")
         self.container.styles.border = ("round", get_palette(self.app.theme)["red"])
 
         def _on_theme_change() -> None:
@@ -115,13 +167,6 @@ class DriveScreen(Screen[None]):
 
         self.watch(self.app, "theme", _on_theme_change, init=False)
 
-    def on_unmount(self) -> None:
-        """
-        Kill the timer on unmount to avoid timer-related threading issues
-        """
-        if self.update_timer:
-            self.update_timer.stop()
-
     def compose(self) -> ComposeResult:
         """
         Create the structure of the Drive Screen
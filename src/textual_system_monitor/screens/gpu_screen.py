@@ -7,14 +7,15 @@ from textual.containers import Container, VerticalScroll
 from textual.css.query import NoMatches
 from textual.reactive import reactive
 from textual.screen import Screen
-from textual.timer import Timer
 from textual.widgets import DataTable, Footer, Header, Static
+from textual.worker import Worker, WorkerState
 
-from textual_system_monitor.utilities import RARE_INTERVAL, convert_adapter_ram, get_gpu_data, get_palette
+from textual_system_monitor.collector import interval_title, is_visible, run_every, stop_running
+from textual_system_monitor.utilities import convert_adapter_ram, get_gpu_data, get_palette
 
 
 class GPU_Screen(Screen[None]):
-    BORDER_TITLE = f"GPU Info - Updated every {RARE_INTERVAL}s"
+    BORDER_TITLE = "GPU Info"
     CSS_PATH = "../styles/gpu_css.tcss"
     BINDINGS: ClassVar = [
         Binding(key="q", action="app.quit", description="Quit"),
@@ -26,9 +27,13 @@ class GPU_Screen(Screen[None]):
         Binding(key="v", action="app.switch_screen('main')", description="Main Screen"),
     ]
 
-    update_timer: Timer
+    gpu_worker: Worker[list[dict[str, str | int]] | None] | None = None
 
-    gpu_data = reactive(get_gpu_data())
+    # Whether an update was skipped while hidden, so that it is caught up with once back in front
+    missed_refresh = False
+
+    # Populated in a thread worker once mounted, since querying WMI is slow
+    gpu_data: reactive[list[dict[str, str | int]] | None] = reactive(None, init=False)
 
     def adapter_ram_wrapper(self, adapter_ram: str) -> str:
         """
@@ -44,12 +49,14 @@ class GPU_Screen(Screen[None]):
         kb_size = cast(Monitor, self.app).CONTEXT["kb_size"]
         return convert_adapter_ram(adapter_ram, kb_size)
 
-    def update_gpu_data(self) -> None:
+    def collect_gpu_data(self) -> list[dict[str, str | int]] | None:
         """
-        Update GPU data
+        Collect GPU data. Slow on Windows, since it queries WMI, so it is run in a thread worker by the timer
+
+        :return: The list of GPU data, per video controller
         """
         if sys.platform == "win32":
-            self.gpu_data = [
+            return [
                 {
                     "gpu": gpu_info["gpu"],
                     "driver_version": gpu_info["driver_version"],
@@ -62,8 +69,41 @@ class GPU_Screen(Screen[None]):
                 for gpu_info in get_gpu_data()
                 if gpu_info
             ]
-        else:
-            self.gpu_data = None
+        return None
+
+    def update_gpu_data(self) -> None:
+        """
+        Update GPU data
+        """
+        self.gpu_data = self.collect_gpu_data()
+
+    def refresh_gpu_data(self) -> None:
+        """
+        Update GPU data in a thread worker, unless the previous update is still in flight, or nothing would show it
+        """
+        if not is_visible(self):
+            self.missed_refresh = True
+            return
+        self.missed_refresh = False
+        if self.gpu_worker is not None and not self.gpu_worker.is_finished:
+            return
+        self.gpu_worker = self.run_worker(self.collect_gpu_data, group="gpu", exit_on_error=False, thread=True)
+
+    def on_screen_resume(self) -> None:
+        """
+        Update GPU data straight away if an update was skipped while hidden
+        """
+        if self.missed_refresh:
+            self.refresh_gpu_data()
+
+    def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
+        """
+        Render the GPU data once the thread worker has collected it
+
+        :param event: The Worker StateChanged event
+        """
+        if event.worker is self.gpu_worker and event.state == WorkerState.SUCCESS:
+            self.gpu_data = event.worker.result
 
     def watch_gpu_data(self, gpu_data: list[dict[str, str | int]]) -> None:
         """
@@ -98,14 +138,15 @@ class GPU_Screen(Screen[None]):
         """
         Perform initial setup for the GPU Screen
         """
-        self.update_timer = self.set_interval(RARE_INTERVAL, self.update_gpu_data)
+        run_every(self, "gpu", self.refresh_gpu_data)
+        self.refresh_gpu_data()
 
         try:
             container = self.screen.query_one("#gpu-container", expect_type=Container)
         except NoMatches:
             return
 
-        container.border_title = self.BORDER_TITLE
+        container.border_title = interval_title(self, "gpu")
         container.styles.border = ("round", get_palette(self.app.theme)["pink"])
 
         def _on_theme_change() -> None:
@@ -118,10 +159,9 @@ class GPU_Screen(Screen[None]):
 
     def on_unmount(self) -> None:
         """
-        Kill the timer on unmount to avoid timer-related threading issues
+        Stop refreshing on the app's timer on unmount to avoid timer-related threading issues
         """
-        if self.update_timer:
-            self.update_timer.stop()
+        stop_running(self)
 
     def compose(self) -> ComposeResult:
         """
@@ -40,9 +40,11 @@ Created in Python using Textual.
 MONITORING_STRING = """
 [bold underline]Monitoring Descriptions[/]
 
-[{orange}]Processes[/]: An updated list of running processes, sorted by CPU load. Each process has info on:
+[{orange}]Processes[/]: An updated list of running processes, sorted by CPU load by default. Press "s" to sort by
+memory, IO, threads, or open files instead. Each process has info on:
   - Process ID (PID)
   - CPU load (in %)
+  - Memory in use (resident set size)
   - Application name
   - Username of the user running this process
   - The actual executable file running this process
@@ -65,10 +67,14 @@ MONITORING_STRING = """
   - Available Memory: How much is able to be used by programs/ processes
   - Used: How much is already being used
   - Percentage Used (in %): How much memory is used as a percentage of the total
+  - Cached Memory: How much memory holds cached files, and can be reclaimed if needed (Linux only)
+  - Swap Used: How much swap space is in use, out of the total available
 
 [{blue}]CPU Usage[/]: Updated CPU info about:
   - Cores: The total number of cores present on the system
   - Usage (Overall) (in %): A measure of overall CPU usage
+  - Breakdown (in %): How much of the overall usage went to user programs, the system, waiting on IO,
+    other virtual machines (steal), and handling interrupts (IRQ)
   - Usage (per Core) (in %): A measure of each CPU Cores usage
 
 [{green}]Network Info[/]: An updated list of network interfaces. Each interface has info on:
@@ -28,6 +28,7 @@ class MainScreen(Screen[None]):
         Binding(key="m", action="app.switch_screen('mem')", description="Memory"),
         Binding(key="v", action="app.switch_screen('gpu')", description="GPU"),
         Binding(key="g", action="app.switch_screen('guide')", description="Guide"),
+        Binding(key="s", action="app.cycle_process_sort", description="Sort Processes"),
     ]
 
     processes = getters.query_one("#processes", expect_type=Processes)
@@ -6,20 +6,20 @@ from textual.binding import Binding
 from textual.containers import Container
 from textual.reactive import reactive
 from textual.screen import Screen
-from textual.timer import Timer
 from textual.widgets import Digits, Footer, Header, Label
 
+from textual_system_monitor.collector import interval_title, subscribe
+from textual_system_monitor.sparkline import HistorySparkline
 from textual_system_monitor.utilities import (
-    COMMON_INTERVAL,
+    MemoryData,
     bytes_to_human,
     compute_percentage_color,
-    get_mem_data,
     get_palette,
 )
 
 
 class MemoryScreen(Screen[None]):
-    BORDER_TITLE = f"Memory - Updated every {COMMON_INTERVAL}s"
+    BORDER_TITLE = "Memory"
     CSS_PATH = "../styles/mem_css.tcss"
     BINDINGS: ClassVar = [
         Binding(key="q", action="app.quit", description="Quit"),
@@ -31,9 +31,7 @@ class MemoryScreen(Screen[None]):
         Binding(key="v", action="app.switch_screen('gpu')", description="GPU"),
     ]
 
-    update_timer: Timer
-
-    mem_data = reactive(get_mem_data())
+    mem_data: reactive[MemoryData | None] = reactive(None, init=False)
 
     container = getters.query_one("#mem-container", expect_type=Container)
     total_digits = getters.query_one("#total-digits", Digits)
@@ -43,14 +41,20 @@ class MemoryScreen(Screen[None]):
     used_digits = getters.query_one("#used-digits", Digits)
     used_label = getters.query_one("#used-static-label", Label)
     perc_digits = getters.query_one("#perc-digits", Digits)
+    cached_digits = getters.query_one("#cached-digits", Digits)
+    cached_label = getters.query_one("#cached-static-label", Label)
+    swap_digits = getters.query_one("#swap-digits", Digits)
+    swap_label = getters.query_one("#swap-static-label", Label)
 
-    def update_mem_data(self) -> None:
+    def update_mem_data(self, mem_data: MemoryData) -> None:
         """
-        Update the memory information by calling `_get_mem_data`
+        Update the memory information
+
+        :param mem_data: The latest memory sample
         """
-        self.mem_data = get_mem_data()
+        self.mem_data = mem_data
 
-    def watch_mem_data(self, data: dict[str, int | float]) -> None:
+    def watch_mem_data(self, data: MemoryData) -> None:
         """
         Watch for changes in the memory data and update the Widgets accordingly
 
@@ -63,23 +67,33 @@ class MemoryScreen(Screen[None]):
         kb_size = cast(Monitor, self.app).CONTEXT["kb_size"]
 
         # Update total information
-        value, denom = bytes_to_human(data["total"], kb_size).split(" ")
+        value, denom = bytes_to_human(data.total, kb_size).split(" ")
         self.total_label.update(f"Total Memory ({denom}):  ")
         self.total_digits.update(f"{value}")
 
         # Update available information
-        value, denom = bytes_to_human(data["available"], kb_size).split(" ")
+        value, denom = bytes_to_human(data.available, kb_size).split(" ")
         self.avail_label.update(f"Available Memory ({denom}):  ")
         self.avail_digits.update(f"{value}")
 
         # Update used information
-        value, denom = bytes_to_human(data["used"], kb_size).split(" ")
+        value, denom = bytes_to_human(data.used, kb_size).split(" ")
         self.used_label.update(f"Used Memory ({denom}):  ")
         self.used_digits.update(f"{value}")
 
+        # Update cached information
+        value, denom = bytes_to_human(data.cached, kb_size).split(" ")
+        self.cached_label.update(f"Cached Memory ({denom}):  ")
+        self.cached_digits.update(f"{value}")
+
+        # Update swap information
+        value, denom = bytes_to_human(data.swap_used, kb_size).split(" ")
+        self.swap_label.update(f"Swap Used ({denom}):  ")
+        self.swap_digits.update(f"{value}")
+
         # Update percentage information
         palette = get_palette(self.app.theme)
-        pct, color = compute_percentage_color(data["percent"])
+        pct, color = compute_percentage_color(data.percent)
         self.perc_digits.update(f"{pct}")
         self.perc_digits.styles.color = palette[color]
 
@@ -103,14 +117,21 @@ class MemoryScreen(Screen[None]):
             with Container(classes="mem-static"):
                 yield Label("Percentage Used (%):  ", classes="label")
                 yield Digits(id="perc-digits", classes="digits")
+            with Container(classes="mem-static"):
+                yield Label("", id="cached-static-label", classes="label")
+                yield Digits(id="cached-digits", classes="digits")
+            with Container(classes="mem-static"):
+                yield Label("", id="swap-static-label", classes="label")
+                yield Digits(id="swap-digits", classes="digits")
+            yield HistorySparkline("mem", "mem", "yellow", title="Memory Used", id="mem-screen-sparkline")
         yield Footer()
 
     def on_mount(self) -> None:
         """
         Perform initial setup for the Memory Screen
         """
-        self.update_timer = self.set_interval(COMMON_INTERVAL, self.update_mem_data)
-        self.container.border_title = self.BORDER_TITLE
+        subscribe(self, "mem", self.update_mem_data)
+        self.container.border_title = interval_title(self, "mem")
         self.container.styles.border = ("round", get_palette(self.app.theme)["yellow"])
 
         def _on_theme_change() -> None:
@@ -120,10 +141,3 @@ class MemoryScreen(Screen[None]):
             self.container.styles.border = ("round", get_palette(self.app.theme)["yellow"])
 
         self.watch(self.app, "theme", _on_theme_change, init=False)
-
-    def on_unmount(self) -> None:
-        """
-        Kill the timer on unmount to avoid timer-related threading issues
-        """
-        if self.update_timer:
-            self.update_timer.stop()
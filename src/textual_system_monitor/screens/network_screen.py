@@ -1,21 +1,25 @@
 from typing import Any, ClassVar, cast
 
+from rich.text import Text
 from textual import getters
 from textual.app import ComposeResult
 from textual.binding import Binding
-from textual.containers import Container, VerticalScroll
+from textual.containers import Container, Horizontal, VerticalScroll
 from textual.reactive import reactive
 from textual.screen import Screen
-from textual.timer import Timer
 from textual.widgets import DataTable, Footer, Header
 
-from textual_system_monitor.utilities import NET_INTERVAL, bytes_to_human, get_network_stats, get_palette
+from textual_system_monitor.collector import interval_title, subscribe
+from textual_system_monitor.rendering import get_styles, styled_text
+from textual_system_monitor.sparkline import HistorySparkline
+from textual_system_monitor.tables import sync_table
+from textual_system_monitor.utilities import bytes_to_human, get_palette
 
-type NetworkStatsType = list[dict[str, str | int]]
+type NetworkStatsType = tuple[dict[str, Any], ...]
 
 
 class NetworkScreen(Screen[None]):
-    BORDER_TITLE = f"Network - Updated every {NET_INTERVAL}s"
+    BORDER_TITLE = "Network"
     CSS_PATH = "../styles/network_css.tcss"
     BINDINGS: ClassVar = [
         Binding(key="q", action="app.quit", description="Quit"),
@@ -27,65 +31,103 @@ class NetworkScreen(Screen[None]):
         Binding(key="v", action="app.switch_screen('gpu')", description="GPU"),
     ]
 
-    update_timer: Timer
-
-    io = reactive(get_network_stats())
+    # Every sample is new, so always update rather than compare every counter of every interface
+    io: reactive[NetworkStatsType | None] = reactive(None, init=False, always_update=True)
 
     container = getters.query_one("#network-container", expect_type=Container)
     table = cast(DataTable[Any], getters.query_one("#network-screen-table", expect_type=DataTable))
 
-    def update_io(self) -> None:
+    def update_io(self, io: NetworkStatsType) -> None:
         """
         Define how to update `self.io`
+
+        :param io: The latest network sample
         """
-        self.io = get_network_stats()
+        self.io = io
 
-    def watch_io(self, old_stats: NetworkStatsType, new_stats: NetworkStatsType) -> None:
+    def watch_io(self, stats: NetworkStatsType) -> None:
         """
         Define what happens when `self.io` changes.
 
-        Update the Network Screen with new info for each network interface
+        Update the Network Screen with new info for each network interface that is shown
 
-        :param old_stats: The list of old interface info to use
-        :param new_stats: The list of new interface info to use
+        :param stats: The latest network sample, with rates (see `NetworkRates`)
         """
 
         from textual_system_monitor.app import Monitor
 
-        kb_size = cast(Monitor, self.app).CONTEXT["kb_size"]
-
-        # Clear the table and add the columns
-        self.table.clear(columns=True)
-        self.table.add_columns("Interface", "Download", "Download Speed (/s)", "Upload", "Upload Speed (/s)")
-
-        # Next, go through each updated network interface, get its info, and update the DataTable
-        # with the new info for each interface
-        for old_stat, new_stat in zip(old_stats, new_stats, strict=True):
-            interface = old_stat["interface"]
-            new_bytes_sent = cast(int, new_stat["bytes_sent"])
-            old_bytes_sent = cast(int, old_stat["bytes_sent"])
-            new_bytes_recv = cast(int, new_stat["bytes_recv"])
-            old_bytes_recv = cast(int, old_stat["bytes_recv"])
-
-            download = bytes_to_human(new_bytes_recv, kb_size)
-            upload = bytes_to_human(new_bytes_sent, kb_size)
-            upload_speed = bytes_to_human(
-                round((new_bytes_sent - old_bytes_sent) / NET_INTERVAL, 2),
-                kb_size,
-            )
-            download_speed = bytes_to_human(
-                round((new_bytes_recv - old_bytes_recv) / NET_INTERVAL, 2),
-                kb_size,
+        app = cast(Monitor, self.app)
+        kb_size = app.CONTEXT["kb_size"]
+
+        # Only the interfaces that are shown are formatted
+        shown, total = app.interfaces.select(stats, app.interfaces.limit)
+        self.container.border_subtitle = f"Top {len(shown)} of {total:,} by Speed" if len(shown) < total else ""
+
+        def _speed(stat: dict[str, Any], key: str) -> str:
+            """
+            Format a rate of bytes
+
+            :param stat: The interface, with rates
+            :param key: The key of the rate, in bytes/s
+            :return: The rate, in human-readable units
+            """
+            return bytes_to_human(round(stat.get(key, 0.0), 2), kb_size)
+
+        def _counts(stat: dict[str, Any], received: str, sent: str) -> str:
+            """
+            Format the rates of a pair of counters, in and out
+
+            :param stat: The interface, with rates
+            :param received: The counter of what came in (e.g. `packets_recv`)
+            :param sent: The counter of what went out (e.g. `packets_sent`)
+            :return: Both rates, per second
+            """
+            return f"{stat.get(f'{received}_rate', 0.0):.1f} / {stat.get(f'{sent}_rate', 0.0):.1f}"
+
+        # Go through each updated network interface, get its info, and key its row by interface name
+        # so that only what changed since the last update is touched in the table
+        styles = get_styles(app.theme)
+        rows: dict[str, tuple[str | Text, ...]] = {}
+        for stat in shown:
+            interface = cast(str, stat["interface"])
+            rows[interface] = (
+                styled_text(interface, styles["green"]),
+                bytes_to_human(stat["bytes_recv"], kb_size),
+                _speed(stat, "bytes_recv_rate"),
+                _speed(stat, "bytes_recv_avg"),
+                _speed(stat, "bytes_recv_peak"),
+                bytes_to_human(stat["bytes_sent"], kb_size),
+                _speed(stat, "bytes_sent_rate"),
+                _speed(stat, "bytes_sent_avg"),
+                _speed(stat, "bytes_sent_peak"),
+                _counts(stat, "packets_recv", "packets_sent"),
+                _counts(stat, "errin", "errout"),
+                _counts(stat, "dropin", "dropout"),
             )
 
-            self.table.add_row(f"[green]{interface}[/]", download, download_speed, upload, upload_speed)
+        # Rows are put in the order of the selection, which is the order of the sample, rather than sorted by name or
+        # rate: the interface column only tells rows apart
+        sync_table(self.table, rows, order_by="interface")
 
     def on_mount(self) -> None:
         """
         Perform initial setup for the Network Screen
         """
-        self.update_timer = self.set_interval(NET_INTERVAL, self.update_io)
-        self.container.border_title = self.BORDER_TITLE
+        self.table.add_column("Interface", key="interface")
+        self.table.add_column("Download", key="download")
+        self.table.add_column("Download Speed (/s)", key="download_speed")
+        self.table.add_column("Average (/s)", key="download_avg")
+        self.table.add_column("Peak (/s)", key="download_peak")
+        self.table.add_column("Upload", key="upload")
+        self.table.add_column("Upload Speed (/s)", key="upload_speed")
+        self.table.add_column("Average (/s)", key="upload_avg")
+        self.table.add_column("Peak (/s)", key="upload_peak")
+        self.table.add_column("Packets In / Out (/s)", key="packets")
+        self.table.add_column("Errors In / Out (/s)", key="errors")
+        self.table.add_column("Drops In / Out (/s)", key="drops")
+
+        subscribe(self, "network", self.update_io)
+        self.container.border_title = interval_title(self, "network")
         self.container.styles.border = ("round", get_palette(self.app.theme)["green"])
 
         def _on_theme_change() -> None:
@@ -96,13 +138,6 @@ class NetworkScreen(Screen[None]):
 
         self.watch(self.app, "theme", _on_theme_change, init=False)
 
-    def on_unmount(self) -> None:
-        """
-        Kill the timer on unmount to avoid timer-related threading issues
-        """
-        if self.update_timer:
-            self.update_timer.stop()
-
     def compose(self) -> ComposeResult:
         """
         Display the structure of the Network Screen
@@ -110,7 +145,17 @@ class NetworkScreen(Screen[None]):
         :return: The ComposeResult featuring the structure of the Network Screen
         """
         yield Header(show_clock=True)
-        with Container(id="network-container"):  # noqa: SIM117
+        with Container(id="network-container"):
+            with Horizontal(id="network-charts"):
+                for direction, label in (("rx", "Download"), ("tx", "Upload")):
+                    yield HistorySparkline(
+                        "network",
+                        f"net:{direction}",
+                        "green" if direction == "rx" else "blue",
+                        maximum=None,
+                        title=f"Total {label} Speed",
+                        id=f"network-{direction}-sparkline",
+                    )
             with VerticalScroll():
                 yield DataTable(id="network-screen-table", show_cursor=False, zebra_stripes=True)
         yield Footer()
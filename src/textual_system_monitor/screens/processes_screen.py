@@ -1,43 +1,72 @@
-from collections.abc import Iterator
 from typing import Any, ClassVar, cast
 
-from psutil import Process, process_iter
+from rich.style import Style
+from rich.text import Text
 from textual import getters
 from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.containers import Container, Horizontal
 from textual.reactive import reactive
 from textual.screen import Screen
-from textual.timer import Timer
 from textual.widgets import Button, DataTable, Footer, Header
 
+from textual_system_monitor.collector import interval_title, subscribe
+from textual_system_monitor.rendering import get_styles, percentage_text, styled_text
+from textual_system_monitor.tables import sync_table
 from textual_system_monitor.utilities import (
-    UNCOMMON_INTERVAL,
-    get_color_formatted_string,
-    get_non_zero_procs,
+    PROCESS_SORT_KEYS,
+    bytes_to_human,
     get_palette,
+    rank_processes,
 )
 
+type ProcessesType = tuple[dict[str, Any], ...]
 
-def _get_procs(sort: bool) -> Iterator[Process] | list[Process]:
+# The info of a process its row is formatted from
+ROW_FIELDS = ("name", "exe", "cpu_percent", "username", "rss", "num_threads", "io_rate", "num_fds")
+
+
+def _get_procs(procs: ProcessesType, sort: bool, sort_key: str = "cpu_percent") -> ProcessesType:
     """
     Get the list of processes, depending on the value of `sort`
 
-    :param sort: Whether to sort the processes by CPU load
-    :return: The list of processes (possibly sorted)
+    :param procs: The latest process sample
+    :param sort: Whether to rank the processes
+    :param sort_key: The key to rank the processes by (see `PROCESS_SORT_KEYS`)
+    :return: The list of processes (possibly ranked)
     """
-    procs = process_iter(["pid", "name", "username", "exe", "cpu_percent"])
     if sort:
-        procs = sorted(
-            get_non_zero_procs(procs),
-            key=lambda x: cast(float, x.info.get("cpu_percent")),
-            reverse=True,
-        )
+        return tuple(rank_processes(procs, sort_key))
     return procs
 
 
+def _process_row(info: dict[str, Any], styles: dict[str, Style], kb_size: int) -> tuple[Any, ...]:
+    """
+    Format the row of a process
+
+    :param info: The info of the process
+    :param styles: The styles of the current theme (see `get_styles`)
+    :param kb_size: The size of a kilobyte (1000 or 1024)
+    :return: The cells of the row
+    """
+    PID = info["pid"]
+    name: str | Text = info["name"] or "N/A"
+    exe = info["exe"] or "N/A"
+    cpu_percent = percentage_text(styles, info["cpu_percent"])
+    user_name = info["username"] or "N/A"
+    rss = bytes_to_human(info["rss"], kb_size) if info["rss"] is not None else "N/A"
+    io_rate = bytes_to_human(round(info["io_rate"], 2), kb_size) if info["io_rate"] is not None else "N/A"
+    num_fds = info["num_fds"] if info["num_fds"] is not None else "N/A"
+
+    # Only colorize the name if it's not "N/A"
+    if name != "N/A":
+        name = styled_text(name, styles["orange"])
+
+    return (PID, name, user_name, cpu_percent, rss, info["num_threads"], io_rate, num_fds, exe)
+
+
 class ProcessesScreen(Screen[None]):
-    BORDER_TITLE = f"Processes - Updated every {UNCOMMON_INTERVAL}s"
+    BORDER_TITLE = "Processes"
     CSS_PATH = "../styles/processes_css.tcss"
     BINDINGS: ClassVar = [
         Binding(key="q", action="app.quit", description="Quit"),
@@ -47,6 +76,7 @@ class ProcessesScreen(Screen[None]):
         Binding(key="d", action="app.switch_screen('drive')", description="Drives"),
         Binding(key="m", action="app.switch_screen('mem')", description="Memory"),
         Binding(key="v", action="app.switch_screen('gpu')", description="GPU"),
+        Binding(key="s", action="app.cycle_process_sort", description="Sort By"),
         Binding(key="/", action="", description=""),
     ]
 
@@ -54,21 +84,34 @@ class ProcessesScreen(Screen[None]):
     paused = False
     sort = True
 
-    update_timer: Timer
+    processes: reactive[ProcessesType | None] = reactive(None, init=False)
 
-    # Set the default processes value to an initial call to the function
-    processes = reactive(_get_procs(sort=sort))
+    # The row of every process on display, and the info it was formatted from, by PID. Only valid for the styles
+    # they were formatted with
+    row_cache: dict[int, tuple[tuple[Any, ...], tuple[Any, ...]]]
+    row_styles: dict[str, Style] | None = None
 
     table = cast(DataTable[Any], getters.query_one("#process-screen-table", expect_type=DataTable))
     container = getters.query_one("#process-container", expect_type=Container)
 
-    def update_processes(self) -> None:
+    def update_processes(self, processes: ProcessesType) -> None:
         """
         Define how to update `self.processes`
+
+        :param processes: The latest process sample
         """
         if self.paused:
             return
-        self.processes = _get_procs(sort=self.sort)
+        self.processes = _get_procs(processes, sort=self.sort, sort_key=self._sort_key)
+
+    @property
+    def _sort_key(self) -> str:
+        """
+        The app-wide key processes are ranked by
+        """
+        from textual_system_monitor.app import Monitor
+
+        return cast(Monitor, self.app).process_sort
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """
@@ -96,42 +139,63 @@ class ProcessesScreen(Screen[None]):
             sort_button.label = "Sorted" if self.sort else "Unsorted"
             sort_button.variant = "success" if self.sort else "error"
 
-    def watch_processes(self, procs: Iterator[Process] | list[Process]) -> None:
+        # If the sort key button is pressed, rank processes by the next key, app-wide
+        elif button_id == "process-sort-key-button":
+            from textual_system_monitor.app import Monitor
+
+            cast(Monitor, self.app).action_cycle_process_sort()
+
+    def watch_processes(self, procs: ProcessesType) -> None:
         """
         Define what happens when `self.processes` changes.
 
-        Update the Processes pane with Statics for each process
+        Update the table with a row for each process
 
         :param procs: The list of new processes to render
         """
-        palette = get_palette(self.app.theme)
+        from textual_system_monitor.app import Monitor
 
-        # Clear the table and add columns
-        self.table.clear(columns=True)
-        self.table.add_columns("PID", "Name", "Username", "CPU Load (%)", "EXE")
+        kb_size = cast(Monitor, self.app).CONTEXT["kb_size"]
 
-        # Next, go through each updated process, get its info, and update the table widget
-        # with the new info for each process
-        for proc in procs:
-            info = proc.info
-            PID = info["pid"]
-            name = info["name"] or "N/A"
-            exe = info["exe"] or "N/A"
-            cpu_percent = get_color_formatted_string(palette, info["cpu_percent"])
-            user_name = info["username"] or "N/A"
+        styles = get_styles(self.app.theme)
+        if styles is not self.row_styles:
+            self.row_cache = {}
+            self.row_styles = styles
 
-            # Only colorize the name if it's not "N/A"
-            if name != "N/A":
-                name = f"[bold {palette['orange']}]{name}[/]"
+        # Go through each updated process, get its info, and key its row by PID so that only what
+        # changed since the last update is touched in the table. Rows of processes whose info didn't change
+        # are reused as they are, so that `sync_table` can skip them
+        rows: dict[str, tuple[Any, ...]] = {}
+        row_cache: dict[int, tuple[tuple[Any, ...], tuple[Any, ...]]] = {}
+        for info in procs:
+            PID = info["pid"]
+            fields = tuple(info[key] for key in ROW_FIELDS)
+            cached = self.row_cache.get(PID)
+            row = cached[1] if cached is not None and cached[0] == fields else _process_row(info, styles, kb_size)
+            row_cache[PID] = (fields, row)
+            rows[str(PID)] = row
+        self.row_cache = row_cache
 
-            self.table.add_row(PID, name, user_name, cpu_percent, exe)
+        sync_table(self.table, rows, order_by="pid")
 
     def on_mount(self) -> None:
         """
         Perform initial setup for the Processes Screen
         """
-        self.update_timer = self.set_interval(UNCOMMON_INTERVAL, self.update_processes)
-        self.container.border_title = self.BORDER_TITLE
+        self.row_cache = {}
+
+        self.table.add_column("PID", key="pid")
+        self.table.add_column("Name", key="name")
+        self.table.add_column("Username", key="username")
+        self.table.add_column("CPU Load (%)", key="cpu_percent")
+        self.table.add_column("Memory", key="rss")
+        self.table.add_column("Threads", key="num_threads")
+        self.table.add_column("IO (/s)", key="io_rate")
+        self.table.add_column("Open Files", key="num_fds")
+        self.table.add_column("EXE", key="exe")
+
+        subscribe(self, "processes", self.update_processes)
+        self.container.border_title = interval_title(self, "processes")
         self.container.styles.border = ("round", get_palette(self.app.theme)["orange"])
 
         def _on_theme_change() -> None:
@@ -142,12 +206,16 @@ class ProcessesScreen(Screen[None]):
 
         self.watch(self.app, "theme", _on_theme_change, init=False)
 
-    def on_unmount(self) -> None:
-        """
-        Kill the timer on unmount to avoid timer-related threading issues
-        """
-        if self.update_timer:
-            self.update_timer.stop()
+        def _on_sort_change(sort_key: str) -> None:
+            """
+            Update the sort key button, and re-rank the processes on display by the new sort key
+            """
+            sort_key_button = self.query_one("#process-sort-key-button", expect_type=Button)
+            sort_key_button.label = f"By {PROCESS_SORT_KEYS[sort_key]}"
+            if self.processes is not None:
+                self.processes = _get_procs(self.processes, sort=self.sort, sort_key=sort_key)
+
+        self.watch(self.app, "process_sort", _on_sort_change)
 
     def compose(self) -> ComposeResult:
         """
@@ -159,6 +227,7 @@ class ProcessesScreen(Screen[None]):
         with Container(id="process-screen-container"):
             with Horizontal(id="process-options-container"):
                 yield Button("Sorted", variant="success", id="process-sort-button")
+                yield Button("By CPU Load", variant="primary", id="process-sort-key-button")
                 yield Button("Pause", variant="success", id="process-pause-button")
             with Container(id="process-container"):
                 yield DataTable(id="process-screen-table", show_cursor=True, cursor_type="row", zebra_stripes=True)
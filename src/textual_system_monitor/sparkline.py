@@ -0,0 +1,207 @@
+import math
+from collections import deque
+from typing import TYPE_CHECKING, Any, cast
+
+from rich.text import Text
+from textual.events import Resize
+from textual.widget import Widget
+
+from .collector import subscribe
+from .history import describe_span
+from .utilities import get_palette
+
+if TYPE_CHECKING:
+    from .history import HistoryStore, RingBuffer
+
+# Eighths of a cell, from empty to full
+BLOCKS = " ▁▂▃▄▅▆▇█"
+
+
+def nice_scale(peak: float) -> float:
+    """
+    Round a peak up to the next power of 2, so that an auto-scaled chart only rescales when the peak changes a lot
+
+    :param peak: The highest value on the chart
+    :return: The value the top of the chart stands for
+    """
+    if peak <= 0:
+        return 1.0
+    return float(2 ** math.ceil(math.log2(peak)))
+
+
+class HistorySparkline(Widget):
+    """
+    A chart of the whole history of a series (see `HistoryStore`), as high as the widget and as wide as the widget.
+
+    Each column stands for the highest value of a run of consecutive samples, so that the whole history fits in
+    the width of the widget and short spikes still show. Columns are only rendered once: on each new sample, only
+    the columns that were completed since are rendered, unless the widget was resized or the chart rescaled.
+    Samples that don't make up a whole column yet are shown in a live column on the right, rendered on each sample.
+    """
+
+    def __init__(
+        self,
+        metric: str,
+        series: str,
+        color: str,
+        maximum: float | None = 100.0,
+        *,
+        title: str | None = None,
+        id: str | None = None,  # noqa: A002
+        classes: str | None = None,
+    ) -> None:
+        """
+        :param metric: The metric the series belongs to (a field of `Snapshot`)
+        :param series: The name of the series in the `HistoryStore`
+        :param color: The name of the palette color to draw the chart in
+        :param maximum: The value the top of the chart stands for, or None to scale to the highest value shown
+        :param title: What the chart shows, for its border title, which also says how much time it covers. If None,
+            the chart has no border title
+        :param id: The ID of the widget
+        :param classes: The CSS classes of the widget
+        """
+        super().__init__(id=id, classes=classes)
+        self.metric = metric
+        self.series = series
+        self.color = color
+        self.maximum = maximum
+        self.title = title
+        if title is not None:
+            self.border_title = title
+
+        # The series the columns on display were rendered from
+        self.source: RingBuffer | None = None
+
+        # How many samples each column stands for, and how many columns have been rendered
+        self.per_column = 1
+        self.rendered = 0
+
+        # The value and the cells (from the bottom up) of each column on display, oldest first
+        self.values: deque[float] = deque(maxlen=1)
+        self.columns: deque[tuple[str, ...]] = deque(maxlen=1)
+        self.live: tuple[str, ...] | None = None
+        self.scale = maximum or 1.0
+
+    @property
+    def history(self) -> "HistoryStore":
+        """
+        The history the series this chart is drawn from is kept in
+        """
+        from .app import Monitor
+
+        return cast(Monitor, self.app).collector.history
+
+    @property
+    def buffer(self) -> "RingBuffer | None":
+        """
+        The series this chart is drawn from, if it has been recorded yet
+        """
+        return self.history.get(self.series)
+
+    def update_title(self) -> None:
+        """
+        Say how much time the chart covers, which may be more than the history is meant to hold, while intervals are
+        stretched (see `HistoryStore`)
+        """
+        if self.title is None:
+            return
+        span = self.history.span(self.metric, self.series)
+        title = f"{self.title} - Last {describe_span(span)}" if span else self.title
+        if title != self.border_title:
+            self.border_title = title
+
+    def _render_column(self, value: float) -> tuple[str, ...]:
+        """
+        Render the cells of a single column, from the bottom up
+
+        :param value: The value of the column
+        :return: The cells of the column
+        """
+        eighths = round(min(max(value / self.scale, 0.0), 1.0) * self.size.height * 8)
+        return tuple(BLOCKS[min(max(eighths - 8 * row, 0), 8)] for row in range(self.size.height))
+
+    def update_chart(self, data: Any = None, rebuild: bool = False) -> None:  # noqa: ARG002
+        """
+        Render the columns completed since the last update
+
+        :param data: The latest sample of the metric, unused since the chart is drawn from its history
+        :param rebuild: Whether to render every column again, e.g. after a resize
+        """
+        buffer = self.buffer
+        width = self.size.width
+        if buffer is None or not width:
+            return
+
+        # The history may have been replaced altogether, e.g. when seeking through a recording
+        if buffer is not self.source:
+            self.source = buffer
+            rebuild = True
+
+        # Fit the whole history in the width of the widget
+        per_column = max(1, math.ceil(buffer.capacity / width))
+        if per_column != self.per_column or self.values.maxlen != width:
+            self.per_column = per_column
+            self.values = deque(maxlen=width)
+            rebuild = True
+
+        # Only columns whose samples are all still in the buffer, and that will get no more samples, are shown
+        completed = buffer.total // per_column
+        first = max(completed - width, math.ceil((buffer.total - len(buffer)) / per_column))
+        if rebuild:
+            self.values.clear()
+            self.rendered = first
+
+        # The samples of a column are the oldest `per_column` of the latest `total - column * per_column`
+        new_values = [
+            max(buffer.window(buffer.total - column * per_column)[:per_column])
+            for column in range(max(self.rendered, first), completed)
+        ]
+        self.values.extend(new_values)
+        self.rendered = completed
+
+        pending = buffer.total - completed * per_column
+        live_value = max(buffer.window(pending)) if pending else 0.0
+
+        scale = self.maximum or nice_scale(max(max(self.values, default=0.0), live_value))
+        if rebuild or scale != self.scale or self.columns.maxlen != width:
+            self.scale = scale
+            self.columns = deque((self._render_column(value) for value in self.values), maxlen=width)
+        else:
+            self.columns.extend(self._render_column(value) for value in new_values)
+
+        self.live = self._render_column(live_value) if pending else None
+        self.update_title()
+        self.refresh()
+
+    def render(self) -> Text:
+        """
+        Draw the columns, the latest on the right
+
+        :return: The chart
+        """
+        width, height = self.size
+        columns = list(self.columns)
+        if self.live is not None:
+            columns = [*columns[max(0, len(columns) - width + 1) :], self.live]
+        lines = ["".join(column[row] for column in columns).rjust(width) for row in reversed(range(height))]
+        return Text("\n".join(lines), style=get_palette(self.app.theme)[self.color], no_wrap=True)
+
+    def on_resize(self, _event: Resize) -> None:
+        """
+        Render every column again, since both how many fit and how high they are may have changed
+        """
+        self.update_chart(rebuild=True)
+
+    def on_mount(self) -> None:
+        """
+        Subscribe to the samples of the metric, and redraw in the new colors when the theme changes
+        """
+        subscribe(self, self.metric, self.update_chart)
+
+        def _on_theme_change() -> None:
+            """
+            Redraw the chart in the colors of the new theme
+            """
+            self.refresh()
+
+        self.watch(self.app, "theme", _on_theme_change, init=False)
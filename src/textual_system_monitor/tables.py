@@ -0,0 +1,180 @@
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from rich.cells import cell_len
+from rich.text import Text
+from textual.widgets import DataTable
+from textual.widgets.data_table import ColumnKey, RowKey
+
+
+@dataclass(slots=True)
+class SyncedRows:
+    """
+    What `sync_table` last put in a table: which table row shows each row, and its cells
+    """
+
+    slots: dict[str, RowKey] = field(default_factory=dict)
+    keys: dict[RowKey, str] = field(default_factory=dict)
+    cells: dict[str, Sequence[Any]] = field(default_factory=dict)
+
+    def assign(self, key: str, slot: RowKey, cells: Sequence[Any]) -> None:
+        """
+        Show a row in a table row
+
+        :param key: The key of the row (see `sync_table`)
+        :param slot: The key of the table row
+        :param cells: The cells of the row
+        """
+        self.slots[key] = slot
+        self.keys[slot] = key
+        self.cells[key] = cells
+
+    def release(self, key: str) -> tuple[RowKey, Sequence[Any]]:
+        """
+        Stop showing a row, freeing its table row up for another
+
+        :param key: The key of the row
+        :return: The key of the table row, and the cells it still shows
+        """
+        slot = self.slots.pop(key)
+        del self.keys[slot]
+        return slot, self.cells.pop(key)
+
+
+# What every table synced so far shows, so that rows can be matched up without reading the table back
+_synced: WeakKeyDictionary[DataTable[Any], SyncedRows] = WeakKeyDictionary()
+
+
+def _cell_width(value: Any) -> int:
+    """
+    Work out how wide a cell is rendered. Like in DataTable, strings are rendered as markup
+
+    :param value: The value of the cell
+    :return: The width of the cell, in terminal cells
+    """
+    if isinstance(value, Text):
+        return value.cell_len
+    if isinstance(value, str):
+        return Text.from_markup(value).cell_len
+    return cell_len(str(value))
+
+
+def _synced_rows(table: DataTable[Any]) -> SyncedRows:
+    """
+    Find what `sync_table` last put in a table, starting over if anything else added or removed rows since
+
+    :param table: The DataTable
+    :return: What the table shows
+    """
+    synced = _synced.get(table)
+    if synced is None or len(synced.keys) != table.row_count or any(slot not in table.rows for slot in synced.keys):
+        synced = _synced[table] = SyncedRows()
+        for row_key in table.rows:
+            synced.assign(str(row_key.value), row_key, table.get_row(row_key))
+    return synced
+
+
+def _new_slot(table: DataTable[Any], key: str) -> str:
+    """
+    Pick the key of a new table row: the key of the row it shows, unless another table row already has it
+
+    :param table: The DataTable
+    :param key: The key of the row
+    :return: The key of the new table row
+    """
+    slot, number = key, 0
+    while slot in table.rows:
+        number += 1
+        slot = f"{key}#{number}"
+    return slot
+
+
+def _update_cells(table: DataTable[Any], updates: list[tuple[RowKey, ColumnKey, Any]]) -> None:
+    """
+    Update cells of a table, only measuring the widest of the cells that could widen each column
+
+    :param table: The DataTable
+    :param updates: The table row, column, and new value of every cell to update
+    """
+    widest: dict[ColumnKey, tuple[int, int]] = {}
+    for position, (_, column_key, new) in enumerate(updates):
+        # A cell can't be wider than twice its length (e.g. in CJK), so most cells needn't be measured
+        content_width = max(table.columns[column_key].content_width, widest.get(column_key, (0, 0))[0])
+        if 2 * len(str(new)) > content_width and (width := _cell_width(new)) > content_width:
+            widest[column_key] = (width, position)
+
+    measured = {position for _, position in widest.values()}
+    for position, (slot, column_key, new) in enumerate(updates):
+        table.update_cell(slot, column_key, new, update_width=position in measured)
+
+
+def sync_table(table: DataTable[Any], rows: Mapping[str, Sequence[Any]], order_by: str | None = None) -> None:
+    """
+    Bring a DataTable in line with a new set of rows, touching only what changed.
+
+    Rows are matched to the rows already in the table by key, and only the cells whose value changed are updated.
+    Rows whose cells are the very same objects as last time aren't even compared, so callers that keep the cells
+    of unchanged rows around make those rows free. Unlike clearing and refilling the table, this keeps the cursor
+    on the same row and the table scrolled where it was.
+
+    Removing a row from a DataTable takes time in proportion to the size of the table, so rows that are gone aren't
+    removed while new rows can take their place: the new row is shown in the table row of the old one (so a table
+    row's key isn't always the key of the row it shows). Only what is left over is removed, or added.
+
+    The table's columns must already be added, with keys, in the same order as the cells of each row.
+    Columns widen to fit wider cells, but don't narrow again: to find out that a column got narrower, DataTable
+    measures every cell in it, for every cell that got narrower, which takes quadratic time on big tables. Only
+    the widest of the cells that could widen a column is measured.
+
+    :param table: The DataTable to update
+    :param rows: The cells of each row, keyed by a value that identifies the row across updates (e.g. a PID)
+    :param order_by: The key of a column whose text is unique to each row. If given, the table is put in the
+        same order as `rows`. Otherwise, existing rows keep their position and new rows are added at the bottom
+    """
+    column_keys = list(table.columns)
+    synced = _synced_rows(table)
+
+    # Remember which row the cursor is on, since rows may move or disappear under it
+    cursor_key: str | None = None
+    if table.show_cursor and table.row_count:
+        cursor_key = synced.keys[table.coordinate_to_cell_key(table.cursor_coordinate).row_key]
+
+    free = [synced.release(key) for key in [key for key in synced.slots if key not in rows]]
+
+    updates: list[tuple[RowKey, ColumnKey, Any]] = []
+    for key, cells in rows.items():
+        slot = synced.slots.get(key)
+        if slot is not None:
+            previous = synced.cells[key]
+            if previous is cells:
+                continue
+        elif free:
+            slot, previous = free.pop()
+        else:
+            slot = table.add_row(*cells, key=_new_slot(table, key))
+            synced.assign(key, slot, cells)
+            continue
+        synced.assign(key, slot, cells)
+        updates += [
+            (slot, column_key, new)
+            for column_key, old, new in zip(column_keys, previous, cells, strict=True)
+            if old is not new and old != new
+        ]
+
+    _update_cells(table, updates)
+    for slot, _ in free:
+        table.remove_row(slot)
+
+    if order_by is not None:
+        # Only re-order the table if the order actually changed
+        order = [synced.keys[row.key] for row in table.ordered_rows]
+        if order != list(rows):
+            column_index = column_keys.index(ColumnKey(order_by))
+            # Ranked by text, since styled cells (Texts) can't be hashed
+            rank = {str(cells[column_index]): position for position, cells in enumerate(rows.values())}
+            table.sort(order_by, key=lambda value: rank[str(value)])
+
+    if cursor_key is not None and cursor_key in synced.slots:
+        table.move_cursor(row=table.get_row_index(synced.slots[cursor_key]), scroll=False)
@@ -1,8 +1,27 @@
+import heapq
+import os
+import re
+import select
 import sys
-from collections.abc import Iterator
-from typing import Literal, cast
-
-from psutil import Process, cpu_count, cpu_percent, net_io_counters, virtual_memory
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from functools import lru_cache
+from queue import SimpleQueue
+from threading import Thread
+from time import monotonic
+from typing import Any, BinaryIO, Literal, NamedTuple, cast
+
+from psutil import (
+    Process,
+    cpu_times,
+    disk_io_counters,
+    disk_partitions,
+    disk_usage,
+    net_io_counters,
+    process_iter,
+    swap_memory,
+    virtual_memory,
+)
 
 if sys.platform == "win32":
     from wmi import WMI
@@ -16,6 +35,26 @@ UNCOMMON_INTERVAL = 3
 RARE_INTERVAL = 10
 NET_INTERVAL = 1
 
+MEMINFO_PATH = "/proc/meminfo"
+MOUNTINFO_PATH = "/proc/self/mountinfo"
+NET_SYSFS_PATH = "/sys/class/net"
+BLOCK_SYSFS_PATH = "/sys/block"
+
+# How container runtimes and CNI plugins name the host side of their veth pairs, and how bridges are usually named
+VETH_PREFIXES = ("veth", "cali", "lxc", "cilium", "vnet", "tap", "gke", "eni")
+BRIDGE_PREFIXES = ("br", "docker", "virbr", "cni", "bridge")
+
+# How many mounts have their usage probed at once, and how long a probe may take before its mount is marked
+# unresponsive, in seconds. Unresponsive mounts aren't probed again for a while, starting at `PROBE_BACKOFF` seconds
+# and doubling every time they are still unresponsive, up to `PROBE_MAX_BACKOFF`
+PROBE_WORKERS = 8
+PROBE_DEADLINE = 2.0
+PROBE_BACKOFF = 30.0
+PROBE_MAX_BACKOFF = 600.0
+
+# How often the usage probed so far is handed over while probing, in seconds
+PROBE_PROGRESS_INTERVAL = 0.2
+
 AVAILABILITY_MAP = {
     1: "Other",
     2: "Unknown",
@@ -107,18 +146,58 @@ NETWORK UTILITIES
 """
 
 
+@lru_cache(maxsize=8192)
+def interface_type(name: str) -> str:
+    """
+    Work out what kind of network interface this is (one of `interfaces.INTERFACE_TYPES`).
+
+    On Linux, sysfs tells bridges and physical interfaces apart from virtual ones. Elsewhere, and to tell veths
+    apart from other virtual interfaces (tunnels, VPNs, etc.), interfaces go by their name. Types are cached by name,
+    since container hosts create and destroy interfaces all the time.
+
+    :param name: The name of the interface
+    :return: The type of the interface
+    """
+    if name == "lo" or (name.startswith("lo") and name[2:].isdigit()) or name.lower().startswith("loopback"):
+        return "loopback"
+
+    sysfs = os.path.join(NET_SYSFS_PATH, name)
+    if os.path.isdir(sysfs):
+        if os.path.exists(os.path.join(sysfs, "bridge")):
+            return "bridge"
+        if os.path.exists(os.path.join(sysfs, "device")):
+            return "physical"
+        return "veth" if name.startswith(VETH_PREFIXES) else "other"
+
+    if name.startswith(BRIDGE_PREFIXES):
+        return "bridge"
+    if name.startswith(VETH_PREFIXES):
+        return "veth"
+    return "physical"
+
+
 def get_network_stats() -> list[dict[str, str | int]]:
     """
     Get network statistics per interface, sorted by highest download amount.
 
+    Besides bytes, packets sent and received, errors (`errin`, `errout`), and dropped packets (`dropin`, `dropout`)
+    are counted. Each interface also has its `type` (see `interface_type`).
+
     :return: A sorted list of dictionaries, each containing the network stats for a single interface.
     """
     return sorted(
         (
             {
                 "interface": interface,
+                "type": interface_type(interface),
                 "bytes_sent": stats.bytes_sent,
                 "bytes_recv": stats.bytes_recv,
+                "packets_sent": stats.packets_sent,
+                "packets_recv": stats.packets_recv,
+                "errin": stats.errin,
+                "errout": stats.errout,
+                "dropin": stats.dropin,
+                "dropout": stats.dropout,
             }
             for interface, stats in net_io_counters(pernic=True).items()
         ),
@@ -127,126 +206,583 @@ def get_network_stats() -> list[dict[str, str | int]]:
     )
 
 
-def update_network_static(
-    new_stats: list[dict[str, str | int]],
-    old_stats: list[dict[str, str | int]],
-    base: int,
-    palette: dict[str, str],
-) -> str:
+"""
+CPU UTILITIES
+"""
+
+
+class CPUData(NamedTuple):
     """
-    Generate a string containing the updated network info for each interface
+    CPU load over the time between two samples, in %.
 
-    :param new_stats: The updated network stats
-    :param old_stats: The old network stats
-    :param base: The base to use for the conversion (1000 or 1024)
-    :param palette: The color palette to use for the current theme
+    `user`, `system`, `iowait`, `steal`, and `irq` break the overall load down by where the time was spent.
+    Categories the platform doesn't report are 0.
+    """
+
+    cores: int
+    overall: float
+    individual: tuple[float, ...]
+    user: float = 0.0
+    system: float = 0.0
+    iowait: float = 0.0
+    steal: float = 0.0
+    irq: float = 0.0
+
+
+# Which `cpu_times()` fields make up each category of the breakdown. Not every platform has every field
+CPU_BREAKDOWN_FIELDS = {
+    "user": ("user", "nice"),
+    "system": ("system",),
+    "iowait": ("iowait",),
+    "steal": ("steal",),
+    "irq": ("irq", "softirq", "interrupt", "dpc"),
+}
 
-    :return: The string needed to update the Static widget with the new info
+
+class CPUSampler:
     """
+    Derives CPU load from the difference between consecutive `cpu_times(percpu=True)` snapshots.
 
-    static_content = ""
+    Unlike `psutil.cpu_percent()`, which keeps one global "last call" baseline, every sampler keeps its own,
+    so consumers never skew each other's measurements. One snapshot per sample is enough for the overall load,
+    the load of each core, and the breakdown, since they all come from the same deltas.
+    """
 
-    # For each interface, calculate the new info and add it to the string to return
-    for old_stat, new_stat in zip(old_stats, new_stats, strict=True):
-        interface = old_stat["interface"]
-        new_bytes_sent = cast(int, new_stat["bytes_sent"])
-        old_bytes_sent = cast(int, old_stat["bytes_sent"])
-        new_bytes_recv = cast(int, new_stat["bytes_recv"])
-        old_bytes_recv = cast(int, old_stat["bytes_recv"])
+    def __init__(self) -> None:
+        self.last = cpu_times(percpu=True)
 
-        download = bytes_to_human(new_bytes_recv, base)
-        upload = bytes_to_human(new_bytes_sent, base)
-        upload_speed = bytes_to_human(
-            round((new_bytes_sent - old_bytes_sent) / NET_INTERVAL, 2),
-            base,
-        )
-        download_speed = bytes_to_human(
-            round((new_bytes_recv - old_bytes_recv) / NET_INTERVAL, 2),
-            base,
-        )
+        fields = self.last[0]._fields if self.last else ()
+        self.idle_indices = [fields.index(field) for field in ("idle", "iowait") if field in fields]
+        self.guest_indices = [fields.index(field) for field in ("guest", "guest_nice") if field in fields]
+        self.breakdown_indices = {
+            category: [fields.index(field) for field in category_fields if field in fields]
+            for category, category_fields in CPU_BREAKDOWN_FIELDS.items()
+        }
 
-        static_content += (
-            f"[bold {palette['green']}]{interface}[/]: [bold {palette['blue']}]Download[/]: {download} at "
-            f"{download_speed} /s | [bold {palette['blue']}]Upload[/]: {upload} at {upload_speed} /s\n\n"
+    def _load(self, deltas: Sequence[float]) -> tuple[float, float]:
+        """
+        Work out the total and busy time from the deltas of one core (or the sum of the deltas of all cores).
+
+        As in psutil, guest time is already counted in user time, so it is left out of the total.
+
+        :param deltas: The difference between two snapshots of `cpu_times()`, field by field
+        :return: The total time, and the busy time
+        """
+        total = sum(deltas) - sum(deltas[index] for index in self.guest_indices)
+        busy = total - sum(deltas[index] for index in self.idle_indices)
+        return total, busy
+
+    def sample(self) -> CPUData:
+        """
+        Take a new snapshot and work out the load since the previous one
+
+        :return: The CPUData since the last sample
+        """
+        current = cpu_times(percpu=True)
+        last, self.last = self.last, current
+
+        # If cores were added or removed, there is nothing to compare against until the next sample
+        if len(current) != len(last):
+            last = current
+
+        # Per core deltas, and their sum across all cores
+        deltas = [
+            [new - old for new, old in zip(new_times, old_times, strict=True)]
+            for new_times, old_times in zip(current, last, strict=True)
+        ]
+        summed = [sum(field) for field in zip(*deltas, strict=True)] if deltas else []
+
+        individual = []
+        for core_deltas in deltas:
+            total, busy = self._load(core_deltas)
+            individual.append(_percent(busy, total))
+
+        total, busy = self._load(summed) if summed else (0.0, 0.0)
+
+        return CPUData(
+            cores=len(current),
+            overall=_percent(busy, total),
+            individual=tuple(individual),
+            **{
+                category: _percent(sum(summed[index] for index in indices), total)
+                for category, indices in self.breakdown_indices.items()
+            },
         )
 
-    return static_content
+
+def _percent(part: float, total: float) -> float:
+    """
+    Express `part` as a percentage of `total`, clamped between 0 and 100 and rounded to 1 decimal place
+
+    :param part: The part
+    :param total: The total
+    :return: The percentage, or 0.0 if the total is 0
+    """
+    if total <= 0:
+        return 0.0
+    return round(max(0.0, min(100.0, part / total * 100)), 1)
 
 
 """
-CPU UTILITIES
+MEMORY UTILITIES
 """
 
 
-def get_cpu_data() -> dict[str, int | None | float | list[float]]:
+class MemoryData(NamedTuple):
     """
-    Return a dictionary containing CPU data with keys 'cores', 'overall', and 'individual'
+    A single, internally-consistent sample of system memory. Quantities are in bytes.
 
-    :return: The dictionary containing CPU data
+    Buffers, cached, shared, and slab memory are only reported on Linux, and are 0 elsewhere.
     """
-    return {
-        "cores": cpu_count(),
-        "overall": cpu_percent(percpu=False),
-        "individual": cpu_percent(percpu=True),
-    }
+
+    total: int
+    available: int
+    used: int
+    percent: float
+    swap_total: int
+    swap_used: int
+    swap_percent: float
+    buffers: int = 0
+    cached: int = 0
+    shared: int = 0
+    slab: int = 0
 
 
-def display_percentages_CPU(percentages: list[float], palette: dict[str, str]) -> str:
+def _read_meminfo() -> MemoryData:
     """
-    Display the percentages of each core in a string
+    Build a MemoryData from a single read of `/proc/meminfo`. Linux only.
 
-    :param percentages: The list of CPU load percentages for each core
-    :param palette: The palette to use for the current theme
-    :return: The string containing the formatted percentages
+    Follows the same definitions as `psutil.virtual_memory()` and `psutil.swap_memory()`.
+
+    :return: The MemoryData
     """
+    with open(MEMINFO_PATH, "rb") as meminfo:
+        mems = {fields[0]: int(fields[1]) * 1024 for fields in (line.split() for line in meminfo)}
+
+    total = mems[b"MemTotal:"]
+    available = mems.get(b"MemAvailable:") or virtual_memory().available  # Kernels older than 3.14
+    used = total - available
+    swap_total = mems.get(b"SwapTotal:", 0)
+    swap_used = swap_total - mems.get(b"SwapFree:", 0)
+
+    return MemoryData(
+        total=total,
+        available=available,
+        used=used,
+        percent=round(used / total * 100, 1) if total else 0.0,
+        swap_total=swap_total,
+        swap_used=swap_used,
+        swap_percent=round(swap_used / swap_total * 100, 1) if swap_total else 0.0,
+        buffers=mems.get(b"Buffers:", 0),
+        cached=mems.get(b"Cached:", 0) + mems.get(b"SReclaimable:", 0),
+        shared=mems.get(b"Shmem:", 0),
+        slab=mems.get(b"Slab:", 0),
+    )
 
-    formatted_percentages = "\n"
 
-    # For each core, colorize the percentage and add it to the string
-    for core_index, core_percentage in enumerate(percentages):
-        formatted_percentage = get_color_formatted_string(palette, core_percentage)
-        separator = " | " if core_index < len(percentages) - 1 else ""
-        formatted_percentages += f"Core {core_index + 1}: {formatted_percentage} % {separator}"
+def get_mem_data() -> MemoryData:
+    """
+    Return information about the memory usage, all sampled at the same instant.
+
+    On Linux, `/proc/meminfo` is read exactly once. Elsewhere, psutil is asked once for memory and once for swap.
 
-    return formatted_percentages
+    :return: A MemoryData with total, available, and used memory, the percentage used, swap usage, and
+             (on Linux) buffers, cached, shared, and slab memory.
+    """
+    if sys.platform == "linux":
+        return _read_meminfo()
+
+    memory = virtual_memory()
+    swap = swap_memory()
+
+    return MemoryData(
+        total=memory.total,
+        available=memory.available,
+        used=memory.used,
+        percent=memory.percent,
+        swap_total=swap.total,
+        swap_used=swap.used,
+        swap_percent=swap.percent,
+    )
+
+
+"""
+DRIVE UTILITIES
+"""
 
 
-def update_CPU_static(cpu_data: dict[str, int | float | list[float] | None], palette: dict[str, str]) -> str:
+def parse_mountinfo(text: str) -> dict[str, str]:
     """
-    Generates a string of updated CPU data to update the CPU Screen Static with
+    Find the device of every mount in a mount table, as `/proc/self/mountinfo` lists it. Reading the device from
+    the table, rather than from `os.stat`, means a hung mount can't hang the caller
 
-    :param cpu_data: The updated CPU data
-    :param palette: The palette to use for the current theme
-    :return: The string of updated CPU data
+    :param text: The contents of the mount table
+    :return: The device ID (`major:minor`) of every mountpoint. If a mountpoint was mounted over, the latest mount
+    """
+    devices = {}
+    for line in text.splitlines():
+        fields = line.split(" ", 5)
+        if len(fields) < 5:
+            continue
+        # Spaces, tabs, newlines, and backslashes in mountpoints are escaped in octal
+        mountpoint = re.sub(r"\\([0-7]{3})", lambda match: chr(int(match[1], 8)), fields[4])
+        devices[mountpoint] = fields[2]
+    return devices
+
+
+def dedupe_partitions(partitions: Iterable[Any], devices: dict[str, str]) -> list[Any]:
     """
+    Keep one partition per filesystem, out of bind mounts (e.g. of volumes into containers) that share a device
 
-    # Get updated CPU data
-    cores = cpu_data["cores"]
-    overall = cast(float, cpu_data["overall"])
-    individual = display_percentages_CPU(cast(list[float], cpu_data["individual"]), palette)  # Colorize the percentages
+    :param partitions: The partitions, as `disk_partitions` returns them
+    :param devices: The device ID of every mountpoint, as `parse_mountinfo` returns them
+    :return: The first partition of every device, in order. Partitions of unknown devices are all kept
+    """
+    seen = set()
+    unique = []
+    for partition in partitions:
+        device = devices.get(partition.mountpoint)
+        if device is not None:
+            if device in seen:
+                continue
+            seen.add(device)
+        unique.append(partition)
+    return unique
+
+
+class MountTable:
+    """
+    The partitions to show, only listed again when something is mounted or unmounted.
 
-    # Return the string to update the relevant Static with
-    return f"Cores: {cores}\n\nOverall: {get_color_formatted_string(palette, overall)} %\n\nPer Core: {individual}\n\n"
+    On Linux, the kernel flags `/proc/self/mountinfo` as ready whenever the mount table changes, so checking for
+    changes is a single non-blocking `poll`. Other files (e.g. in tests) are compared with their previous contents.
+    Platforms without a mount table to watch list partitions every time.
+    """
 
+    def __init__(self, path: str = MOUNTINFO_PATH) -> None:
+        """
+        :param path: The mount table to watch
+        """
+        self.partitions: list[Any] = []
+        self.contents: bytes | None = None
+        self.poller: Any = None
+        try:
+            self.file: BinaryIO | None = open(path, "rb")  # noqa: SIM115
+        except OSError:
+            self.file = None
+            return
+
+        if hasattr(select, "poll") and path.startswith("/proc/"):
+            self.poller = select.poll()
+            self.poller.register(self.file, select.POLLPRI | select.POLLERR)
+
+    def __del__(self) -> None:
+        """
+        Close the mount table
+        """
+        if self.file is not None:
+            self.file.close()
+
+    def get(self) -> list[Any]:
+        """
+        Get every partition, with only one partition per device (see `dedupe_partitions`)
+
+        :return: The partitions, as `disk_partitions` returns them
+        """
+        if self.file is None:
+            return disk_partitions()
+
+        # Nothing was mounted or unmounted since the table was last read
+        if self.contents is not None and self.poller is not None and not self.poller.poll(0):
+            return self.partitions
+
+        # Reading the table from the start also clears the flag the kernel raised
+        self.file.seek(0)
+        contents = self.file.read()
+        if contents != self.contents:
+            self.contents = contents
+            self.partitions = dedupe_partitions(disk_partitions(), parse_mountinfo(contents.decode(errors="replace")))
+        return self.partitions
+
+
+def _usage(stats: Any) -> dict[str, int | float]:
+    """
+    Pick what is shown of the usage of a mount
 
-"""
-MEMORY UTILITIES
-"""
+    :param stats: The usage, as `disk_usage` returns it
+    :return: The total, used, and free space, and how full the mount is
+    """
+    return {"total": stats.total, "used": stats.used, "free": stats.free, "percent": stats.percent}
 
 
-def get_mem_data() -> dict[str, int | float]:
+class ProbeResult(NamedTuple):
     """
-    Return a dictionary containing information about the memory usage.
+    The usage of one mount, as probed by a `DiskProber`
+    """
+
+    usage: dict[str, int | float] | None
+    unresponsive: bool = False
 
-    :return: A dictionary with keys 'total', 'available', 'used', and 'percent'
-              representing total memory, available memory, used memory, and percentage used.
+
+class DiskProber:
+    """
+    Probes the usage of many mounts at once, on a bounded pool of threads, so that a hung mount (e.g. NFS or FUSE)
+    only holds up itself.
+
+    A mount whose probe takes longer than the deadline is marked unresponsive, and isn't probed again until its
+    probe returns and its backoff runs out. Threads stuck on such a probe don't count towards the pool, so another
+    thread is started in their place. Mounts that were still waiting for a thread by the deadline keep their last
+    usage, and are probed again next time. Threads are daemons, so that a probe that never returns doesn't keep
+    the app from exiting.
     """
-    return {
-        "total": virtual_memory().total,
-        "available": virtual_memory().available,
-        "used": virtual_memory().used,
-        "percent": virtual_memory().percent,
-    }
+
+    def __init__(
+        self,
+        workers: int = PROBE_WORKERS,
+        deadline: float = PROBE_DEADLINE,
+        backoff: float = PROBE_BACKOFF,
+    ) -> None:
+        """
+        :param workers: How many mounts to probe at once
+        :param deadline: How long a probe may take, in seconds
+        :param backoff: How long to wait before probing an unresponsive mount again, at first, in seconds
+        """
+        self.workers = workers
+        self.deadline = deadline
+        self.backoff = backoff
+        self.jobs: SimpleQueue[tuple[str, Future[Any]]] = SimpleQueue()
+        self.threads: list[Thread] = []
+
+        # Probes that haven't returned yet, when to probe unresponsive mounts again, and for how long they backed off
+        self.running: dict[str, Future[Any]] = {}
+        self.retry_at: dict[str, float] = {}
+        self.delays: dict[str, float] = {}
+
+        # The latest usage of every mount, to show while it is probed again
+        self.known: dict[str, dict[str, int | float] | None] = {}
+
+    def _work(self) -> None:
+        """
+        Probe mounts from the queue, forever
+        """
+        while True:
+            mountpoint, future = self.jobs.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                usage = disk_usage(mountpoint)
+            except OSError as error:
+                future.set_exception(error)
+            else:
+                future.set_result(usage)
+
+    def _submit(self, mountpoint: str) -> Future[Any]:
+        """
+        Queue a mount up to be probed, starting another thread if there aren't enough yet
+
+        :param mountpoint: The mount to probe
+        :return: The future usage of the mount
+        """
+        future: Future[Any] = Future()
+        self.jobs.put((mountpoint, future))
+        self.running[mountpoint] = future
+        self._grow()
+        return future
+
+    def _grow(self) -> None:
+        """
+        Start threads until there are `workers` of them, not counting the threads stuck on an unresponsive mount, so
+        that hung mounts can't take the whole pool and leave healthy mounts waiting in the queue
+        """
+        stuck = sum(1 for mountpoint, future in self.running.items() if mountpoint in self.delays and future.running())
+        while len(self.threads) < self.workers + stuck:
+            thread = Thread(target=self._work, name=f"tsm-disk-probe-{len(self.threads)}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def probe(
+        self,
+        mountpoints: Sequence[str],
+        progress: Callable[[dict[str, ProbeResult]], None] | None = None,
+    ) -> dict[str, ProbeResult]:
+        """
+        Probe the usage of every mount, waiting at most for the deadline
+
+        :param mountpoints: The mounts to probe
+        :param progress: Called with the usage of every mount every now and then while probing, for the mounts that
+            were probed so far. Mounts still being probed have their previous usage
+        :return: The usage of every mount. Mounts that couldn't be probed (e.g. for lack of permission) have no usage
+        """
+        now = monotonic()
+        results: dict[str, ProbeResult] = {}
+        futures: dict[Future[Any], str] = {}
+        for mountpoint in dict.fromkeys(mountpoints):
+            # Don't pile probes up behind one that is still stuck, or probe a mount that is backing off
+            running = self.running.get(mountpoint)
+            if (running is not None and not running.done()) or now < self.retry_at.get(mountpoint, 0.0):
+                results[mountpoint] = ProbeResult(None, unresponsive=True)
+            else:
+                futures[self._submit(mountpoint)] = mountpoint
+
+        deadline = now + self.deadline
+        last_progress = now
+        pending = set(futures)
+        while pending and (timeout := deadline - monotonic()) > 0:
+            done, pending = wait(pending, timeout=min(timeout, PROBE_PROGRESS_INTERVAL), return_when=FIRST_COMPLETED)
+            for future in done:
+                mountpoint = futures[future]
+                self.running.pop(mountpoint, None)
+                self.retry_at.pop(mountpoint, None)
+                self.delays.pop(mountpoint, None)
+                usage = None if future.exception() is not None else _usage(future.result())
+                self.known[mountpoint] = usage
+                results[mountpoint] = ProbeResult(usage)
+
+            if progress is not None and pending and monotonic() - last_progress >= PROBE_PROGRESS_INTERVAL:
+                last_progress = monotonic()
+                progress(
+                    {
+                        mountpoint: results.get(mountpoint) or ProbeResult(self.known.get(mountpoint))
+                        for mountpoint in mountpoints
+                    }
+                )
+
+        # Back off from mounts that didn't make the deadline. Probes that were still queued (behind hung ones) say
+        # nothing about their mount, so they are called off, the mount keeps its last usage, and it is probed again
+        # next time
+        for future in pending:
+            mountpoint = futures[future]
+            if future.cancel():
+                self.running.pop(mountpoint, None)
+                results[mountpoint] = ProbeResult(self.known.get(mountpoint))
+                continue
+            results[mountpoint] = ProbeResult(None, unresponsive=True)
+            delay = min(self.delays.get(mountpoint, self.backoff / 2) * 2, PROBE_MAX_BACKOFF)
+            self.delays[mountpoint] = delay
+            self.retry_at[mountpoint] = now + delay
+        if pending:
+            self._grow()
+
+        # Forget mounts that are gone
+        for gone in self.known.keys() - set(mountpoints):
+            del self.known[gone]
+
+        return {mountpoint: results[mountpoint] for mountpoint in mountpoints}
+
+
+def get_disk_data(
+    prober: DiskProber | None = None,
+    progress: Callable[[list[dict[str, Any]]], None] | None = None,
+    mounts: MountTable | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Get every disk partition along with its current usage.
+
+    CD drives have no usage to report, so their 'usage' is None. Neither do mounts that couldn't be probed, and
+    mounts that are `unresponsive`.
+
+    :param prober: What to probe the usage of every mount with. If None, mounts are probed one after the other
+        (and a hung mount hangs the caller)
+    :param progress: Called with the partitions probed so far every now and then while probing (see `DiskProber`)
+    :param mounts: Where to get partitions from, so that they are only listed again when they change. If None,
+        partitions are listed every time
+    :return: A list of dictionaries with keys 'device', 'mountpoint', 'fstype', 'opts', 'usage', and 'unresponsive'
+    """
+    partitions = disk_partitions() if mounts is None else mounts.get()
+    mountpoints = [item.mountpoint for item in partitions if item.opts != "cdrom"]
+
+    def _disks(results: dict[str, ProbeResult]) -> list[dict[str, Any]]:
+        """
+        Put every partition together with its usage
+        """
+        return [
+            {
+                "device": item.device,
+                "mountpoint": item.mountpoint,
+                "fstype": item.fstype,
+                "opts": item.opts,
+                "usage": results[item.mountpoint].usage if item.mountpoint in results else None,
+                "unresponsive": item.mountpoint in results and results[item.mountpoint].unresponsive,
+            }
+            for item in partitions
+        ]
+
+    if prober is None:
+        return _disks({mountpoint: ProbeResult(_usage(disk_usage(mountpoint))) for mountpoint in mountpoints})
+
+    return _disks(prober.probe(mountpoints, None if progress is None else lambda results: progress(_disks(results))))
+
+
+@lru_cache(maxsize=1024)
+def is_partition(name: str) -> bool:
+    """
+    Work out whether a block device is a partition of another, so that IO isn't counted twice when adding it up.
+
+    On Linux, sysfs lists whole disks (and device-mapper and RAID devices) in `/sys/block`, but not their
+    partitions. Elsewhere, IO counters are only kept for whole disks.
+
+    :param name: The name of the block device (e.g. `sda1`)
+    :return: Whether the device is a partition
+    """
+    return os.path.isdir(BLOCK_SYSFS_PATH) and not os.path.exists(os.path.join(BLOCK_SYSFS_PATH, name))
+
+
+@lru_cache(maxsize=1024)
+def is_virtual(name: str) -> bool:
+    """
+    Work out whether a block device is virtual (device-mapper, RAID, loop, zram, ...), so that IO isn't counted twice
+    when adding it up: the IO of LVM volumes, RAID arrays, and dm-crypt devices is counted again on the physical disks
+    under them.
+
+    On Linux, every physical disk in `/sys/block` links to its `device`, and virtual devices don't. Elsewhere, IO
+    counters are only kept for physical disks.
+
+    :param name: The name of the block device (e.g. `dm-0`)
+    :return: Whether the device is virtual
+    """
+    path = os.path.join(BLOCK_SYSFS_PATH, name)
+    return os.path.isdir(path) and not os.path.exists(os.path.join(path, "device"))
+
+
+@lru_cache(maxsize=1024)
+def io_device(device: str) -> str:
+    """
+    Work out which block device keeps the IO counters of a partition, following links like `/dev/mapper/root`
+
+    :param device: The device of the partition, as `disk_partitions` lists it (e.g. `/dev/sda1`)
+    :return: The name of the block device, as `get_disk_io_stats` lists it (e.g. `sda1`)
+    """
+    if not device.startswith("/dev/"):
+        return device
+    return os.path.basename(os.path.realpath(device))
+
+
+def get_disk_io_stats() -> list[dict[str, Any]]:
+    """
+    Get the IO counters of every block device, in the order the platform lists them.
+
+    Besides the IOs and bytes read and written, the time spent reading and writing (`read_time`, `write_time`) and
+    busy (`busy_time`) is counted, in ms. Platforms that don't count the time devices were busy have a `busy_time`
+    of None. psutil doesn't read how long IOs spent queued, so there is no `weighted_time` (see `ProcFSProvider`).
+
+    :return: A list of dictionaries, each containing the IO counters of a single device, and whether it is a partition
+        or a virtual device
+    """
+    return [
+        {
+            "device": name,
+            "partition": is_partition(name),
+            "virtual": is_virtual(name),
+            "read_count": stats.read_count,
+            "write_count": stats.write_count,
+            "read_bytes": stats.read_bytes,
+            "write_bytes": stats.write_bytes,
+            "read_time": stats.read_time,
+            "write_time": stats.write_time,
+            "busy_time": getattr(stats, "busy_time", None),
+        }
+        for name, stats in (disk_io_counters(perdisk=True) or {}).items()
+    ]
 
 
 """
@@ -314,6 +850,116 @@ def get_non_zero_procs(procs: Iterator[Process]) -> Iterator[Process]:
             yield process
 
 
+# The keys processes can be ranked by, mapped to how they are labelled
+PROCESS_SORT_KEYS: dict[str, str] = {
+    "cpu_percent": "CPU Load",
+    "rss": "Memory",
+    "io_rate": "IO",
+    "num_threads": "Threads",
+    "num_fds": "Open Files",
+}
+
+
+def get_process_data(sort_key: str = "cpu_percent") -> list[dict[str, str | int | float | None]]:
+    """
+    Get the info for every running process with a non-zero PID, in the order `process_iter` yields them.
+
+    IO counters and open file descriptors are comparatively expensive to read, so they are only read when
+    processes are ranked by them. Otherwise, 'io_bytes' and 'num_fds' are None.
+
+    :param sort_key: The key processes are currently ranked by (see `PROCESS_SORT_KEYS`)
+    :return: A list of dictionaries with keys 'pid', 'name', 'username', 'exe', 'cpu_percent', 'rss',
+        'num_threads', 'io_bytes' (bytes read and written over the lifetime of the process), 'num_fds',
+        and 'create_time'
+    """
+    attrs = ["pid", "name", "username", "exe", "cpu_percent", "memory_info", "num_threads", "create_time"]
+    if sort_key == "io_rate":
+        attrs.append("io_counters")
+    if sort_key == "num_fds" and sys.platform != "win32":
+        attrs.append("num_fds")
+
+    rows = []
+    for process in get_non_zero_procs(process_iter(attrs)):
+        info = process.info
+        memory_info = info.pop("memory_info")
+        io_counters = info.pop("io_counters", None)
+        info["rss"] = memory_info.rss if memory_info is not None else None
+        info["io_bytes"] = io_counters.read_bytes + io_counters.write_bytes if io_counters is not None else None
+        info.setdefault("num_fds", None)
+        rows.append(info)
+    return rows
+
+
+class ProcessSampler:
+    """
+    Samples processes with `get_process_data`, adding the IO rate of each process since the previous sample.
+    """
+
+    def __init__(self) -> None:
+        # Bytes read and written per process at the previous sample, and when that sample was taken
+        self.io_bytes: dict[tuple[int, float], int] = {}
+        self.last_sample = monotonic()
+
+    def sample(self, sort_key: str = "cpu_percent") -> list[dict[str, str | int | float | None]]:
+        """
+        Get the info for every running process, as `get_process_data` does
+
+        :param sort_key: The key processes are currently ranked by (see `PROCESS_SORT_KEYS`)
+        :return: The same dictionaries as `get_process_data`, except that 'io_bytes' and 'create_time' are replaced
+            by 'io_rate': the bytes read and written per second since the previous sample, or None when IO
+            counters were not read
+        """
+        now = monotonic()
+        elapsed = now - self.last_sample
+        self.last_sample = now
+
+        rows = get_process_data(sort_key)
+        io_bytes: dict[tuple[int, float], int] = {}
+        for row in rows:
+            current = cast(int | None, row.pop("io_bytes"))
+            create_time = cast(float, row.pop("create_time"))
+            row["io_rate"] = None
+            if current is None:
+                continue
+
+            # A process seen for the first time has nothing to compare against, like with CPU load
+            key = (cast(int, row["pid"]), create_time)
+            previous = self.io_bytes.get(key, current)
+            row["io_rate"] = (current - previous) / elapsed if elapsed > 0 else 0.0
+            io_bytes[key] = current
+
+        # Only keep what belongs to processes that are still running
+        self.io_bytes = io_bytes
+        return rows
+
+
+def rank_processes(
+    procs: Iterable[dict[str, Any]], sort_key: str = "cpu_percent", limit: int | None = None
+) -> list[dict[str, Any]]:
+    """
+    Rank processes from highest to lowest by `sort_key`.
+
+    When only the top few are wanted, a bounded heap is used rather than sorting every process, which takes
+    O(n log k) rather than O(n log n). Processes for which `sort_key` couldn't be read come last.
+
+    :param procs: The processes to rank
+    :param sort_key: The key to rank processes by (see `PROCESS_SORT_KEYS`)
+    :param limit: How many processes to keep, or None to keep them all
+    :return: The (top `limit`) processes, ranked
+    """
+
+    def _key(proc: dict[str, Any]) -> float:
+        """
+        Get the value to rank a process by, treating unreadable values as lower than any real one
+        """
+        value = proc[sort_key]
+        return -1 if value is None else value
+
+    if limit is None:
+        return sorted(procs, key=_key, reverse=True)
+    return heapq.nlargest(limit, procs, key=_key)
+
+
 """
 COLOR UTILITIES
 """
@@ -508,17 +1154,3 @@ def get_palette(name: str) -> dict[str, str]:
     :return dict[str, str]: The color pallette as a dict.
     """
     return COLOR_MAP.get(name, COLOR_MAP["textual-dark"])
-
-
-def get_color_formatted_string(palette: dict[str, str], num: int | float) -> str:
-    """
-    Produces a string like "[color]text[/]", based on the given theme and number.
-
-    :param palette: The color palette to select a color based on.
-    :param num: The number to turn into a formatted color string.
-
-    :return str: The color-formatted string.
-    """
-    _, color_pre = compute_percentage_color(num)
-    color_post = palette[color_pre]
-    return f"[bold {color_post}]{num}[/]"
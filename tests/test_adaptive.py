@@ -0,0 +1,122 @@
+from types import SimpleNamespace
+
+import pytest
+
+from textual_system_monitor.adaptive import (
+    BUDGET_WINDOW,
+    MAX_STRETCH,
+    MAX_THROTTLE,
+    STABLE_SAMPLES,
+    AdaptiveSchedule,
+)
+from textual_system_monitor.app import Monitor
+from textual_system_monitor.panes.cpu import CPU_Usage
+from textual_system_monitor.providers.fake import FakeProvider, constant
+
+
+class Clock:
+    """A clock that only moves when told to"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _cpu(overall: float) -> SimpleNamespace:
+    """A CPU sample with nothing but the overall load"""
+    return SimpleNamespace(overall=overall)
+
+
+async def test_stable_metrics_back_off() -> None:
+    """A metric that holds still should be sampled less and less often, until it moves again"""
+    schedule = AdaptiveSchedule()
+    schedule.observe("cpu", _cpu(10.0))
+    for _ in range(STABLE_SAMPLES):
+        schedule.observe("cpu", _cpu(10.5))
+    assert schedule.doublings("cpu") == 1
+
+    for _ in range(STABLE_SAMPLES * (MAX_STRETCH + 1)):
+        schedule.observe("cpu", _cpu(10.0))
+    assert schedule.doublings("cpu") == MAX_STRETCH
+    assert schedule.doublings("mem") == 0
+
+    schedule.observe("cpu", _cpu(50.0))
+    assert schedule.doublings("cpu") == 0
+
+
+async def test_rates_move_relative_to_their_level() -> None:
+    """Network rates should count as moving when they change by a good fraction, not by a few bytes"""
+    schedule = AdaptiveSchedule()
+    busy = [{"bytes_recv_rate": 1_000_000.0, "bytes_sent_rate": 0.0}]
+    busier = [{"bytes_recv_rate": 1_100_000.0, "bytes_sent_rate": 0.0}]
+    for stats in (busy, busier, busy, busier):
+        schedule.observe("network", stats)
+    assert schedule.doublings("network") == 1
+
+    schedule.observe("network", [{"bytes_recv_rate": 5_000_000.0, "bytes_sent_rate": 0.0}])
+    assert schedule.doublings("network") == 0
+
+
+async def test_cpu_budget_throttles_everything() -> None:
+    """Every interval should be stretched while over budget, and relaxed again once well under it"""
+    clock, cpu_clock = Clock(), Clock()
+    schedule = AdaptiveSchedule(budget=1.0, clock=clock, cpu_clock=cpu_clock)
+
+    # 2% of one core
+    clock.now, cpu_clock.now = BUDGET_WINDOW, BUDGET_WINDOW * 0.02
+    schedule.check_budget()
+    assert schedule.usage == pytest.approx(2.0)
+    assert schedule.doublings("gpu") == schedule.doublings("cpu") == 1
+
+    # Within the window, nothing is measured
+    cpu_clock.now += 1.0
+    clock.now += 1.0
+    schedule.check_budget()
+    assert schedule.throttle == 1
+
+    # 0.1% of one core
+    clock.now += BUDGET_WINDOW * 100
+    schedule.check_budget()
+    assert schedule.usage < 0.5
+    assert schedule.throttle == 0
+
+    with pytest.raises(ValueError, match="must be above 0%"):
+        AdaptiveSchedule(budget=0)
+
+
+async def test_budget_applies_to_stretched_metrics() -> None:
+    """Metrics already stretched as far as they go should still be throttled while over budget"""
+    clock, cpu_clock = Clock(), Clock()
+    schedule = AdaptiveSchedule(budget=1.0, clock=clock, cpu_clock=cpu_clock)
+    for _ in range(STABLE_SAMPLES * MAX_STRETCH + 1):
+        schedule.observe("cpu", _cpu(10.0))
+    assert schedule.doublings("cpu") == MAX_STRETCH
+
+    # 50% of one core, for longer than throttling can keep up with
+    for _ in range(MAX_THROTTLE + 2):
+        clock.now += BUDGET_WINDOW
+        cpu_clock.now += BUDGET_WINDOW * 0.5
+        schedule.check_budget()
+    assert schedule.doublings("cpu") == MAX_STRETCH + MAX_THROTTLE
+    assert schedule.doublings("mem") == MAX_THROTTLE
+
+
+async def test_idle_system_is_sampled_less() -> None:
+    """On an idle system, the collector should stretch the intervals of metrics that hold still"""
+    provider = FakeProvider(load=constant(0.0))
+    app = Monitor(provider=provider, adaptive=AdaptiveSchedule(budget=100.0))
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        collector = app.collector
+        assert app.screen.query_one(CPU_Usage).border_title == "CPU Usage - Updated every 0.2s or slower"
+
+        # Start over from a schedule that has seen nothing, without the timer getting in the way
+        collector.stop()
+        collector.adaptive = AdaptiveSchedule(budget=100.0)
+        assert collector.period("cpu") == collector.ticks_per_refresh["cpu"]
+
+        for _ in range(STABLE_SAMPLES + 1):
+            collector.publish("cpu", provider.cpu())
+        assert collector.period("cpu") == 2 * collector.ticks_per_refresh["cpu"]
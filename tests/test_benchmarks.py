@@ -0,0 +1,101 @@
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from textual.widgets import DataTable
+
+from benchmarks.collectors import run_collectors
+from benchmarks.render import _run_screens, synthetic_samples
+from benchmarks.runner import Sizes, compare, make_report
+from textual_system_monitor.app import Monitor
+from textual_system_monitor.collector import Collector
+from textual_system_monitor.providers.fake import FakeProvider
+from textual_system_monitor.utilities import rank_processes
+
+TINY = Sizes(processes=20, cores=4, interfaces=3, mounts=3)
+SMALL = Sizes(processes=500, cores=16, interfaces=50, mounts=20)
+
+
+def _report(**timings: float) -> dict:
+    """Make a report where every benchmark took the given time"""
+    results = {name: {"runs": 1, "min": took, "median": took, "mean": took} for name, took in timings.items()}
+    return make_report(results, TINY)
+
+
+async def test_compare_finds_regressions() -> None:
+    """Only benchmarks that got slower than the threshold allows, and are in both reports, should regress"""
+    baseline = _report(fast=1.0, slow=1.0, gone=1.0)
+    current = _report(fast=1.1, slow=2.0, new=5.0)
+
+    regressions = compare(current, baseline, threshold=1.25)
+    assert [(regression.name, regression.ratio) for regression in regressions] == [("slow", 2.0)]
+
+    baseline["sizes"] = Sizes()._asdict()
+    with pytest.raises(ValueError, match="different sizes"):
+        compare(current, baseline)
+
+
+async def test_benchmarks_run() -> None:
+    """Every collector and render path should run against a (tiny) synthetic system"""
+    results = run_collectors(TINY, repeat=1) | await _run_screens(TINY, repeat=1)
+
+    assert {"collect.cpu", "collect.network", "collect.disks", "collect.processes.psutil"} <= results.keys()
+    assert {"rates.network", "rates.disk_io", "rank.processes.top10"} <= results.keys()
+    assert {"render.processes_pane", "render.processes_screen", "render.network_screen"} <= results.keys()
+    assert {"render.processes_screen.unchanged", "render.network_screen.unchanged"} <= results.keys()
+    assert all(result["runs"] == 1 and result["min"] >= 0 for result in results.values())
+
+
+async def test_table_updates_stay_within_budget() -> None:
+    """
+    Re-rendering a table should only touch the cells that changed, measure at most one cell per column, and only
+    remove as many rows as the table shrank by. Re-rendering the same sample shouldn't touch the table at all
+    """
+    samples = synthetic_samples(SMALL)
+    ranked = [tuple(rank_processes(sample, "cpu_percent")) for sample in samples["processes"]]
+
+    with patch.object(Collector, "start", lambda _self: None):
+        app = Monitor(provider=FakeProvider())
+        async with app.run_test(size=(200, 60)) as pilot:
+            for name, method, (first, second) in (
+                ("processes", "watch_processes", ranked),
+                ("network", "watch_io", samples["network"]),
+            ):
+                await app.switch_screen(name)
+                await pilot.pause()
+                table: DataTable[Any] = app.screen.query_one(DataTable)
+                render = getattr(app.screen, method)
+                render(first)
+                await pilot.pause()
+                before = {str(table.get_row_at(row)[0]): table.get_row_at(row) for row in range(table.row_count)}
+
+                with (
+                    patch.object(table, "update_cell", wraps=table.update_cell) as mock_update,
+                    patch.object(table, "remove_row", wraps=table.remove_row) as mock_remove,
+                ):
+                    render(second)
+                    after = {str(table.get_row_at(row)[0]): table.get_row_at(row) for row in range(table.row_count)}
+
+                    # Rows that stayed only have their changed cells updated, and each new row at most all of its cells
+                    changed = sum(
+                        sum(old != new for old, new in zip(before[key], cells, strict=True))
+                        if key in before
+                        else len(cells)
+                        for key, cells in after.items()
+                    )
+                    assert mock_update.call_count <= changed
+                    measured = [call for call in mock_update.call_args_list if call.kwargs["update_width"]]
+                    assert len(measured) <= len(table.columns)
+                    assert mock_remove.call_count == max(0, len(before) - len(after))
+
+                with (
+                    patch.object(table, "update_cell") as mock_update,
+                    patch.object(table, "add_row") as mock_add,
+                    patch.object(table, "remove_row") as mock_remove,
+                    patch.object(table, "sort") as mock_sort,
+                ):
+                    render(second)
+                mock_update.assert_not_called()
+                mock_add.assert_not_called()
+                mock_remove.assert_not_called()
+                mock_sort.assert_not_called()
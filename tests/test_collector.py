@@ -0,0 +1,176 @@
+from threading import Event
+from typing import cast
+from unittest.mock import Mock, patch
+
+from textual_system_monitor.app import Monitor
+from textual_system_monitor.panes.cpu import CPU_Usage
+from textual_system_monitor.providers.fake import FakeProvider
+from textual_system_monitor.providers.psutil_provider import PsutilProvider
+from textual_system_monitor.recording import Recorder
+from textual_system_monitor.screens.cpu_screen import CPU_Screen
+from textual_system_monitor.utilities import CPUData, get_process_data
+
+
+async def test_pane_and_screen_share_samples() -> None:
+    """
+    The CPU pane and the CPU Screen should render the exact same sample, taken once by the app's collector. The pane
+    is hidden behind the CPU Screen, so it only renders the sample once it is back in front
+    """
+    app = Monitor()
+    async with app.run_test() as pilot:
+        cpu_pane = app.screen.query_one(CPU_Usage)
+        await pilot.press("c")
+        await pilot.pause()
+        cpu_screen = cast(CPU_Screen, app.screen)
+
+        # Publish a sample by hand, so that no newer sample can be published while checking
+        app.collector.stop()
+        sample = CPUData(2, 12.5, (10.0, 15.0))
+        app.collector.publish("cpu", sample)
+        await pilot.pause()
+
+        assert app.snapshot.cpu is sample
+        assert cpu_screen.cpu_data is sample
+        assert cpu_pane.cpu_data is not sample
+
+        await pilot.press("c")
+        await pilot.pause()
+        assert cpu_pane.cpu_data is sample
+
+
+async def test_processes_sampled_once_per_tick() -> None:
+    """
+    Opening the Processes Screen should not walk the process table again on top of the Processes pane
+    """
+    with patch("textual_system_monitor.utilities.get_process_data", wraps=get_process_data) as mock_get:
+        app = Monitor(provider=PsutilProvider())
+        async with app.run_test() as pilot:
+            await pilot.press("p")
+            await pilot.pause()
+            assert mock_get.call_count == 1
+
+
+async def test_one_sample_in_flight_per_metric() -> None:
+    """
+    While a slow sample is still running in its thread, further ticks for that metric should be skipped
+    """
+    release = Event()
+
+    def _slow_processes() -> tuple[()]:
+        release.wait(5)
+        return ()
+
+    app = Monitor()
+    async with app.run_test() as pilot:
+        # Collection starts once the first frame has been painted
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        app.collector.collectors["processes"] = _slow_processes
+
+        app.collector.sample("processes")
+        app.collector.sample("processes")
+        assert [metric for metric, _ in app.collector.in_flight.values()] == ["processes"]
+
+        # The UI keeps responding while the sample is in flight
+        await pilot.press("c")
+        await pilot.pause()
+        assert type(app.screen) is CPU_Screen
+
+        release.set()
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+        assert app.snapshot.processes == ()
+        assert not app.collector.in_flight
+
+
+async def test_hidden_metrics_are_not_sampled() -> None:
+    """
+    Metrics that only hidden widgets subscribe to shouldn't be sampled, until one of them comes to the front again
+    """
+    app = Monitor(provider=FakeProvider())
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        await app.switch_screen("processes")
+        await pilot.pause()
+
+        collector = app.collector
+        assert collector.wanted("processes")
+        assert not collector.wanted("cpu")
+
+        published = collector.published["cpu"]
+        collector.sample("cpu")
+        assert "cpu" in collector.skipped
+        assert not collector.in_flight
+
+        # Back on the Main Screen, the CPU is sampled straight away rather than on its next tick
+        await app.switch_screen("main")
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+        assert "cpu" not in collector.skipped
+        assert collector.published["cpu"] > published
+
+        # Every metric is sampled while recording, whatever is on screen
+        await app.switch_screen("guide")
+        await pilot.pause()
+        assert not collector.wanted("cpu")
+        collector.recorder = Mock(spec=Recorder)
+        assert collector.wanted("cpu")
+        collector.recorder = None
+
+
+async def test_refreshes_share_one_tick() -> None:
+    """
+    Every metric should be sampled on the same timer, each after as many ticks as its interval
+    """
+    app = Monitor(provider=FakeProvider(), intervals={"cpu": 0.5})
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        collector = app.collector
+        collector.stop()
+        collector.ticks = 0
+
+        with patch.object(collector, "sample") as sample:
+            for _ in range(50):
+                collector.tick()
+        counts = dict.fromkeys(collector.intervals, 0)
+        for call in sample.call_args_list:
+            counts[call.args[0]] += 1
+
+        # 50 ticks of 0.1s
+        assert counts == {
+            "cpu": 10,
+            "mem": 25,
+            "network": 5,
+            "disks": 0,
+            "disk_io": 5,
+            "processes": 1,
+            "gpu": 0,
+            "instruments": 0,
+        }
+
+
+async def test_samples_are_published_together() -> None:
+    """
+    Samples that finish around the same time should be published as a single Snapshot
+    """
+    app = Monitor(provider=FakeProvider())
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+        collector = app.collector
+        assert collector.timer is not None
+        collector.timer.stop()
+
+        with patch.object(collector, "publish_all", wraps=collector.publish_all) as publish_all:
+            collector.sample("cpu")
+            collector.sample("mem")
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+
+        publish_all.assert_called_once()
+        assert set(publish_all.call_args.args[0]) == {"cpu", "mem"}
+        assert not collector.staged
@@ -0,0 +1,93 @@
+from typing import Any
+
+import pytest
+
+from textual_system_monitor.app import Monitor
+from textual_system_monitor.cli import build_parser
+from textual_system_monitor.collector import DEFAULT_INTERVALS, base_tick
+from textual_system_monitor.config import REFRESH_NAMES, load_intervals, parse_interval
+from textual_system_monitor.panes.cpu import CPU_Usage
+from textual_system_monitor.providers.fake import FakeProvider
+
+
+async def test_every_interval_is_configurable() -> None:
+    """Everything the collector refreshes should be configurable, and nothing else"""
+    assert set(REFRESH_NAMES) == set(DEFAULT_INTERVALS)
+
+
+async def test_parse_interval() -> None:
+    """Intervals should be given as NAME=SECONDS, for something that can be refreshed, often enough to tick"""
+    assert parse_interval("cpu=0.5") == ("cpu", 0.5)
+    assert parse_interval(" disks = 30") == ("disks", 30.0)
+    for text, error in (
+        ("cpu", "Expected NAME=SECONDS"),
+        ("cpu=fast", "Expected a number"),
+        ("temperature=1", "Unknown refresh intervals: temperature"),
+        ("cpu=0.01", "must be at least"),
+    ):
+        with pytest.raises(ValueError, match=error):
+            parse_interval(text)
+
+
+async def test_refresh_on_the_command_line() -> None:
+    """`--refresh` should be repeatable, and invalid intervals rejected by argparse"""
+    args = build_parser().parse_args(["--refresh", "cpu=0.5", "--refresh", "gpu=30"])
+    assert args.refresh == [("cpu", 0.5), ("gpu", 30.0)]
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(["--refresh", "cpu=0"])
+
+
+async def test_load_intervals(tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Intervals should be read from the [refresh] table, with the command line taking precedence"""
+    path = tmp_path / "config.toml"
+    path.write_text("[refresh]\ncpu = 0.5\ndisks = 30\n")
+    assert load_intervals(str(path), [("cpu", 1.0)]) == {"cpu": 1.0, "disks": 30.0}
+
+    path.write_text("[refresh]\ncpu = 'fast'\n")
+    with pytest.raises(ValueError, match="must be at least"):
+        load_intervals(str(path))
+    path.write_text("refresh = 1\n")
+    with pytest.raises(TypeError, match="must be a table"):
+        load_intervals(str(path))
+    path.write_text("[refresh\n")
+    with pytest.raises(ValueError, match="Invalid config file"):
+        load_intervals(str(path))
+
+    # Without a config file, only the command line counts, unless a missing file was asked for
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "nowhere"))
+    assert load_intervals(overrides=[("gpu", 5.0)]) == {"gpu": 5.0}
+    with pytest.raises(FileNotFoundError):
+        load_intervals(str(tmp_path / "missing.toml"))
+
+
+async def test_base_tick() -> None:
+    """The tick should be the longest one that every interval is a whole number of"""
+    assert base_tick(DEFAULT_INTERVALS.values()) == pytest.approx(0.2)
+    assert base_tick([0.5, 0.2, 1, 10]) == pytest.approx(0.1)
+    assert base_tick([0.25, 3]) == pytest.approx(0.25)
+
+    # Intervals that only share a tick shorter than `MIN_TICK` run on the shortest one instead
+    assert base_tick([0.35, 1, 3, 10, 1, 10]) == pytest.approx(0.35)
+    assert base_tick([0.05, 0.2]) == pytest.approx(0.05)
+
+
+async def test_unaligned_intervals_are_rounded() -> None:
+    """Intervals that aren't a whole number of ticks should be rounded to one, and say so in their titles"""
+    app = Monitor(provider=FakeProvider(), intervals={"cpu": 0.35, "mem": 0.35})
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        collector = app.collector
+        assert collector.tick_seconds == pytest.approx(0.35)
+        assert collector.ticks_per_refresh["network"] == 3
+        assert collector.intervals["network"] == pytest.approx(1.05)
+        assert collector.intervals["cpu"] == pytest.approx(0.35)
+        assert app.screen.query_one(CPU_Usage).border_title == "CPU Usage - Updated every 0.35s"
+
+
+async def test_titles_show_configured_intervals() -> None:
+    """Panes should say how often they are refreshed, as configured"""
+    app = Monitor(intervals={"cpu": 0.5})
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        assert app.screen.query_one(CPU_Usage).border_title == "CPU Usage - Updated every 0.5s"
+        assert app.collector.tick_seconds == pytest.approx(0.1)
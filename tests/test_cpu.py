@@ -0,0 +1,58 @@
+from collections import namedtuple
+from unittest.mock import patch
+
+from textual_system_monitor.utilities import CPUSampler
+
+scputimes = namedtuple("scputimes", ["user", "nice", "system", "idle", "iowait", "irq", "softirq", "steal"])
+
+
+async def test_cpu_deltas() -> None:
+    """Overall, per core, and breakdown loads should all come from the same delta"""
+    first = [scputimes(100, 0, 50, 1000, 10, 0, 0, 0), scputimes(100, 0, 50, 1000, 10, 0, 0, 0)]
+    second = [scputimes(150, 0, 75, 1025, 10, 0, 0, 0), scputimes(100, 0, 50, 1090, 20, 0, 0, 0)]
+
+    with patch("textual_system_monitor.utilities.cpu_times", side_effect=[first, second]):
+        sampler = CPUSampler()
+        data = sampler.sample()
+
+    assert data.cores == 2
+    assert data.individual == (75.0, 0.0)
+    assert data.overall == 37.5
+    assert data.user == 25.0
+    assert data.system == 12.5
+    assert data.iowait == 5.0
+    assert data.steal == 0.0
+
+
+async def test_cpu_samplers_independent() -> None:
+    """Sampling with one sampler should never reset the baseline of another"""
+    first = CPUSampler()
+    second = CPUSampler()
+    baseline = second.last
+    first.sample()
+    assert second.last is baseline
+
+
+async def test_cpu_no_elapsed_time() -> None:
+    """If no time passed between samples, the load should be 0 rather than an error"""
+    times = [scputimes(100, 0, 50, 1000, 10, 0, 0, 0)]
+
+    with patch("textual_system_monitor.utilities.cpu_times", side_effect=[times, times]):
+        sampler = CPUSampler()
+        data = sampler.sample()
+
+    assert data.overall == 0.0
+    assert data.individual == (0.0,)
+
+
+async def test_cpu_core_hotplug() -> None:
+    """If the number of cores changes, the sample should not fail"""
+    one_core = [scputimes(100, 0, 50, 1000, 10, 0, 0, 0)]
+    two_cores = [*one_core, scputimes(100, 0, 50, 1000, 10, 0, 0, 0)]
+
+    with patch("textual_system_monitor.utilities.cpu_times", side_effect=[one_core, two_cores]):
+        sampler = CPUSampler()
+        data = sampler.sample()
+
+    assert data.cores == 2
+    assert data.individual == (0.0, 0.0)
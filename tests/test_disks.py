@@ -0,0 +1,339 @@
+import os
+from collections import namedtuple
+from threading import Event
+from typing import Any, cast
+from unittest.mock import patch
+
+import pytest
+from textual.widgets import DataTable
+
+from textual_system_monitor.adaptive import _disk_io
+from textual_system_monitor.app import Monitor
+from textual_system_monitor.collector import SampleProgress
+from textual_system_monitor.panes.drives import DriveUsage
+from textual_system_monitor.providers.fake import FakeProvider
+from textual_system_monitor.providers.procfs import read_diskstats
+from textual_system_monitor.rendering import disk_io_tokens, get_styles, join_tokens
+from textual_system_monitor.utilities import (
+    MOUNTINFO_PATH,
+    DiskProber,
+    MountTable,
+    get_disk_data,
+    is_partition,
+    is_virtual,
+    parse_mountinfo,
+)
+
+Partition = namedtuple("Partition", "device mountpoint fstype opts")
+Usage = namedtuple("Usage", "total used free percent")
+
+PARTITIONS = [
+    Partition("/dev/sda1", "/", "ext4", "rw"),
+    Partition("server:/share", "/mnt/nfs", "nfs", "rw"),
+    Partition("/dev/sdb1", "/mnt/locked", "ext4", "rw"),
+]
+
+
+def _hung_disk_usage(release: Event) -> Any:
+    """Make a `disk_usage` whose NFS mount hangs until released, and whose locked mount can't be read"""
+
+    def _disk_usage(mountpoint: str) -> Usage:
+        if mountpoint == "/mnt/nfs":
+            release.wait()
+        if mountpoint == "/mnt/locked":
+            raise PermissionError(mountpoint)
+        return Usage(100, 25, 75, 25.0)
+
+    return _disk_usage
+
+
+async def test_hung_mount_is_unresponsive() -> None:
+    """A hung mount should be marked unresponsive by the deadline, without holding up the others"""
+    release = Event()
+    prober = DiskProber(deadline=0.5)
+    updates: list[list[dict[str, Any]]] = []
+    try:
+        with (
+            patch("textual_system_monitor.utilities.disk_partitions", return_value=PARTITIONS),
+            patch("textual_system_monitor.utilities.disk_usage", side_effect=_hung_disk_usage(release)) as usage,
+        ):
+            disks = {disk["mountpoint"]: disk for disk in get_disk_data(prober, updates.append)}
+            assert disks["/"]["usage"] == {"total": 100, "used": 25, "free": 75, "percent": 25.0}
+            assert not disks["/"]["unresponsive"]
+            assert disks["/mnt/nfs"]["usage"] is None
+            assert disks["/mnt/nfs"]["unresponsive"]
+            assert disks["/mnt/locked"]["usage"] is None
+            assert not disks["/mnt/locked"]["unresponsive"]
+
+            # The healthy mount was handed over while the hung one was still being probed
+            assert updates
+            assert updates[0][0]["usage"] is not None
+
+            # The hung mount backs off, rather than being probed again
+            calls = usage.call_count
+            disks = {disk["mountpoint"]: disk for disk in get_disk_data(prober)}
+            assert disks["/mnt/nfs"]["unresponsive"]
+            assert usage.call_count == calls + 2
+    finally:
+        release.set()
+
+
+async def test_backoff_doubles() -> None:
+    """A mount that is still unresponsive should be left alone for twice as long each time"""
+    release = Event()
+    prober = DiskProber(deadline=0.1, backoff=1.0)
+    try:
+        with patch("textual_system_monitor.utilities.disk_usage", side_effect=_hung_disk_usage(release)):
+            assert prober.probe(["/mnt/nfs"])["/mnt/nfs"].unresponsive
+            assert prober.delays["/mnt/nfs"] == 1.0
+
+            # The stuck probe hasn't returned, so the mount isn't probed again
+            assert prober.probe(["/mnt/nfs"])["/mnt/nfs"].unresponsive
+            assert prober.delays["/mnt/nfs"] == 1.0
+
+            # It returns, the backoff runs out, and the mount hangs again
+            release.set()
+            prober.running["/mnt/nfs"].result(timeout=1)
+            release.clear()
+            prober.retry_at["/mnt/nfs"] = 0.0
+            assert prober.probe(["/mnt/nfs"])["/mnt/nfs"].unresponsive
+            assert prober.delays["/mnt/nfs"] == 2.0
+
+            # Once it answers in time, it is healthy again
+            release.set()
+            prober.running["/mnt/nfs"].result(timeout=1)
+            prober.retry_at["/mnt/nfs"] = 0.0
+            assert prober.probe(["/mnt/nfs"])["/mnt/nfs"].usage is not None
+            assert "/mnt/nfs" not in prober.delays
+    finally:
+        release.set()
+
+
+async def test_hung_mounts_dont_take_the_pool() -> None:
+    """Healthy mounts should still be probed once every thread is stuck on a hung mount"""
+    release = Event()
+    prober = DiskProber(workers=2, deadline=0.2)
+
+    def _disk_usage(mountpoint: str) -> Usage:
+        if mountpoint.startswith("/mnt/nfs"):
+            release.wait()
+        return Usage(100, 25, 75, 25.0)
+
+    try:
+        with patch("textual_system_monitor.utilities.disk_usage", side_effect=_disk_usage):
+            hung = ["/mnt/nfs0", "/mnt/nfs1"]
+            assert all(result.unresponsive for result in prober.probe(hung).values())
+
+            results = prober.probe([*hung, "/"])
+            assert results["/"].usage is not None
+
+            # The stuck threads were replaced, rather than added to every time
+            assert len(prober.threads) == 4
+    finally:
+        release.set()
+
+
+async def test_queued_mounts_are_probed_again() -> None:
+    """Mounts still queued behind a hung one at the deadline should keep their usage, and be probed next time"""
+    release = Event()
+    prober = DiskProber(workers=1, deadline=0.2)
+    try:
+        with patch("textual_system_monitor.utilities.disk_usage", side_effect=_hung_disk_usage(release)) as usage:
+            known = prober.probe(["/"])["/"].usage
+            assert known is not None
+
+            # The only thread hangs on the NFS mount, so the others never leave the queue
+            results = prober.probe(["/mnt/nfs", "/", "/mnt/data"])
+            assert results["/mnt/nfs"].unresponsive
+            assert results["/"] == (known, False)
+            assert results["/mnt/data"] == (None, False)
+            assert prober.running.keys() == {"/mnt/nfs"}
+            calls = usage.call_count
+
+            results = prober.probe(["/mnt/nfs", "/", "/mnt/data"])
+            assert results["/"].usage is not None
+            assert results["/mnt/data"].usage is not None
+            assert usage.call_count == calls + 2
+    finally:
+        release.set()
+
+
+async def test_duplicate_mountpoints_are_probed_once() -> None:
+    """A mountpoint listed twice (e.g. mounted over itself) should be probed once, and reported once"""
+    prober = DiskProber()
+    with patch("textual_system_monitor.utilities.disk_usage", return_value=Usage(100, 25, 75, 25.0)) as usage:
+        results = prober.probe(["/", "/mnt/data", "/"])
+    assert list(results) == ["/", "/mnt/data"]
+    assert results["/"].usage is not None
+    assert usage.call_count == 2
+
+
+async def test_progress_is_shown() -> None:
+    """Disks probed so far should be shown, and newer samples should win over older progress"""
+    app = Monitor()
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        collector = app.collector
+        disks = (
+            {
+                "device": "server:/share",
+                "mountpoint": "/mnt/nfs",
+                "fstype": "nfs",
+                "opts": "rw",
+                "usage": None,
+                "unresponsive": True,
+            },
+        )
+
+        collector.started["disks"] += 1
+        app.post_message(SampleProgress("disks", collector.started["disks"], disks))
+        await pilot.pause()
+        assert app.snapshot.disks is disks
+        assert "Usage: Unresponsive" in str(app.screen.query_one(DriveUsage).static.content)
+
+        collector.published["disks"] = collector.started["disks"]
+        app.post_message(SampleProgress("disks", collector.published["disks"], ()))
+        await pilot.pause()
+        assert app.snapshot.disks is disks
+
+
+MOUNTINFO = """\
+22 1 8:1 / / rw,relatime shared:1 - ext4 /dev/sda1 rw
+40 22 0:45 / /mnt/nfs rw,relatime shared:20 - nfs server:/share rw
+41 22 8:17 / /mnt/my\\040drive rw,relatime shared:21 - ext4 /dev/sdb1 rw
+42 22 8:1 /var/lib/volume /var/lib/container/volume rw,relatime shared:1 - ext4 /dev/sda1 rw
+"""
+
+
+async def test_parse_mountinfo() -> None:
+    """Every mountpoint should be mapped to its device, with escaped characters in mountpoints unescaped"""
+    assert parse_mountinfo(MOUNTINFO) == {
+        "/": "8:1",
+        "/mnt/nfs": "0:45",
+        "/mnt/my drive": "8:17",
+        "/var/lib/container/volume": "8:1",
+    }
+
+
+async def test_mount_table_only_relists_on_change(tmp_path: Any) -> None:
+    """Partitions should only be listed again when the mount table changes, and bind mounts should be left out"""
+    path = tmp_path / "mountinfo"
+    path.write_text(MOUNTINFO)
+    partitions = [*PARTITIONS, Partition("/dev/sda1", "/var/lib/container/volume", "ext4", "rw")]
+    table = MountTable(str(path))
+
+    with patch("textual_system_monitor.utilities.disk_partitions", return_value=partitions) as listed:
+        assert [partition.mountpoint for partition in table.get()] == ["/", "/mnt/nfs", "/mnt/locked"]
+        table.get()
+        assert listed.call_count == 1
+
+        path.write_text(MOUNTINFO.replace("/mnt/nfs", "/mnt/other"))
+        table.get()
+        assert listed.call_count == 2
+
+
+@pytest.mark.skipif(not os.path.exists(MOUNTINFO_PATH), reason="Needs a Linux mount table")
+async def test_mount_table_polls_proc() -> None:
+    """The kernel's mount table should only be read again once it flags a change"""
+    table = MountTable()
+    assert table.poller is not None
+    table.get()
+    with patch("textual_system_monitor.utilities.disk_partitions") as listed:
+        table.get()
+        listed.assert_not_called()
+
+
+DISKSTATS = """\
+   8       0 sda 1000 10 20000 500 2000 20 40000 1500 0 1800 2000 0 0 0 0
+   8       1 sda1 900 10 18000 450 1900 20 38000 1400 0 1700 1850
+"""
+
+
+async def test_read_diskstats(tmp_path: Any) -> None:
+    """Disk IO counters should be read from /proc/diskstats, sectors converted to bytes"""
+    path = tmp_path / "diskstats"
+    path.write_text(DISKSTATS)
+    with patch("textual_system_monitor.utilities.BLOCK_SYSFS_PATH", str(tmp_path)):
+        os.makedirs(tmp_path / "sda" / "device")
+        is_partition.cache_clear()
+        is_virtual.cache_clear()
+        try:
+            sda, sda1 = read_diskstats(str(path))
+        finally:
+            is_partition.cache_clear()
+            is_virtual.cache_clear()
+
+    assert sda == {
+        "device": "sda",
+        "partition": False,
+        "virtual": False,
+        "read_count": 1000,
+        "write_count": 2000,
+        "read_bytes": 20000 * 512,
+        "write_bytes": 40000 * 512,
+        "read_time": 500,
+        "write_time": 1500,
+        "busy_time": 1800,
+        "weighted_time": 2000,
+    }
+    assert sda1["partition"]
+
+
+async def test_disk_io_summary() -> None:
+    """The Drive Usage pane should sum up the IO of whole disks, and point out the busiest"""
+    styles = get_styles("textual-dark")
+    io = [
+        {"device": "sda", "partition": False, "read_bytes_rate": 2048.0, "write_bytes_rate": 1024.0,
+         "read_count_rate": 10.0, "write_count_rate": 5.0, "util": 12.5},
+        {"device": "sda1", "partition": True, "read_bytes_rate": 2048.0, "write_bytes_rate": 1024.0,
+         "read_count_rate": 10.0, "write_count_rate": 5.0, "util": 12.5},
+        {"device": "nvme0n1", "partition": False, "read_bytes_rate": 0.0, "write_bytes_rate": 0.0,
+         "read_count_rate": 0.0, "write_count_rate": 0.0, "util": 95.0},
+    ]  # fmt: skip
+    text = join_tokens(disk_io_tokens(io, 1024, styles))
+    assert text.plain == "I/O: Read: 2.0 KiB /s | Write: 1.0 KiB /s | IOPS: 15 | Busiest: nvme0n1 at 95.0 %\n\n"
+
+
+async def test_stacked_devices_are_counted_once(tmp_path: Any) -> None:
+    """IO that goes through device-mapper (e.g. LVM or dm-crypt) should only be counted on the disk under it"""
+    path = tmp_path / "diskstats"
+    path.write_text(DISKSTATS + " 253       0 dm-0 900 0 18000 450 1900 0 38000 1400 0 1700 1850 0 0 0 0\n")
+    os.makedirs(tmp_path / "sda" / "device")
+    os.makedirs(tmp_path / "sda" / "holders" / "dm-0")
+    os.makedirs(tmp_path / "dm-0" / "slaves" / "sda")
+    with patch("textual_system_monitor.utilities.BLOCK_SYSFS_PATH", str(tmp_path)):
+        is_partition.cache_clear()
+        is_virtual.cache_clear()
+        try:
+            stats = read_diskstats(str(path))
+        finally:
+            is_partition.cache_clear()
+            is_virtual.cache_clear()
+
+    assert [(stat["device"], stat["partition"], stat["virtual"]) for stat in stats] == [
+        ("sda", False, False),
+        ("sda1", True, False),
+        ("dm-0", False, True),
+    ]
+    rates = [dict(stat, read_bytes_rate=1024.0, write_bytes_rate=0.0, read_count_rate=1.0, write_count_rate=0.0,
+                  util=None) for stat in stats]  # fmt: skip
+    text = join_tokens(disk_io_tokens(rates, 1024, get_styles("textual-dark")))
+    assert text.plain.startswith("I/O: Read: 1.0 KiB /s | Write: 0.0 B /s | IOPS: 1")
+    assert _disk_io(rates) == 1024.0
+
+
+async def test_drive_screen_shows_io() -> None:
+    """The Drive Screen should show the IO rates of every partition's disk"""
+    app = Monitor(provider=FakeProvider(mounts=3))
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        await app.switch_screen("drive")
+        await pilot.pause()
+        app.collector.sample("disk_io")
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+
+        table = cast(DataTable[Any], app.screen.query_one("#drive-screen-table", expect_type=DataTable))
+        assert table.row_count == 3
+        assert all(str(table.get_cell(row, "queue")) != "N/A" for row in table.rows)
@@ -0,0 +1,135 @@
+import asyncio
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+from typing import Any
+from unittest.mock import patch
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from textual_system_monitor.cli import main
+from textual_system_monitor.exporter import CONTENT_TYPE, Exporter, make_handler, render_metrics
+from textual_system_monitor.providers.fake import FakeProvider
+from textual_system_monitor.utilities import CPUData, MemoryData
+
+IMPORT_CHECK = """
+import sys
+
+import textual_system_monitor.cli
+import textual_system_monitor.exporter
+
+heavy = [name for name in sys.modules if name.split(".")[0] in ("textual", "rich")]
+assert not heavy, heavy
+"""
+
+
+async def test_render_metrics() -> None:
+    """Every metric should be rendered in the Prometheus text format, with label values escaped"""
+    page = render_metrics(
+        CPUData(2, 50.0, (25.0, 75.0), user=30.0),
+        MemoryData(1000, 400, 600, 60.0, 100, 25, 25.0),
+        ({"interface": "eth0", "bytes_recv": 10, "bytes_sent": 20},),
+        (
+            {"device": "/dev/sda1", "mountpoint": "/", "fstype": "ext4", "usage": {"total": 8, "used": 2, "free": 6}},
+            {"device": "/dev/sr0", "mountpoint": "/media/cd", "fstype": "iso9660", "usage": None},
+        ),
+        (
+            {"pid": 1, "name": 'say "hi"', "cpu_percent": 5.0, "rss": 100},
+            {"pid": 2, "name": None, "cpu_percent": None, "rss": 300},
+        ),
+    ).decode()
+
+    assert "# TYPE tsm_cpu_usage_percent gauge\ntsm_cpu_usage_percent 50.0\n" in page
+    assert 'tsm_cpu_core_usage_percent{core="1"} 75.0\n' in page
+    assert 'tsm_cpu_mode_percent{mode="user"} 30.0\n' in page
+    assert "tsm_memory_usage_percent 60.0\n" in page
+    assert "# TYPE tsm_network_receive_bytes_total counter\n" in page
+    assert 'tsm_network_transmit_bytes_total{interface="eth0"} 20\n' in page
+    assert 'tsm_disk_free_bytes{device="/dev/sda1",mountpoint="/",fstype="ext4"} 6\n' in page
+    assert "/media/cd" not in page
+    assert 'tsm_process_cpu_percent{pid="1",name="say \\"hi\\""} 5.0\n' in page
+    assert 'tsm_process_cpu_percent{pid="2"' not in page
+    assert 'tsm_process_resident_memory_bytes{pid="2",name=""} 300\n' in page
+
+
+async def test_import_is_headless() -> None:
+    """Neither the exporter nor the command line should import Textual or Rich"""
+    process = await asyncio.create_subprocess_exec(sys.executable, "-c", IMPORT_CHECK, stderr=asyncio.subprocess.PIPE)
+    _, stderr = await process.communicate()
+    assert process.returncode == 0, stderr.decode()
+
+
+async def test_scrapes_share_one_collection() -> None:
+    """Concurrent scrapes should all be answered from the latest sample, without sampling the system again"""
+    collections = 0
+
+    def _collect(self: Exporter) -> None:
+        nonlocal collections
+        collections += 1
+        self.page = b"tsm_test 1\n"
+
+    with patch.object(Exporter, "collect", _collect):
+        exporter = Exporter(interval=60, provider=FakeProvider())
+        exporter.start()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(lambda: exporter.page))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+
+    def _scrape(path: str) -> tuple[str, bytes]:
+        with urlopen(url + path, timeout=5) as response:
+            return response.headers["Content-Type"], response.read()
+
+    try:
+        responses = await asyncio.gather(*(asyncio.to_thread(_scrape, "/metrics") for _ in range(20)))
+        assert responses == [(CONTENT_TYPE, b"tsm_test 1\n")] * 20
+        assert collections == 1
+
+        with pytest.raises(HTTPError, match="404"):
+            await asyncio.to_thread(_scrape, "/")
+    finally:
+        server.shutdown()
+        server.server_close()
+        exporter.stop()
+
+
+async def test_failed_samples_are_marked_stale() -> None:
+    """A failed sample should be logged and marked on the page, keeping the latest metrics, and not stop sampling"""
+    provider = FakeProvider()
+    exporter = Exporter(interval=0.01, provider=provider)
+    exporter.start()
+    try:
+        assert b"tsm_exporter_up 1\n" in exporter.page
+        assert b"tsm_cpu_usage_percent" in exporter.page
+        last_success = exporter.last_success
+
+        with patch.object(provider, "mem", side_effect=OSError("gone")):
+            exporter.collect_safely()
+            assert b"tsm_exporter_up 0\n" in exporter.page
+            assert b"tsm_cpu_usage_percent" in exporter.page
+            assert f"tsm_exporter_last_success_timestamp_seconds {last_success}\n".encode() in exporter.page
+
+            # The background thread keeps sampling through failures
+            await asyncio.sleep(0.1)
+            assert exporter.thread.is_alive()
+
+        await asyncio.sleep(0.1)
+        assert b"tsm_exporter_up 1\n" in exporter.page
+        assert exporter.last_success > last_success
+    finally:
+        exporter.stop()
+
+
+async def test_export_options(tmp_path: Any) -> None:
+    """The exporter should be profiled with --profile, and refuse --stats, which only the app can write"""
+    path = tmp_path / "export.prof"
+    with patch("textual_system_monitor.exporter.serve") as mock_serve:
+        main(["--provider", "fake", "--profile", str(path), "export", "--port", "0"])
+        assert mock_serve.call_args.args[:2] == ("127.0.0.1", 0)
+        assert path.exists()
+
+        with pytest.raises(SystemExit):
+            main(["--stats", str(tmp_path / "stats.json"), "export"])
+        assert mock_serve.call_count == 1
@@ -0,0 +1,88 @@
+import pytest
+
+from textual_system_monitor.history import HistoryStore, RingBuffer, describe_span
+from textual_system_monitor.utilities import CPUData
+
+
+async def test_ring_buffer_window() -> None:
+    """The window should hold the latest values, oldest first, across wrap-arounds"""
+    buffer = RingBuffer(4)
+    assert len(buffer) == 0
+    assert buffer.latest() is None
+    assert buffer.window().tolist() == []
+
+    for value in range(1, 11):
+        buffer.append(value)
+        expected = [float(v) for v in range(max(1, value - 3), value + 1)]
+        assert buffer.window().tolist() == expected
+        assert buffer.window(2).tolist() == expected[-2:]
+        assert buffer.latest() == value
+
+    assert len(buffer) == 4
+    assert buffer.total == 10
+    assert buffer.window(100).tolist() == [7.0, 8.0, 9.0, 10.0]
+
+
+async def test_ring_buffer_window_is_a_view() -> None:
+    """Windows should share memory with the buffer rather than copy it"""
+    buffer = RingBuffer(3)
+    buffer.append(1)
+    window = buffer.window()
+    assert window.obj is buffer.data
+
+    with pytest.raises(ValueError, match="capacity"):
+        RingBuffer(0)
+
+
+async def test_history_store() -> None:
+    """Every series should have enough capacity for the configured history, and vanished cores should be dropped"""
+    store = HistoryStore({"cpu": 0.5, "network": 1}, seconds=10)
+    store.record("cpu", CPUData(2, 50.0, (40.0, 60.0)))
+    store.record("cpu", CPUData(1, 30.0, (30.0,)))
+
+    cpu = store.get("cpu")
+    assert cpu is not None
+    assert cpu.capacity == 20
+    assert cpu.window().tolist() == [50.0, 30.0]
+    assert store.get("cpu:1") is None
+
+    store.record("network", [{"interface": "eth0", "bytes_recv_rate": 0.0, "bytes_sent_rate": 0.0}])
+    store.record("network", [{"interface": "eth0", "bytes_recv_rate": 500.0, "bytes_sent_rate": 20.0}])
+    rx = store.get("net:eth0:rx")
+    tx = store.get("net:eth0:tx")
+    assert rx is not None
+    assert tx is not None
+    assert rx.window().tolist() == [0.0, 500.0]
+    assert tx.window().tolist() == [0.0, 20.0]
+
+
+async def test_history_span() -> None:
+    """The span of a series should be the time it actually covers, however far apart its samples were taken"""
+    store = HistoryStore({"cpu": 1.0, "network": 1.0}, seconds=10)
+    assert store.span("cpu", "cpu") == 0.0
+
+    # Samples stretched to 3s apart, so 10 samples cover 27s rather than 10s
+    for second in range(0, 60, 3):
+        store.record("cpu", CPUData(1, 50.0, (50.0,)), second)
+    assert store.span("cpu", "cpu") == 27.0
+
+    # A series newer than its metric only covers its own samples
+    store.record("network", [{"interface": "eth0", "bytes_recv_rate": 0.0, "bytes_sent_rate": 0.0}], 0.0)
+    store.record("network", [{"interface": "eth0", "bytes_recv_rate": 0.0, "bytes_sent_rate": 0.0}], 5.0)
+    store.record("network", [{"interface": "eth1", "bytes_recv_rate": 0.0, "bytes_sent_rate": 0.0}], 9.0)
+    store.record("network", [{"interface": "eth1", "bytes_recv_rate": 0.0, "bytes_sent_rate": 0.0}], 10.0)
+    assert store.span("network", "net:rx") == 10.0
+    assert store.span("network", "net:eth1:rx") == 1.0
+
+    # Metrics without a history don't keep time either
+    store.record("processes", ())
+    assert "processes" not in store.times
+
+
+async def test_describe_span() -> None:
+    """Spans should be described in whole seconds, or in whole minutes from a minute up"""
+    assert describe_span(1.2) == "1 Second"
+    assert describe_span(40.4) == "40 Seconds"
+    assert describe_span(60.0) == "1 Minute"
+    assert describe_span(299.0) == "5 Minutes"
+    assert describe_span(899.4) == "15 Minutes"
@@ -0,0 +1,119 @@
+import json
+import sys
+from typing import Any
+from unittest.mock import patch
+
+from textual_system_monitor.app import Monitor, instrumented_classes
+from textual_system_monitor.instrumentation import Instruments
+from textual_system_monitor.panes.cpu import CPU_Usage
+from textual_system_monitor.panes.instruments import InstrumentsOverlay
+from textual_system_monitor.providers.fake import FakeProvider
+from textual_system_monitor.screens.cpu_screen import CPU_Screen
+
+
+class Pane:
+    """A stand-in for a pane, with one render"""
+
+    def watch_mem_data(self, data: int) -> int:
+        return data * 2
+
+
+async def test_watchers_are_only_wrapped_while_enabled() -> None:
+    """Renders should be measured while enabled, and left exactly as they were otherwise"""
+    original = Pane.__dict__["watch_mem_data"]
+    instruments = Instruments()
+    instruments.enable([Pane])
+    try:
+        assert Pane.__dict__["watch_mem_data"] is not original
+        assert Pane().watch_mem_data(21) == 42
+    finally:
+        instruments.disable()
+    assert Pane.__dict__["watch_mem_data"] is original
+
+    Pane().watch_mem_data(1)
+    timing = instruments.report()["timings"]["Pane.watch_mem_data"]
+    assert timing["count"] == 1
+    assert timing["max_wall_ms"] >= timing["mean_wall_ms"] >= 0
+
+
+async def test_screens_arent_imported_to_be_measured() -> None:
+    """Only the screens imported so far should be found, rather than importing every screen"""
+    with patch.dict(sys.modules):
+        del sys.modules[CPU_Screen.__module__]
+        classes = instrumented_classes()
+        assert CPU_Screen.__module__ not in sys.modules
+    assert CPU_Screen not in classes
+    assert CPU_Usage in classes
+    assert CPU_Screen in instrumented_classes()
+
+
+async def test_instruments_add_classes_while_enabled() -> None:
+    """Classes found after measuring started should be measured too, and each only wrapped once"""
+    instruments = Instruments()
+    instruments.enable()
+    try:
+        instruments.enable([Pane])
+        instruments.enable([Pane])
+        assert Pane().watch_mem_data(1) == 2
+    finally:
+        instruments.disable()
+    assert instruments.report()["timings"]["Pane.watch_mem_data"]["count"] == 1
+    assert not hasattr(Pane.watch_mem_data, "__wrapped__")
+
+
+async def test_tick_jitter() -> None:
+    """Ticks should be compared to how far apart they should run"""
+    instruments = Instruments()
+    for _ in range(3):
+        instruments.record_tick(0.0)
+    jitter = instruments.report()["tick_jitter"]
+    assert jitter["ticks"] == 2
+    assert jitter["max_ms"] >= jitter["mean_ms"] >= 0
+
+
+async def test_overlay_toggles_instruments() -> None:
+    """The overlay should follow the screen in front, and measuring should stop once it is hidden"""
+    app = Monitor(provider=FakeProvider())
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        assert not app.instruments.enabled
+
+        await pilot.press("i")
+        await pilot.pause()
+        assert app.instruments.enabled
+        overlay = app.screen.query_one(InstrumentsOverlay)
+        assert app.collector.tasks[overlay][0] == "instruments"
+        assert str(overlay.content).startswith(f"{'Call':<36}")
+        assert "Mean CPU (ms)" in str(overlay.content)
+
+        app.collector.sample("cpu")
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+        assert {"collect cpu", "CPU_Usage.watch_cpu_data"} <= app.instruments.timings.keys()
+
+        await pilot.press("c")
+        await pilot.pause()
+        assert app.screen.query_one(InstrumentsOverlay)
+        assert hasattr(CPU_Screen.watch_cpu_data, "__wrapped__")
+
+        await pilot.press("i")
+        await pilot.pause()
+        assert not app.instruments.enabled
+        assert not app.screen.query(InstrumentsOverlay)
+        assert "watch_cpu_data" in CPU_Usage.__dict__
+        assert not hasattr(CPU_Usage.watch_cpu_data, "__wrapped__")
+
+
+async def test_stats_are_exported(tmp_path: Any) -> None:
+    """What the monitor cost should be written as JSON on exit"""
+    path = tmp_path / "stats.json"
+    app = Monitor(provider=FakeProvider(), stats=str(path))
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+
+    report = json.loads(path.read_text())
+    assert report["rss_bytes"] > 0
+    assert report["timings"]["collect cpu"]["count"] >= 1
+    assert "tick_jitter" in report
@@ -0,0 +1,147 @@
+import os
+from collections.abc import Iterator
+from typing import Any, cast
+from unittest.mock import patch
+
+import pytest
+from textual.widgets import DataTable
+
+from textual_system_monitor.app import Monitor
+from textual_system_monitor.cli import build_parser
+from textual_system_monitor.interfaces import InterfaceSelection
+from textual_system_monitor.panes.network import NetInfo
+from textual_system_monitor.providers.fake import FakeProvider
+from textual_system_monitor.screens.network_screen import NetworkScreen
+from textual_system_monitor.utilities import interface_type
+
+
+def _stat(interface: str, kind: str, rate: float = 0.0) -> dict[str, Any]:
+    """Make an interface with rates"""
+    return {
+        "interface": interface,
+        "type": kind,
+        "bytes_recv": 10,
+        "bytes_sent": 10,
+        "bytes_recv_rate": rate,
+        "bytes_sent_rate": 0.0,
+    }
+
+
+STATS = [
+    _stat("lo", "loopback", 5.0),
+    _stat("eth0", "physical", 100.0),
+    _stat("docker0", "bridge", 1.0),
+    _stat("veth1", "veth", 50.0),
+    _stat("veth2", "veth", 70.0),
+    _stat("cali3", "veth", 2.0),
+]
+
+
+def _names(stats: list[dict[str, Any]]) -> list[str]:
+    """The names of the interfaces"""
+    return [stat["interface"] for stat in stats]
+
+
+async def test_filters() -> None:
+    """Interfaces should be filtered by glob, regular expression, and type"""
+    assert _names(InterfaceSelection(["veth*"]).select(STATS, None)[0]) == ["veth1", "veth2"]
+    assert _names(InterfaceSelection(["eth*"]).select(STATS, None)[0]) == ["eth0"]
+    assert not InterfaceSelection(["eth*"])._name_matches("veth0")
+    assert _names(InterfaceSelection(["re:^(lo|eth)\\d*$", "cali*"]).select(STATS, None)[0]) == ["lo", "eth0", "cali3"]
+    assert _names(InterfaceSelection(types=["physical", "bridge"]).select(STATS, None)[0]) == ["eth0", "docker0"]
+    assert _names(InterfaceSelection(["*0"], types=["bridge"]).select(STATS, None)[0]) == ["docker0"]
+
+    with pytest.raises(ValueError, match="pattern"):
+        InterfaceSelection(["re:("])
+    with pytest.raises(ValueError, match="types"):
+        InterfaceSelection(types=["wifi"])
+
+
+async def test_group_virtual() -> None:
+    """Virtual interfaces should be added up by type, in place of the first of their type"""
+    shown, total = InterfaceSelection(group_virtual=True).select(STATS, None)
+    assert _names(shown) == ["lo", "eth0", "all bridge (1)", "all veth (3)"]
+    assert total == 4
+    assert shown[3]["bytes_recv_rate"] == 122.0
+    assert shown[3]["bytes_recv"] == 30
+
+
+async def test_top_busiest() -> None:
+    """Only the busiest interfaces should be kept, in the order of the sample"""
+    shown, total = InterfaceSelection().select(STATS, 3)
+    assert _names(shown) == ["eth0", "veth1", "veth2"]
+    assert total == 6
+
+
+async def test_top_interfaces_on_the_command_line() -> None:
+    """`--top-interfaces 0` should show every interface, and negative counts be rejected by argparse"""
+    assert build_parser().parse_args(["--top-interfaces", "0"]).top_interfaces == 0
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(["--top-interfaces", "-1"])
+
+
+@pytest.fixture
+def sysfs(tmp_path: Any) -> Iterator[str]:
+    """A sysfs with a physical interface, a bridge, and a veth"""
+    for name, entry in (("eth0", "device"), ("docker0", "bridge"), ("veth9", None), ("wg0", None)):
+        os.makedirs(tmp_path / name)
+        if entry is not None:
+            os.makedirs(tmp_path / name / entry)
+    interface_type.cache_clear()
+    with patch("textual_system_monitor.utilities.NET_SYSFS_PATH", str(tmp_path)):
+        yield str(tmp_path)
+    interface_type.cache_clear()
+
+
+async def test_interface_type(sysfs: str) -> None:  # noqa: ARG001
+    """Interfaces should be told apart through sysfs where there is one, and by name elsewhere"""
+    types = {name: interface_type(name) for name in ("lo", "eth0", "docker0", "veth9", "wg0", "br-1", "en0")}
+    assert types == {
+        "lo": "loopback",
+        "eth0": "physical",
+        "docker0": "bridge",
+        "veth9": "veth",
+        "wg0": "other",
+        "br-1": "bridge",
+        "en0": "physical",
+    }
+
+
+async def test_network_views_scale() -> None:
+    """On a host with thousands of interfaces, only the busiest should be rendered"""
+    app = Monitor(provider=FakeProvider(interfaces=3_000), interfaces=InterfaceSelection(limit=20))
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+        assert app.screen.query_one(NetInfo).border_subtitle == "Top 10 of 3,000 by Speed"
+
+        await app.switch_screen("network")
+        await pilot.pause()
+        table = cast(DataTable[Any], app.screen.query_one("#network-screen-table", expect_type=DataTable))
+        assert table.row_count == 20
+
+
+async def test_network_screen_keeps_row_order() -> None:
+    """Rows should stay in the order of the sample, rather than move as the rates of their interfaces change"""
+    app = Monitor(provider=FakeProvider())
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        app.collector.stop()
+        await app.switch_screen("network")
+        await pilot.pause()
+        screen = cast(NetworkScreen, app.screen)
+
+        order = ["eth0", "wlan0", "lo"]
+        screen.update_io(
+            tuple(_stat(name, "physical", rate) for name, rate in zip(order, (1.0, 50.0, 100.0), strict=True))
+        )
+        await pilot.pause()
+        assert [row[0].plain for row in map(screen.table.get_row_at, range(3))] == order
+
+        screen.update_io(
+            tuple(_stat(name, "physical", rate) for name, rate in zip(order, (100.0, 50.0, 1.0), strict=True))
+        )
+        await pilot.pause()
+        assert [row[0].plain for row in map(screen.table.get_row_at, range(3))] == order
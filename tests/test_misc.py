@@ -1,3 +1,4 @@
+import sys
 from typing import cast
 from unittest.mock import patch
 
@@ -8,6 +9,7 @@ from textual.widgets import Static
 from textual_system_monitor.app import Monitor
 from textual_system_monitor.panes.gpu import GPU_Usage
 from textual_system_monitor.screens.gpu_screen import GPU_Screen
+from textual_system_monitor.utilities import MemoryData, get_mem_data
 
 
 async def test_change_KB_base() -> None:
@@ -171,3 +173,14 @@ async def test_gpu_screen_no_container_found() -> None:
             gpu_screen.on_mount()
             mock_watch.assert_not_called()
             gpu_screen.on_unmount()  # Force dismounting to kill the timer
+
+
+async def test_mem_data_single_sample() -> None:
+    """Memory data should be one consistent sample, with used and available adding up to the total on Linux"""
+    data = get_mem_data()
+    assert isinstance(data, MemoryData)
+    assert data.total > 0
+    assert 0 <= data.percent <= 100
+    assert 0 <= data.swap_used <= data.swap_total or data.swap_total == 0
+    if sys.platform == "linux":
+        assert data.used + data.available == data.total
@@ -0,0 +1,72 @@
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from textual_system_monitor.providers import procfs
+from textual_system_monitor.utilities import ProcessSampler
+
+pytestmark = pytest.mark.skipif(not procfs.is_supported(), reason="/proc is only available on Linux")
+
+
+async def test_procfs_matches_psutil() -> None:
+    """The /proc reader should produce the same static fields as psutil for our own process"""
+    rows = {row["pid"]: row for row in procfs.ProcFSReader().sample()}
+    expected = next(row for row in ProcessSampler().sample() if row["pid"] == os.getpid())
+    actual = rows[os.getpid()]
+
+    assert actual.keys() == expected.keys()
+    assert actual["name"] == expected["name"]
+    assert actual["username"] == expected["username"]
+    assert actual["exe"] == expected["exe"] == os.path.realpath(sys.executable)
+    assert actual["num_threads"] == expected["num_threads"]
+
+
+async def test_procfs_cpu_percent() -> None:
+    """A process seen for the first time has 0 CPU load, then its load is measured between samples"""
+    reader = procfs.ProcFSReader()
+    first = next(row for row in reader.sample() if row["pid"] == os.getpid())
+    assert first["cpu_percent"] == 0.0
+
+    total = 0
+    for i in range(2_000_000):
+        total += i
+
+    second = next(row for row in reader.sample() if row["pid"] == os.getpid())
+    assert second["cpu_percent"] > 0.0
+
+
+async def test_procfs_forgets_exited_processes() -> None:
+    """Cached fields of processes that have exited should not be kept around"""
+    reader = procfs.ProcFSReader()
+    reader.static[(999_999_999, 0)] = ("gone", None, None)
+    reader.sample()
+    assert (999_999_999, 0) not in reader.static
+
+
+async def test_procfs_reads_extra_fields_on_demand() -> None:
+    """IO rates and open file descriptors should only be read when processes are ranked by them"""
+    reader = procfs.ProcFSReader()
+    row = next(row for row in reader.sample() if row["pid"] == os.getpid())
+    assert row["rss"] > 0
+    assert row["num_fds"] is None
+    assert row["io_rate"] is None
+
+    row = next(row for row in reader.sample("num_fds") if row["pid"] == os.getpid())
+    assert row["num_fds"] == len(os.listdir("/proc/self/fd"))
+    assert row["io_rate"] is None
+
+    row = next(row for row in reader.sample("io_rate") if row["pid"] == os.getpid())
+    assert row["io_rate"] == 0.0
+
+
+async def test_procfs_provider_samples_without_psutil_processes() -> None:
+    """The /proc provider should sample every metric, without setting up psutil's process sampler"""
+    with patch("textual_system_monitor.providers.psutil_provider.ProcessSampler") as mock_sampler:
+        provider = procfs.ProcFSProvider()
+        assert provider.processes()
+        assert provider.cpu().cores
+        assert provider.disk_io() is not None
+    mock_sampler.assert_not_called()
+    assert not hasattr(provider, "process_sampler")
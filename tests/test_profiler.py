@@ -0,0 +1,64 @@
+import os
+import pstats
+import time
+from typing import Any
+
+import textual
+
+from textual_system_monitor import utilities
+from textual_system_monitor.profiler import SamplingProfiler, area
+
+
+def _busy(seconds: float) -> int:
+    """Keep the CPU busy for a while"""
+    total = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        total += sum(range(1000))
+    return total
+
+
+def _outer(profiler: SamplingProfiler) -> None:
+    """Take a sample from a known stack"""
+    profiler.sample()
+
+
+async def test_area() -> None:
+    """Time should be attributed to our own modules, or to a library as a whole"""
+    assert area(utilities.__file__) == "utilities.py"
+    assert area(os.path.join(os.path.dirname(utilities.__file__), "panes", "cpu.py")) == "panes/cpu.py"
+    assert area(textual.__file__) == "textual"
+    assert area(os.__file__) == "python"
+
+
+async def test_stacks_become_pstats() -> None:
+    """Every function on a sampled stack should be counted, along with who called it"""
+    profiler = SamplingProfiler()
+    _outer(profiler)
+    _outer(profiler)
+
+    stats = profiler.stats()
+    outer = (_outer.__code__.co_filename, _outer.__code__.co_firstlineno, "_outer")
+    sample = next(key for key in stats if key[2] == "sample")
+    assert stats[outer][0] == 2
+    assert stats[sample][4][outer][0] == 2
+
+
+async def test_profile_is_written(tmp_path: Any) -> None:
+    """A busy function should show up as hot, in a file pstats can read"""
+    path = tmp_path / "out.prof"
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    try:
+        _busy(0.3)
+    finally:
+        profiler.stop()
+    profiler.dump(str(path))
+
+    assert profiler.samples > 0
+    stats = pstats.Stats(str(path))
+    assert any(name == "_busy" for _, _, name in stats.stats)  # type: ignore[attr-defined]
+
+    summary = profiler.summary()
+    assert "Time by area:" in summary
+    assert "_busy" in summary
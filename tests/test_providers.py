@@ -0,0 +1,118 @@
+from typing import Any, cast
+
+import pytest
+from textual.widgets import DataTable
+
+from textual_system_monitor.app import Monitor
+from textual_system_monitor.interfaces import SCREEN_INTERFACES
+from textual_system_monitor.providers.base import make_provider
+from textual_system_monitor.providers.fake import FakeProvider, constant, ramp, spikes
+from textual_system_monitor.providers.psutil_provider import PsutilProvider
+
+
+class Clock:
+    """A clock that only moves when told to"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _samples(provider: FakeProvider, clock: Clock, times: list[float]) -> list[tuple[Any, ...]]:
+    """Sample every metric at each of the given times"""
+    samples = []
+    for now in times:
+        clock.now = now
+        samples.append((provider.cpu(), provider.mem(), provider.network(), provider.disks(), provider.processes()))
+    return samples
+
+
+async def test_fake_provider_is_deterministic() -> None:
+    """The same script, read at the same times, should always give the same samples"""
+    times = [0.0, 1.0, 2.5, 10.0]
+    first_clock, second_clock = Clock(), Clock()
+    first = _samples(FakeProvider(seed=3, clock=first_clock), first_clock, times)
+    second = _samples(FakeProvider(seed=3, clock=second_clock), second_clock, times)
+    assert first == second
+
+    other_clock = Clock()
+    assert _samples(FakeProvider(seed=4, clock=other_clock), other_clock, times) != first
+
+
+async def test_fake_provider_follows_the_load() -> None:
+    """CPU load and network rates should follow the load curve"""
+    clock = Clock()
+    idle = FakeProvider(cores=4, load=constant(0.0), clock=clock)
+    busy = FakeProvider(cores=4, load=constant(1.0), clock=clock)
+
+    assert idle.cpu().overall == 0.0
+    assert busy.cpu().overall == 100.0
+    assert busy.mem().percent == 90.0
+    assert busy.mem().swap_percent == 100.0
+
+    busy.network()
+    clock.now = 2.0
+    assert all(stat["bytes_recv"] > 0 for stat in busy.network())
+    assert all(stat["bytes_recv"] == 0 for stat in idle.network())
+
+
+async def test_load_curves() -> None:
+    """The load curves should script the load over time"""
+    assert constant(0.4)(123) == 0.4
+    assert [ramp(10, 0.2, 0.8)(seconds) for seconds in (-5, 0, 5, 10, 20)] == pytest.approx([0.2, 0.2, 0.5, 0.8, 0.8])
+    assert [spikes(every=10, length=2, base=0.1, peak=0.9)(seconds) for seconds in (0, 1, 2, 11, 15)] == [
+        0.9,
+        0.9,
+        0.1,
+        0.9,
+        0.1,
+    ]
+
+
+async def test_fake_processes_churn() -> None:
+    """Processes should be replaced, with new PIDs, once they have run for their lifetime"""
+    clock = Clock()
+    provider = FakeProvider(processes=50, lifetime=5, clock=clock)
+    before = {row["pid"] for row in provider.processes()}
+    clock.now = 2.5
+    during = {row["pid"] for row in provider.processes()}
+    clock.now = 5.0
+    after = {row["pid"] for row in provider.processes()}
+
+    assert len(before) == len(during) == len(after) == 50
+    assert before != during
+    assert not before & after
+
+
+async def test_make_provider() -> None:
+    """Providers should be picked by name, and unknown names rejected"""
+    assert isinstance(make_provider("psutil"), PsutilProvider)
+    assert isinstance(make_provider("fake"), FakeProvider)
+    with pytest.raises(ValueError, match="Unknown provider"):
+        make_provider("wmi")
+
+
+async def test_app_at_scale() -> None:
+    """The whole app should run off a fake system far bigger than the one the tests run on"""
+    provider = FakeProvider(cores=128, processes=2_000, interfaces=200, mounts=50)
+    app = Monitor(provider=provider)
+    async with app.run_test() as pilot:
+        # Collection starts once the first frame has been painted
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+
+        assert app.snapshot.cpu is not None
+        assert app.snapshot.cpu.cores == 128
+
+        for screen, table_id, rows in (
+            ("processes", "#process-screen-table", 2_000),
+            ("network", "#network-screen-table", SCREEN_INTERFACES),
+            ("drive", "#drive-screen-table", 50),
+        ):
+            await app.switch_screen(screen)
+            await pilot.pause()
+            table = cast(DataTable[Any], app.screen.query_one(table_id, expect_type=DataTable))
+            assert table.row_count == rows, screen
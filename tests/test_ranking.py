@@ -0,0 +1,36 @@
+from textual_system_monitor.app import Monitor
+from textual_system_monitor.panes.processes import Processes
+from textual_system_monitor.screens.processes_screen import ProcessesScreen
+from textual_system_monitor.utilities import rank_processes
+
+
+async def test_rank_top_k() -> None:
+    """The top K should match a full sort, with unreadable values ranked last"""
+    procs = [{"pid": pid, "rss": (pid * 7919) % 1000 if pid % 5 else None} for pid in range(1, 1000)]
+
+    expected = sorted(procs, key=lambda proc: -1 if proc["rss"] is None else proc["rss"], reverse=True)
+    assert rank_processes(procs, "rss", limit=10) == expected[:10]
+    assert rank_processes(procs, "rss") == expected
+    assert rank_processes(procs, "rss")[-1]["rss"] is None
+
+
+async def test_cycle_sort_key() -> None:
+    """Changing the sort key from the Main Screen should apply to the pane and the Processes Screen alike"""
+    app = Monitor()
+    async with app.run_test() as pilot:
+        pane = app.screen.query_one(Processes)
+        assert app.process_sort == "cpu_percent"
+        assert pane.border_subtitle == "Top 10 by CPU Load"
+
+        await pilot.press("s")
+        await pilot.pause()
+        assert app.process_sort == "rss"
+        assert pane.border_subtitle == "Top 10 by Memory"
+
+        await pilot.press("p")
+        await pilot.pause()
+        assert type(app.screen) is ProcessesScreen
+        await pilot.click("#process-sort-key-button")
+        await pilot.pause()
+        assert app.process_sort == "io_rate"
+        assert str(app.screen.query_one("#process-sort-key-button").label) == "By IO"
@@ -0,0 +1,122 @@
+from typing import Any
+
+import pytest
+from textual.widgets import DataTable
+
+from textual_system_monitor.app import Monitor
+from textual_system_monitor.providers.fake import FakeProvider
+from textual_system_monitor.rates import COUNTER_WRAP, DiskRates, NetworkRates, counter_delta
+
+
+def _stat(interface: str, received: int, sent: int = 0) -> dict[str, Any]:
+    """Make the counters of an interface"""
+    return {"interface": interface, "bytes_recv": received, "bytes_sent": sent}
+
+
+async def test_rates_use_elapsed_time() -> None:
+    """Rates should be worked out over the time that went by, with interfaces matched by name"""
+    rates = NetworkRates()
+    first = rates.update([_stat("eth0", 1000), _stat("eth1", 0)], now=10.0)
+    assert [stat["bytes_recv_rate"] for stat in first] == [0.0, 0.0]
+
+    # Two seconds later, in a different order
+    second = rates.update([_stat("eth1", 4000), _stat("eth0", 3000)], now=12.0)
+    assert {stat["interface"]: stat["bytes_recv_rate"] for stat in second} == {"eth1": 2000.0, "eth0": 1000.0}
+
+    # Counters that aren't reported are left out
+    assert "packets_recv_rate" not in second[0]
+
+
+async def test_interfaces_come_and_go() -> None:
+    """New interfaces should start at 0, and the state of interfaces that are gone should be dropped"""
+    rates = NetworkRates()
+    rates.update([_stat("eth0", 0), _stat("veth1", 0)], now=0.0)
+    rates.update([_stat("eth0", 100), _stat("veth1", 500)], now=1.0)
+    stats = rates.update([_stat("eth0", 200), _stat("veth2", 900)], now=2.0)
+
+    assert [(stat["interface"], stat["bytes_recv_rate"]) for stat in stats] == [("eth0", 100.0), ("veth2", 0.0)]
+    assert rates.peaks.keys() == rates.smoothed.keys() == {"eth0", "veth2"}
+
+
+async def test_smoothed_and_peak_rates() -> None:
+    """Smoothed rates should follow the current rate over time, and peaks should hold the highest rate"""
+    rates = NetworkRates(half_life=1.0)
+    rates.update([_stat("eth0", 0)], now=0.0)
+    (stat,) = rates.update([_stat("eth0", 1000)], now=1.0)
+    assert (stat["bytes_recv_rate"], stat["bytes_recv_avg"], stat["bytes_recv_peak"]) == (1000.0, 1000.0, 1000.0)
+
+    # After one half-life at 0, the smoothed rate has halved
+    (stat,) = rates.update([_stat("eth0", 1000)], now=2.0)
+    assert (stat["bytes_recv_rate"], stat["bytes_recv_avg"], stat["bytes_recv_peak"]) == (0.0, 500.0, 1000.0)
+
+
+async def test_counter_wraps_and_restarts() -> None:
+    """32-bit counters that wrap should count on, and counters that restarted should have no rate"""
+    assert counter_delta(10, 20) == 10
+    assert counter_delta(COUNTER_WRAP - 10, 20) == 30
+    assert counter_delta(COUNTER_WRAP // 4, 20) is None
+    assert counter_delta(COUNTER_WRAP * 2, 20) is None
+
+    rates = NetworkRates()
+    rates.update([_stat("eth0", COUNTER_WRAP - 100)], now=0.0)
+    (stat,) = rates.update([_stat("eth0", 100)], now=2.0)
+    assert stat["bytes_recv_rate"] == pytest.approx(100.0)
+
+
+async def test_network_views_survive_churn() -> None:
+    """The Network pane and screen should show interfaces as they come and go"""
+    app = Monitor(provider=FakeProvider())
+    async with app.run_test() as pilot:
+        # Collection starts once the first frame has been painted, so let it start before stopping it
+        await pilot.pause()
+        app.collector.stop()
+        await app.workers.wait_for_complete()
+
+        rates = NetworkRates()
+        for now, interfaces in ((0.0, ("eth0", "veth1")), (1.0, ("veth2", "eth0", "veth3")), (2.0, ("eth0",))):
+            app.collector.publish("network", tuple(rates.update([_stat(name, 100) for name in interfaces], now)))
+            await pilot.pause()
+
+        await app.switch_screen("network")
+        await pilot.pause()
+        assert app.screen.query_one("#network-screen-table", DataTable).row_count == 1
+
+
+def _io(device: str, ios: int, ms: int, **counters: Any) -> dict[str, Any]:
+    """Make the counters of a block device, with as many reads as writes"""
+    return {
+        "device": device,
+        "read_count": ios,
+        "write_count": ios,
+        "read_bytes": ios * 4096,
+        "write_bytes": ios * 8192,
+        "read_time": ms,
+        "write_time": ms,
+        **counters,
+    }
+
+
+async def test_disk_rates() -> None:
+    """Disk rates should work out throughput, IOPS, await, queue depth, and utilization like iostat"""
+    rates = DiskRates()
+    first = rates.update([_io("sda", 0, 0, busy_time=0, weighted_time=0), _io("sdb", 0, 0)], now=0.0)
+    assert first[0]["read_bytes_rate"] == 0.0
+    assert first[0]["util"] == 0.0
+
+    # Two seconds later: 200 reads and 200 writes, which took 1600 ms in all
+    second = rates.update([_io("sda", 200, 800, busy_time=1000, weighted_time=3000), _io("sdb", 200, 800)], now=2.0)
+    sda, sdb = second
+    assert sda["read_bytes_rate"] == 200 * 4096 / 2
+    assert sda["write_bytes_rate"] == 200 * 8192 / 2
+    assert sda["read_count_rate"] == sda["write_count_rate"] == 100.0
+    assert sda["await"] == 4.0
+    assert sda["util"] == 50.0
+    assert sda["queue"] == 1.5
+
+    # Platforms that don't count busy or queued time can't tell utilization or queue depth
+    assert sdb["util"] is None
+    assert sdb["queue"] is None
+    assert sdb["await"] == 4.0
+
+    # No IO, no await
+    assert rates.update([_io("sda", 200, 800, busy_time=1000, weighted_time=3000)], now=3.0)[0]["await"] == 0.0
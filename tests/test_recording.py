@@ -0,0 +1,180 @@
+from itertools import count
+from pathlib import Path
+from threading import current_thread, main_thread
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from textual_system_monitor import recording
+from textual_system_monitor.app import Monitor
+from textual_system_monitor.cli import main
+from textual_system_monitor.providers.fake import FakeProvider
+from textual_system_monitor.recording import BLOCK_SECONDS, BLOCKS_PER_INDEX, Recorder, Recording, encode_json
+from textual_system_monitor.replay import Player
+from textual_system_monitor.utilities import CPUData, MemoryData
+
+START = 1_700_000_000.0
+
+
+def _record(path: Path, seconds: int, start: float = START, close: bool = True) -> None:
+    """
+    Record a CPU sample every second, with the CPU load going up by 1% every second, and a memory sample half a
+    second after each of them
+    """
+    clock = (tick / 2 for tick in count())
+    with patch("textual_system_monitor.recording.time.time", return_value=start):
+        recorder = Recorder(str(path), clock=lambda: next(clock))
+        for second in range(seconds):
+            recorder.record("cpu", CPUData(1, float(second), (float(second),)))
+            recorder.record("mem", MemoryData(100, 50, 50, 50.0, 0, 0, 0.0))
+        if close:
+            recorder.close()
+        else:
+            recorder.flush()
+            recorder.file.close()
+
+
+async def test_recording_round_trip(tmp_path: Path) -> None:
+    """Samples should come back as they were recorded, found through the index rather than by scanning"""
+    path = tmp_path / "session.tsm"
+    seconds = 2 * BLOCK_SECONDS * BLOCKS_PER_INDEX
+    _record(path, seconds)
+
+    with patch("textual_system_monitor.recording._scan", wraps=recording._scan) as mock_scan:
+        session = Recording(str(path))
+    mock_scan.assert_not_called()
+
+    assert len(session.blocks) > BLOCKS_PER_INDEX
+    assert session.start == START
+
+    state = session.state_at(START + 100.25)
+    assert recording.decode("cpu", state["cpu"]) == CPUData(1, 100.0, (100.0,))
+    assert recording.decode("mem", state["mem"]).percent == 50.0
+
+    events = list(session.events(START + 100, START + 101))
+    assert [event["m"] for event in events] == ["mem", "cpu"]
+
+
+async def test_recording_recovers_and_appends(tmp_path: Path) -> None:
+    """A recording that wasn't closed should still be readable, and appending to it should keep every sample"""
+    path = tmp_path / "session.tsm"
+    _record(path, 40, close=False)
+    assert len(Recording(str(path)).blocks) == 3
+
+    _record(path, 40, start=START + 1000)
+    session = Recording(str(path))
+    assert len(session.blocks) == 6
+    assert session.end == START + 1000 + 39.5
+    assert recording.decode("cpu", session.state_at(START + 1000)["cpu"]).overall == 0.0
+
+    path.write_bytes(b"not a recording")
+    with pytest.raises(ValueError, match="not a recording"):
+        Recording(str(path))
+
+
+async def test_recording_is_timed_from_one_start(tmp_path: Path) -> None:
+    """Samples should be timed from the wall-clock time of the first sample, so the system clock can't move them"""
+    path = tmp_path / "session.tsm"
+    clock = iter([100.0, 100.5, 101.0])
+    with patch("textual_system_monitor.recording.time.time", side_effect=[START, START - 3600]) as wall:
+        recorder = Recorder(str(path), clock=lambda: next(clock))
+        for second in range(3):
+            recorder.record("cpu", CPUData(1, float(second), (float(second),)))
+        recorder.close()
+    assert wall.call_count == 1
+
+    events = list(Recording(str(path)).events(START - 1, START + 10))
+    assert [event["t"] for event in events] == [START, START + 0.5, START + 1]
+
+
+async def test_samples_are_encoded_in_workers(tmp_path: Path) -> None:
+    """Samples should be encoded for the recording in the thread worker that took them, not on the UI thread"""
+    path = tmp_path / "session.tsm"
+    threads = set()
+
+    def _encode_json(data: Any) -> str:
+        threads.add(current_thread())
+        return encode_json(data)
+
+    app = Monitor(provider=FakeProvider(), recorder=Recorder(str(path)))
+    with (
+        patch("textual_system_monitor.collector.encode_json", side_effect=_encode_json),
+        patch("textual_system_monitor.recording.encode_json", side_effect=AssertionError("encoded on the UI thread")),
+    ):
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            app.collector.flush()
+
+    assert threads
+    assert main_thread() not in threads
+    session = Recording(str(path))
+    assert session.state_at(session.end).keys() == set(recording.METRICS)
+
+
+async def test_replay_refuses_adaptive(tmp_path: Path) -> None:
+    """Replays can't be adaptive, since samples are replayed as they were recorded"""
+    path = tmp_path / "session.tsm"
+    _record(path, 3)
+    with patch("textual_system_monitor.app.Monitor.run") as mock_run, pytest.raises(SystemExit):
+        main(["--adaptive", "replay", str(path)])
+    mock_run.assert_not_called()
+
+
+async def test_replay(tmp_path: Path) -> None:
+    """Replaying should drive the same panes as live data, seek through the recording, and change speed"""
+    path = tmp_path / "session.tsm"
+    _record(path, 400)
+
+    app = Monitor(recording=Recording(str(path)), speed=100)
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        player = app.collector
+        assert isinstance(player, Player)
+
+        player.stop()
+        player.seek(START + 300)
+        assert app.snapshot.cpu == CPUData(1, 300.0, (300.0,))
+
+        # The history covers what came before the new position
+        history = player.history.get("cpu")
+        assert history is not None
+        assert history.latest() == 300.0
+        assert len(history) > 1
+
+        await pilot.press("[")
+        assert app.snapshot.cpu == CPUData(1, 240.0, (240.0,))
+
+        await pilot.press("f")
+        assert player.speed == 1
+        player.advance()
+        assert player.position == START + 240 + 0.1
+
+
+async def test_replay_leaves_the_system_alone(tmp_path: Path) -> None:
+    """Replaying should never set up a provider, and the history should be kept at the configured intervals"""
+    path = tmp_path / "session.tsm"
+    _record(path, 120)
+
+    app = Monitor(recording=Recording(str(path)), intervals={"cpu": 1.0, "mem": 1.0})
+    with patch("textual_system_monitor.collector.default_provider", side_effect=AssertionError("sampled")):
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            player = app.collector
+            player.stop()
+            player.seek(START + 100)
+
+            history = player.history.get("cpu")
+            assert history is not None
+            assert player.history.intervals["cpu"] == 1.0
+            assert history.latest() == 100.0
+
+
+async def test_replay_actions_only_when_replaying() -> None:
+    """Replay bindings should do nothing when monitoring the live system"""
+    app = Monitor()
+    async with app.run_test():
+        assert not app.check_action("skip", (60,))
+        assert app.check_action("switch_base", ())
@@ -0,0 +1,63 @@
+from textual.widgets import Static
+
+from textual_system_monitor.app import Monitor
+from textual_system_monitor.panes.processes import Processes
+from textual_system_monitor.rendering import get_styles, percentage_text, update_CPU_static, update_network_static
+from textual_system_monitor.utilities import CPUData
+
+
+async def test_styles_cached_per_theme() -> None:
+    """Styles should only be built once per theme"""
+    assert get_styles("nord") is get_styles("nord")
+    assert get_styles("nord")["green"].color != get_styles("textual-light")["green"].color
+
+
+async def test_static_text() -> None:
+    """Renderers should build the same text the markup used to, with colors as spans"""
+    styles = get_styles("textual-dark")
+
+    cpu = update_CPU_static(CPUData(2, 50.0, (80.0, 95.0)), styles)
+    assert cpu.plain == "Cores: 2\n\nOverall: 50.0 %\n\nPer Core: \nCore 1: 80.0 %  | Core 2: 95.0 % \n\n"
+    assert [(cpu.plain[span.start : span.end], span.style) for span in cpu.spans] == [
+        ("50.0", styles["green"]),
+        ("80.0", styles["yellow"]),
+        ("95.0", styles["red"]),
+    ]
+
+    stats = [
+        {
+            "interface": "[eth0]",
+            "bytes_sent": 1024,
+            "bytes_recv": 2048,
+            "bytes_sent_rate": 1024.0,
+            "bytes_recv_rate": 2048.0,
+        }
+    ]
+    network = update_network_static(stats, 1024, styles)
+    assert network.plain == "[eth0]: Download: 2.0 KiB at 2.0 KiB /s | Upload: 1.0 KiB at 1.0 KiB /s\n\n"
+
+    # Cells of different colors must compare unequal, for tables to pick up theme changes
+    assert percentage_text(styles, 10.0) != percentage_text(get_styles("textual-light"), 10.0)
+
+
+async def test_process_names_are_not_markup() -> None:
+    """Process names that look like markup should be shown as they are"""
+    app = Monitor()
+    async with app.run_test():
+        pane = app.screen.query_one(Processes)
+        pane.initial = False
+        process = {
+            "pid": 1,
+            "name": "[bold]init[/",
+            "exe": "/sbin/init",
+            "username": "root",
+            "cpu_percent": 1.0,
+            "rss": 1024,
+            "num_threads": 1,
+            "num_fds": None,
+            "io_rate": None,
+        }
+        pane.watch_processes((process,))
+
+        static = pane.query_one("#procs_pane_static", expect_type=Static)
+        assert "Name: [bold]init[/ |" in str(static.content)
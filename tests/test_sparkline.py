@@ -0,0 +1,100 @@
+from unittest.mock import patch
+
+from textual_system_monitor.app import Monitor
+from textual_system_monitor.history import HISTORY_SECONDS, RingBuffer
+from textual_system_monitor.providers.fake import FakeProvider
+from textual_system_monitor.sparkline import HistorySparkline, nice_scale
+from textual_system_monitor.utilities import CPUData
+
+
+async def test_sparkline_renders_only_new_columns() -> None:
+    """Each new sample should render a single new column, unless the chart has to be rescaled"""
+    app = Monitor()
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        app.collector.stop()
+        await app.workers.wait_for_complete()
+
+        sparkline = app.screen.query_one("#cpu").query_one(HistorySparkline)
+        width, height = sparkline.size
+        buffer = RingBuffer(width)
+        app.collector.history.series["test"] = buffer
+        sparkline.series = "test"
+
+        for value in (0, 25, 50):
+            buffer.append(value)
+        sparkline.update_chart(rebuild=True)
+        assert len(sparkline.columns) == 3
+
+        with patch.object(sparkline, "_render_column", wraps=sparkline._render_column) as mock_render:
+            buffer.append(100)
+            sparkline.update_chart()
+            assert mock_render.call_count == 1
+
+            # Auto-scaled charts are rendered again when a new peak changes the scale
+            sparkline.maximum = None
+            sparkline.update_chart(rebuild=True)
+            mock_render.reset_mock()
+            buffer.append(1000)
+            sparkline.update_chart()
+            assert mock_render.call_count == 5
+
+        lines = sparkline.render().plain.splitlines()
+        assert len(lines) == height
+        assert all(line.endswith("█") for line in lines)
+        assert all(len(line) == width for line in lines)
+
+
+async def test_sparkline_fits_whole_history() -> None:
+    """Each column should stand for the peak of as many samples as needed to fit the whole history"""
+    app = Monitor()
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        app.collector.stop()
+        await app.workers.wait_for_complete()
+
+        sparkline = app.screen.query_one("#cpu").query_one(HistorySparkline)
+        width = sparkline.size.width
+        buffer = RingBuffer(width * 3)
+        app.collector.history.series["test"] = buffer
+        sparkline.series = "test"
+
+        for value in range(width * 3):
+            buffer.append(value % 3 * 50)
+        sparkline.update_chart(rebuild=True)
+
+        assert sparkline.per_column == 3
+        assert list(sparkline.values) == [100.0] * width
+
+
+async def test_sparkline_title_says_what_it_covers() -> None:
+    """Charts should say how much time they cover, which is more than the history is meant to hold when stretched"""
+    app = Monitor(provider=FakeProvider(), intervals={"cpu": 1.0})
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        app.collector.stop()
+        await app.workers.wait_for_complete()
+        await app.switch_screen("cpu")
+        await pilot.pause()
+        sparkline = app.screen.query_one("#cpu-screen-sparkline", HistorySparkline)
+
+        # Samples 3s apart, as if the interval were stretched twice over
+        app.collector.history = app.collector.new_history()
+        for second in range(0, 3 * HISTORY_SECONDS, 3):
+            app.collector.history.record("cpu", CPUData(1, 50.0, (50.0,)), second)
+        sparkline.update_chart()
+        assert sparkline.border_title == "Overall CPU Load - Last 15 Minutes"
+
+        app.collector.history = app.collector.new_history()
+        for second in range(40):
+            app.collector.history.record("cpu", CPUData(1, 50.0, (50.0,)), second)
+        sparkline.update_chart()
+        assert sparkline.border_title == "Overall CPU Load - Last 39 Seconds"
+
+
+async def test_nice_scale() -> None:
+    """Auto-scaled charts should only rescale on powers of 2"""
+    assert nice_scale(0) == 1.0
+    assert nice_scale(3) == 4.0
+    assert nice_scale(4) == 4.0
+    assert nice_scale(1000) == 1024.0
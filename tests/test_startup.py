@@ -0,0 +1,66 @@
+import asyncio
+import sys
+import time
+from threading import Event
+
+from textual_system_monitor.app import Monitor
+from textual_system_monitor.providers.fake import FakeProvider
+from textual_system_monitor.screens.main_screen import MainScreen
+from textual_system_monitor.utilities import MemoryData
+
+# How long the app may take to paint its first frame, however slow sampling the system is
+STARTUP_BUDGET = 2.0
+
+IMPORT_CHECK = """
+import sys
+
+import psutil
+
+
+def _sample(*args, **kwargs):
+    raise AssertionError("The system was sampled at import time")
+
+
+for name in ("cpu_times", "cpu_percent", "virtual_memory", "swap_memory", "disk_partitions", "disk_usage",
+             "net_io_counters", "process_iter"):
+    setattr(psutil, name, _sample)
+
+import textual_system_monitor.app
+
+lazy = [name for name in sys.modules if name.endswith(("processes_screen", "network_screen", "drive_screen"))]
+assert not lazy, lazy
+"""
+
+
+async def test_import_does_not_sample() -> None:
+    """Importing the app should neither sample the system, nor import screens that aren't shown at startup"""
+    process = await asyncio.create_subprocess_exec(sys.executable, "-c", IMPORT_CHECK, stderr=asyncio.subprocess.PIPE)
+    _, stderr = await process.communicate()
+    assert process.returncode == 0, stderr.decode()
+
+
+async def test_first_frame_before_first_sample() -> None:
+    """The Main Screen should be painted within budget, even while the first sample is still being taken"""
+    release = Event()
+
+    def _slow_mem_data() -> MemoryData:
+        release.wait(5)
+        return MemoryData(1, 1, 0, 0.0, 0, 0, 0.0)
+
+    provider = FakeProvider()
+    provider.mem = _slow_mem_data  # type: ignore[method-assign]
+
+    app = Monitor(provider=provider)
+    start = time.perf_counter()
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        elapsed = time.perf_counter() - start
+
+        assert type(app.screen) is MainScreen
+        assert app.snapshot.mem is None
+        assert elapsed < STARTUP_BUDGET
+
+        release.set()
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+        assert app.snapshot.mem is not None
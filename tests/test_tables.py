@@ -0,0 +1,145 @@
+from typing import Any
+from unittest.mock import patch
+
+from rich.text import Text
+from textual.app import App, ComposeResult
+from textual.widgets import DataTable
+
+from textual_system_monitor.tables import sync_table
+
+
+class TableApp(App[None]):
+    def compose(self) -> ComposeResult:
+        yield DataTable(cursor_type="row")
+
+    def on_mount(self) -> None:
+        table = self.query_one(DataTable)
+        table.add_column("PID", key="pid")
+        table.add_column("Load", key="load")
+
+
+async def test_sync_table_only_touches_changes() -> None:
+    """Unchanged cells should be left alone, and rows that are gone should be removed"""
+    app = TableApp()
+    async with app.run_test():
+        table: DataTable[Any] = app.query_one(DataTable)
+        sync_table(table, {"1": (1, 10.0), "2": (2, 20.0), "3": (3, 30.0)}, order_by="pid")
+
+        with patch.object(table, "update_cell", wraps=table.update_cell) as mock_update:
+            sync_table(table, {"1": (1, 10.0), "3": (3, 35.0)}, order_by="pid")
+
+        mock_update.assert_called_once_with("3", "load", 35.0, update_width=False)
+        assert [row.key.value for row in table.ordered_rows] == ["1", "3"]
+        assert table.get_row("3") == [3, 35.0]
+
+
+async def test_sync_table_only_widens_columns() -> None:
+    """Columns should widen to fit wider cells, without measuring cells that can't be wider than the column"""
+    app = TableApp()
+    async with app.run_test() as pilot:
+        table: DataTable[Any] = app.query_one(DataTable)
+        sync_table(table, {"1": (1, 10.0)})
+        await pilot.pause()
+
+        with patch.object(table, "update_cell", wraps=table.update_cell) as mock_update:
+            sync_table(table, {"1": (1, "[bold]123456.0[/]")})
+            await pilot.pause()
+            assert table.columns["load"].content_width == len("123456.0")
+
+            sync_table(table, {"1": (1, 5.0)})
+            await pilot.pause()
+            assert table.columns["load"].content_width == len("123456.0")
+
+        assert [call.kwargs["update_width"] for call in mock_update.call_args_list] == [True, False]
+
+
+async def test_sync_table_keeps_cursor_on_row() -> None:
+    """When rows are re-ordered, added, or removed, the cursor should stay on the same row"""
+    app = TableApp()
+    async with app.run_test():
+        table: DataTable[Any] = app.query_one(DataTable)
+        sync_table(table, {"1": (1, 10.0), "2": (2, 20.0), "3": (3, 30.0)}, order_by="pid")
+        table.move_cursor(row=1)
+
+        sync_table(table, {"4": (4, 40.0), "3": (3, 30.0), "2": (2, 20.0)}, order_by="pid")
+
+        assert [table.get_row_at(row)[0] for row in range(table.row_count)] == [4, 3, 2]
+        assert table.cursor_row == 2
+        assert table.get_row_at(table.cursor_row) == [2, 20.0]
+
+
+async def test_sync_table_recycles_rows() -> None:
+    """New rows should take the place of rows that are gone, so that only the cells that differ are updated"""
+    app = TableApp()
+    async with app.run_test():
+        table: DataTable[Any] = app.query_one(DataTable)
+        sync_table(table, {"1": (1, 10.0), "2": (2, 20.0), "3": (3, 30.0)}, order_by="pid")
+
+        with (
+            patch.object(table, "update_cell", wraps=table.update_cell) as mock_update,
+            patch.object(table, "add_row", wraps=table.add_row) as mock_add,
+            patch.object(table, "remove_row", wraps=table.remove_row) as mock_remove,
+        ):
+            sync_table(table, {"1": (1, 10.0), "3": (3, 30.0), "4": (4, 20.0)}, order_by="pid")
+
+        assert mock_update.call_count == 1
+        assert mock_update.call_args.args[1:] == ("pid", 4)
+        mock_add.assert_not_called()
+        mock_remove.assert_not_called()
+        assert [table.get_row_at(row) for row in range(table.row_count)] == [[1, 10.0], [3, 30.0], [4, 20.0]]
+
+        # The row that took the place of another can be added back under its own key
+        sync_table(table, {"2": (2, 20.0), "4": (4, 20.0), "1": (1, 10.0), "3": (3, 30.0)}, order_by="pid")
+        assert [table.get_row_at(row) for row in range(table.row_count)] == [[2, 20.0], [4, 20.0], [1, 10.0], [3, 30.0]]
+
+
+async def test_sync_table_skips_unchanged_rows() -> None:
+    """Rows whose cells are the same objects as last time shouldn't be compared, nor re-ordered"""
+    app = TableApp()
+    async with app.run_test():
+        table: DataTable[Any] = app.query_one(DataTable)
+        rows = {str(pid): (pid, float(pid)) for pid in range(100)}
+        sync_table(table, rows, order_by="pid")
+
+        with (
+            patch.object(table, "get_row", wraps=table.get_row) as mock_get,
+            patch.object(table, "update_cell", wraps=table.update_cell) as mock_update,
+            patch.object(table, "sort", wraps=table.sort) as mock_sort,
+        ):
+            sync_table(table, rows, order_by="pid")
+            sync_table(table, {**rows, "7": (7, 70.0)}, order_by="pid")
+
+        mock_get.assert_not_called()
+        mock_sort.assert_not_called()
+        mock_update.assert_called_once_with("7", "load", 70.0, update_width=False)
+
+
+async def test_sync_table_measures_widest_cell() -> None:
+    """Only the widest of the cells that widen a column should be measured"""
+    app = TableApp()
+    async with app.run_test() as pilot:
+        table: DataTable[Any] = app.query_one(DataTable)
+        sync_table(table, {"1": (1, 1.0), "2": (2, 2.0), "3": (3, 3.0)})
+        await pilot.pause()
+
+        with patch.object(table, "update_cell", wraps=table.update_cell) as mock_update:
+            sync_table(table, {"1": (1, "1000.0"), "2": (2, "100000.0"), "3": (3, "10.0")})
+            await pilot.pause()
+
+        assert {call.args[0]: call.kwargs["update_width"] for call in mock_update.call_args_list} == {
+            "1": False,
+            "2": True,
+            "3": False,
+        }
+        assert table.columns["load"].content_width == len("100000.0")
+
+
+async def test_sync_table_orders_by_styled_cells() -> None:
+    """Tables should be ordered by columns of styled cells too, which can't be hashed"""
+    app = TableApp()
+    async with app.run_test():
+        table: DataTable[Any] = app.query_one(DataTable)
+        sync_table(table, {"a": (Text("a", style="green"), 1.0), "b": (Text("b", style="green"), 2.0)}, order_by="pid")
+        sync_table(table, {"b": (Text("b", style="green"), 2.0), "a": (Text("a", style="green"), 1.0)}, order_by="pid")
+
+        assert [table.get_row_at(row)[0].plain for row in range(table.row_count)] == ["b", "a"]